@@ -0,0 +1,167 @@
+# benchmarks/bench_api_latency.py
+# Бенчмарк задержки API под смешанной нагрузкой чтения и записи.
+# Сторонний писатель (пакетная загрузка, медленный диск) периодически
+# держит блокировку записи; читатели в WAL ей не ограничены.
+# Запросы идут по расписанию с постоянной частотой RATE, задержка
+# считается от запланированного момента: так учитывается и время,
+# пока запрос ждал занятый event loop.
+# Запуск: python -m benchmarks.bench_api_latency [клиентов] [потоков]
+import asyncio
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from functools import partial
+from pathlib import Path
+
+import httpx
+
+from billing_system.infrastructure.api.executor import DEFAULT_WORKERS
+from billing_system.infrastructure.api.fastapi import create_app
+from billing_system.infrastructure.protocols import (
+    BALANCED,
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+    SystemClock,
+)
+
+DEFAULT_CLIENTS = 32
+REQUESTS = 40
+WRITE_EVERY = 4
+LINES = 10
+LOCK_HOLD = 0.05
+RATE = 250
+
+
+async def client_loop(  # noqa: PLR0913
+    client: httpx.AsyncClient,
+    invoice_id: str,
+    *,
+    first: float,
+    period: float,
+    reads: list[float],
+    writes: list[float],
+) -> None:
+    """Клиент: каждый WRITE_EVERY-й запрос - запись, остальные - чтение."""
+    for i in range(REQUESTS):
+        start = first + i * period
+        await asyncio.sleep(max(0.0, start - time.perf_counter()))
+        if i % WRITE_EVERY == 0:
+            r = await client.post(
+                "/invoice/add_line/",
+                json={
+                    "invoice_id": invoice_id,
+                    "amount": 1.5,
+                    "quantity": 2,
+                    "description": "bench",
+                },
+            )
+            writes.append(time.perf_counter() - start)
+        else:
+            r = await client.get(f"/invoice/{invoice_id}")
+            reads.append(time.perf_counter() - start)
+        r.raise_for_status()
+
+
+def slow_writer(path: Path, stop: threading.Event) -> None:
+    """Сторонний писатель: держит блокировку записи LOCK_HOLD секунд."""
+    conn = sqlite3.connect(path, timeout=60)
+    while not stop.is_set():
+        conn.execute("BEGIN IMMEDIATE;")
+        time.sleep(LOCK_HOLD)
+        conn.commit()
+        time.sleep(LOCK_HOLD)
+    conn.close()
+
+
+def pct(samples: list[float], q: int) -> float:
+    """Перцентиль q в миллисекундах."""
+    return statistics.quantiles(samples, n=100)[q - 1] * 1e3
+
+
+async def prepare(client: httpx.AsyncClient, clients: int) -> list[str]:
+    """Создает по счету с LINES строчками на клиента."""
+    ids = []
+    for _ in range(clients):
+        invoice_id = str(uuid.uuid4())
+        await client.post(
+            "/invoice/",
+            params={"currency": "EUR", "invoice_id": invoice_id},
+        )
+        for _ in range(LINES):
+            await client.post(
+                "/invoice/add_line/",
+                json={
+                    "invoice_id": invoice_id,
+                    "amount": 1,
+                    "quantity": 1,
+                    "description": "x",
+                },
+            )
+        ids.append(invoice_id)
+    return ids
+
+
+async def run(path: Path, clients: int, workers: int) -> None:
+    """Запускает clients параллельных клиентов и печатает задержки."""
+    pool = SqliteConnectionPool(path, timeout=60, profile=BALANCED)
+    app = create_app(
+        partial(SqliteUnitOfWork, pool),
+        SystemClock(),
+        max_workers=workers,
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        follow_redirects=True,
+    ) as client:
+        ids = await prepare(client, clients)
+        reads: list[float] = []
+        writes: list[float] = []
+        stop = threading.Event()
+        writer = threading.Thread(target=slow_writer, args=(path, stop))
+        writer.start()
+        period = clients / RATE
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                client_loop(
+                    client,
+                    invoice_id,
+                    first=start + n * period / clients,
+                    period=period,
+                    reads=reads,
+                    writes=writes,
+                )
+                for n, invoice_id in enumerate(ids)
+            ),
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        writer.join()
+    pool.close()
+    total = len(reads) + len(writes)
+    print(
+        f"клиентов {clients}, потоков {workers}, запросов {total}, "
+        f"{total / elapsed:.0f} rps",
+    )
+    for name, samples in (("чтение", reads), ("запись", writes)):
+        p50, p99 = pct(samples, 50), pct(samples, 99)
+        print(f"  {name:<8} p50 {p50:8.2f} ms   p99 {p99:8.2f} ms")
+
+
+def main() -> None:
+    """Печатает p50/p99 чтения и записи под смешанной нагрузкой."""
+    args = [int(a) for a in sys.argv[1:]]
+    clients = args[0] if args else DEFAULT_CLIENTS
+    workers = args[1] if len(args) > 1 else DEFAULT_WORKERS
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(Path(tmp) / "bench.sqlite", clients, workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_cache.py
+# Бенчмарк GetInvoice с кэшем снимков счетов и без него.
+# Запуск: python -m benchmarks.bench_cache [кол-во строчек ...]
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from billing_system.application.dto import GetInvoiceRequest
+from billing_system.application.usecase import GetInvoice
+from billing_system.infrastructure.cache import InvoiceCache
+from billing_system.infrastructure.protocols import (
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+)
+
+from .common import fill_invoice
+
+DEFAULT_SIZES = (1, 100, 1_000)
+OPS = 200
+REPEAT = 5
+
+
+def best_us(usecase: GetInvoice, req: GetInvoiceRequest) -> float:
+    """Лучшее время одного GetInvoice в микросекундах."""
+    usecase(req)
+    timer = timeit.Timer(lambda: usecase(req))
+    return min(timer.repeat(REPEAT, OPS)) / OPS * 1e6
+
+
+def main() -> None:
+    """Печатает время GetInvoice без кэша и с прогретым кэшем."""
+    sizes = [int(a) for a in sys.argv[1:]] or list(DEFAULT_SIZES)
+    print(f"{'строчек':>10}{'без кэша, us':>16}{'с кэшем, us':>16}")
+    for n_lines in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bench.sqlite"
+            req = GetInvoiceRequest(invoice_id=fill_invoice(path, n_lines))
+            pool = SqliteConnectionPool(path)
+            cache = InvoiceCache()
+            plain = best_us(GetInvoice(SqliteUnitOfWork(pool)), req)
+            cached = best_us(
+                GetInvoice(SqliteUnitOfWork(pool, cache=cache)),
+                req,
+            )
+            pool.close()
+        print(f"{n_lines:>10}{plain:>16.1f}{cached:>16.1f}")
+        print(f"{'':>10}{cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_contention.py
+# Бенчмарк конкурирующих писателей: ожидание блокировки и повторы.
+# Каждый поток добавляет строчки в общий счет через свой UOW.
+# Запуск: python -m benchmarks.bench_contention [потоков] [busy_timeout мс]
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from billing_system.application.dto import InvoiceAddLineRequest
+from billing_system.application.errors import StorageBusyError
+from billing_system.application.usecase import InvoiceAddLine, RetryPolicy
+from billing_system.infrastructure.protocols import (
+    BALANCED,
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+)
+
+from .common import fill_invoice
+
+DEFAULT_THREADS = 8
+DEFAULT_BUSY_TIMEOUT = 5_000
+OPS_PER_THREAD = 200
+
+
+def worker(
+    use_case: InvoiceAddLine,
+    req: InvoiceAddLineRequest,
+    failures: list[int],
+) -> None:
+    """Выполняет OPS_PER_THREAD добавлений строчки."""
+    for _ in range(OPS_PER_THREAD):
+        try:
+            use_case(req)
+        except StorageBusyError:
+            failures.append(1)
+
+
+def main() -> None:
+    """Печатает пропускную способность, ожидание блокировки и повторы."""
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_THREADS
+    busy_timeout = (
+        int(sys.argv[2]) if len(sys.argv) > 1 + 1 else DEFAULT_BUSY_TIMEOUT
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        invoice_id = fill_invoice(path, 0)
+        pool = SqliteConnectionPool(
+            path,
+            max_size=threads,
+            profile=BALANCED,
+            busy_timeout=busy_timeout,
+        )
+        policy = RetryPolicy()
+        req = InvoiceAddLineRequest(
+            invoice_id=invoice_id,
+            amount=Decimal("1.50"),
+            quantity=Decimal(2),
+            description="Товар",
+        )
+        failures: list[int] = []
+        runners = [
+            threading.Thread(
+                target=worker,
+                args=(
+                    InvoiceAddLine(SqliteUnitOfWork(pool), policy),
+                    req,
+                    failures,
+                ),
+            )
+            for _ in range(threads)
+        ]
+        started = time.perf_counter()
+        for t in runners:
+            t.start()
+        for t in runners:
+            t.join()
+        elapsed = time.perf_counter() - started
+        pool.close()
+
+    lock, retry = pool.lock_metrics.stats, policy.metrics.stats
+    print(f"потоков: {threads}, busy_timeout: {busy_timeout} мс")
+    print(f"команд/с:              {threads * OPS_PER_THREAD / elapsed:.0f}")
+    print(f"блокировок:            {lock.waits}")
+    print(f"ожидание, среднее мс:  {lock.wait_total / lock.waits * 1e3:.2f}")
+    print(f"ожидание, макс мс:     {lock.wait_max * 1e3:.2f}")
+    print(f"отказов busy:          {lock.busy}")
+    print(f"повторов:              {retry.retries}")
+    print(f"исчерпано попыток:     {retry.exhausted}")
+    print(f"отдано 503:            {len(failures)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/bench_get.py
+# Бенчмарк задержки InvoiceSqliteRepository.get по числу строчек.
+# Запуск: python -m benchmarks.bench_get [кол-во строчек ...]
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+
+from .common import fill_invoice
+
+DEFAULT_SIZES = (1, 100, 10_000)
+REPEAT = 20
+
+
+def measure_get(path: Path, n_lines: int) -> float:
+    """Лучшее время get() счета с n_lines строчками, в секундах.
+
+    Каждый замер - первый get() в новом UOW: повторный get() в том же
+    UOW отдает счет из identity map и бд не читает.
+    """
+    invoice_id = fill_invoice(path, n_lines)
+    uow = SqliteUnitOfWork(path)
+    best = float("inf")
+    for _ in range(REPEAT):
+        with uow:
+            start = time.perf_counter()
+            uow.invoices.get(invoice_id)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Печатает время get() и стоимость одной строчки."""
+    sizes = [int(a) for a in sys.argv[1:]] or list(DEFAULT_SIZES)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        print(f"{'строчек':>10}{'get, ms':>12}{'на строчку, us':>18}")
+        for n_lines in sizes:
+            sec = measure_get(path, n_lines)
+            per_row = sec / n_lines * 1e6
+            print(f"{n_lines:>10}{sec * 1e3:>12.3f}{per_row:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_get_many.py
+# Бенчмарк пакетного чтения счетов: get() по одному против get_many().
+# Запуск: python -m benchmarks.bench_get_many [кол-во счетов]
+import sys
+import tempfile
+from pathlib import Path
+
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+
+from .bench_subtotal import best_ms, fill
+
+DEFAULT_INVOICES = 50_000
+LINES_PER_INVOICE = 5
+
+
+def main() -> None:
+    """Печатает время чтения всех счетов двумя способами."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_INVOICES
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        ids = fill(path, [LINES_PER_INVOICE] * n)
+        uow = SqliteUnitOfWork(path)
+
+        def by_get() -> object:
+            with uow:
+                return [uow.invoices.get(i).subtotal for i in ids]
+
+        def by_get_many() -> object:
+            with uow:
+                batch = uow.invoices.get_many(ids)
+                return [i.subtotal for i in batch.invoices.values()]
+
+        assert by_get() == by_get_many()  # noqa: S101 - проверка бенчмарка
+        get_ms, many_ms = best_ms(by_get), best_ms(by_get_many)
+        print(f"счетов: {n}, строчек на счет: {LINES_PER_INVOICE}")
+        print(f"get() x {n}, мс:   {get_ms:10.1f}")
+        print(f"get_many(), мс:    {many_ms:10.1f}")
+        print(f"ускорение:         {get_ms / many_ms:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_group_commit.py
+# Бенчмарк группового commit: команды в секунду под пиковой нагрузкой.
+# Каждый поток добавляет строчки в свой счет; профиль DURABLE (fsync
+# на каждый commit). Сравниваются обычный UOW и GroupCommitUnitOfWork.
+# Запуск: python -m benchmarks.bench_group_commit [потоков] [каталог бд]
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from pathlib import Path
+
+from billing_system.application.dto import InvoiceAddLineRequest
+from billing_system.application.protocols import UnitOfWork
+from billing_system.application.usecase import InvoiceAddLine
+from billing_system.domain.value_objects import InvoiceId
+from billing_system.infrastructure.protocols import (
+    GroupCommitUnitOfWork,
+    GroupCommitWriter,
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+)
+
+from .common import fill_invoice
+
+DEFAULT_THREADS = 16
+OPS_PER_THREAD = 50
+
+
+def burst(
+    path: Path,
+    threads: int,
+    make_uow: Callable[[], UnitOfWork],
+) -> float:
+    """Команд в секунду: threads потоков одновременно пишут в бд."""
+    ids = [fill_invoice(path, 0) for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(invoice_id: InvoiceId) -> None:
+        use_case = InvoiceAddLine(make_uow())
+        req = InvoiceAddLineRequest(
+            invoice_id=invoice_id,
+            amount=Decimal("1.50"),
+            quantity=Decimal(2),
+            description="Товар",
+        )
+        barrier.wait()
+        for _ in range(OPS_PER_THREAD):
+            use_case(req)
+
+    runners = [threading.Thread(target=worker, args=(i,)) for i in ids]
+    for t in runners:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in runners:
+        t.join()
+    return threads * OPS_PER_THREAD / (time.perf_counter() - started)
+
+
+def main() -> None:
+    """Печатает команд/с и число fsync-commit для обоих UOW."""
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_THREADS
+    base = sys.argv[2] if len(sys.argv) > 1 + 1 else None
+    with tempfile.TemporaryDirectory(dir=base) as tmp:
+        pool = SqliteConnectionPool(Path(tmp) / "plain.sqlite")
+        plain = burst(
+            Path(tmp) / "plain.sqlite",
+            threads,
+            lambda: SqliteUnitOfWork(pool),
+        )
+        pool.close()
+
+        pool = SqliteConnectionPool(Path(tmp) / "group.sqlite")
+        writer = GroupCommitWriter(pool)
+        group = burst(
+            Path(tmp) / "group.sqlite",
+            threads,
+            lambda: GroupCommitUnitOfWork(writer),
+        )
+        pool.close()
+
+    stats = writer.stats
+    print(f"потоков: {threads}, команд: {threads * OPS_PER_THREAD}")
+    print(f"обычный UOW, команд/с:     {plain:.0f}")
+    print(f"групповой commit, команд/с: {group:.0f}")
+    print(f"commit на диск:            {stats.batches}")
+    print(f"средняя пачка:             {stats.units / stats.batches:.1f}")
+
+
+if __name__ == "__main__":
+    main()
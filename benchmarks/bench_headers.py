@@ -0,0 +1,47 @@
+# benchmarks/bench_headers.py
+# Бенчмарк списка счетов с суммами: регидрация (get().total) против
+# заголовков из строки Invoice (headers) и время полной сверки сумм.
+# Запуск: python -m benchmarks.bench_headers [кол-во счетов]
+import sys
+import tempfile
+from pathlib import Path
+
+from billing_system.infrastructure.consistency import check_database
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+
+from .bench_subtotal import best_ms, fill
+
+DEFAULT_INVOICES = 1_000
+LINES_PER_INVOICE = 20
+
+
+def main() -> None:
+    """Печатает время списка счетов с суммами двумя способами."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_INVOICES
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        ids = fill(path, [LINES_PER_INVOICE] * n)
+        uow = SqliteUnitOfWork(path)
+
+        def by_get() -> object:
+            with uow:
+                return {i: uow.invoices.get(i).total for i in ids}
+
+        def by_headers() -> object:
+            with uow:
+                return {
+                    h.invoice_id: h.total
+                    for h in uow.invoices.headers(limit=n)
+                }
+
+        assert by_get() == by_headers()  # noqa: S101 - проверка бенчмарка
+        get_ms, headers_ms = best_ms(by_get), best_ms(by_headers)
+        print(f"счетов: {n}, строчек на счет: {LINES_PER_INVOICE}")
+        print(f"get().total, мс:   {get_ms:10.2f}")
+        print(f"headers(), мс:     {headers_ms:10.2f}")
+        check_ms = best_ms(lambda: check_database(path))
+        print(f"сверка сумм, мс:   {check_ms:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
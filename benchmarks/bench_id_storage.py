@@ -0,0 +1,154 @@
+# benchmarks/bench_id_storage.py
+# Бенчмарк хранения Id счета: 36-символьный TEXT против 16-байтового
+# BLOB. Строит бд со схемой до v5 (TEXT), замеряет ее, переводит
+# миграцией v5 на месте с VACUUM и замеряет снова.
+# Промахи страничного кэша sqlite считаются как системные вызовы
+# read() процесса (/proc/self/io, без mmap) при ограниченном кэше.
+# Запуск: python -m benchmarks.bench_id_storage [счетов] [каталог бд]
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from billing_system.infrastructure.migrations import (
+    migrate,
+    migrate_database,
+)
+from billing_system.infrastructure.migrations.versions import (
+    MIGRATIONS,
+    v005_binary_id,
+)
+
+DEFAULT_INVOICES = 5_000_000
+LINES_PER_INVOICE = 2
+GETS = 20_000
+CACHE_KIB = 8_000
+
+# Тот же запрос, что у InvoiceSqliteRepository.get; колонка количества
+# до миграции quantity, после (v6) - quantity_scaled.
+GET_SQL = """
+SELECT i.id, i.status, (
+    SELECT json_group_array(
+        json_array(l.position, l.description, l.unit_price_minor, l.{quantity})
+    )
+    FROM InvoiceLine AS l WHERE l.invoice_id = i.id
+)
+FROM Invoice AS i WHERE i.id = ?;
+"""
+
+
+def invoice_uuid(k: int) -> uuid.UUID:
+    """Детерминированный UUID счета с номером k."""
+    return uuid.UUID(f"{k:08x}-0000-4000-8000-{k:012x}")
+
+
+def fill(path: Path, n: int) -> None:
+    """Создает бд схемы v4 с n счетами и текстовыми Id."""
+    conn = sqlite3.connect(path)
+    migrate(
+        conn,
+        [
+            m
+            for m in MIGRATIONS
+            if m.version < v005_binary_id.MIGRATION.version
+        ],
+    )
+    conn.execute("PRAGMA journal_mode = OFF;")
+    conn.execute("PRAGMA synchronous = OFF;")
+    text_id = "printf('%08x-0000-4000-8000-%012x', k, k)"
+    with conn:
+        conn.execute(
+            f"""
+            WITH RECURSIVE seq(k) AS (
+                SELECT 0 UNION ALL SELECT k + 1 FROM seq WHERE k + 1 < ?
+            )
+            INSERT INTO Invoice (id, currency, status)
+            SELECT {text_id}, 'EUR', 'DRAFT' FROM seq;
+            """,  # noqa: S608 - константа модуля
+            (n,),
+        )
+        conn.execute(
+            f"""
+            WITH RECURSIVE seq(i) AS (
+                SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < ?
+            ), line(i, k) AS (SELECT i, i % ? FROM seq)
+            INSERT INTO InvoiceLine (invoice_id, position, description,
+            unit_price_minor, quantity)
+            SELECT {text_id}, i / ?, 'Товар', i % 997, '1' FROM line;
+            """,  # noqa: S608 - константа модуля
+            (n * LINES_PER_INVOICE, n, n),
+        )
+    conn.close()
+
+
+def read_syscalls() -> int:
+    """Число системных вызовов read() процесса."""
+    for line in Path("/proc/self/io").read_text().splitlines():
+        if line.startswith("syscr:"):
+            return int(line.split()[1])
+    return 0
+
+
+def btree_pages(conn: sqlite3.Connection) -> dict[str, int]:
+    """Число страниц по B-деревьям бд."""
+    rows = conn.execute("SELECT name, COUNT(*) FROM dbstat GROUP BY name;")
+    return {name: count for name, count in rows if name != "sqlite_schema"}
+
+
+def measure(path: Path, n: int, *, blob: bool) -> None:
+    """Печатает размер, страницы B-деревьев и задержку get()."""
+    conn = sqlite3.connect(path)
+    print(f"  размер файла, МиБ:    {path.stat().st_size / 2**20:.1f}")
+    for name, pages in sorted(btree_pages(conn).items()):
+        print(f"  страниц {name:<27} {pages}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_KIB:d};")
+    conn.execute("PRAGMA mmap_size = 0;")
+    rnd = random.Random(0)  # noqa: S311 - выборка для бенчмарка
+
+    def key() -> bytes | str:
+        uid = invoice_uuid(rnd.randrange(n))
+        return uid.bytes if blob else str(uid)
+
+    get_sql = GET_SQL.format(
+        quantity="quantity_scaled" if blob else "quantity",
+    )
+    for _ in range(GETS):  # прогрев кэша
+        conn.execute(get_sql, (key(),)).fetchone()
+    samples = []
+    reads = read_syscalls()
+    for _ in range(GETS):
+        k = key()
+        started = time.perf_counter()
+        conn.execute(get_sql, (k,)).fetchone()
+        samples.append((time.perf_counter() - started) * 1e6)
+    misses = (read_syscalls() - reads) / GETS
+    conn.close()
+    print(f"  get p50, us:          {statistics.median(samples):.1f}")
+    print(f"  промахов кэша на get: {misses:.2f}")
+
+
+def main() -> None:
+    """Замеряет бд до и после перевода Id в BLOB."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_INVOICES
+    base = sys.argv[2] if len(sys.argv) > 1 + 1 else None
+    with tempfile.TemporaryDirectory(dir=base) as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        fill(path, n)
+        print(f"счетов: {n}, строчек: {n * LINES_PER_INVOICE}")
+        print(f"TEXT, кэш {CACHE_KIB} КиБ:")
+        measure(path, n, blob=False)
+
+        started = time.perf_counter()
+        migrate_database(path, vacuum=True)
+        elapsed = time.perf_counter() - started
+        print(f"миграция v5, v6 + VACUUM, с: {elapsed:.1f}")
+        print(f"BLOB, кэш {CACHE_KIB} КиБ:")
+        measure(path, n, blob=True)
+
+
+if __name__ == "__main__":
+    main()
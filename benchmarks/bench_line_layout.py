@@ -0,0 +1,134 @@
+# benchmarks/bench_line_layout.py
+# Бенчмарк get() в зависимости от общего числа строчек в бд:
+# rowid-таблица с индексом (схема без v4) против WITHOUT ROWID (v4).
+# Строчки счетов дописываются вперемешку, как при живой нагрузке.
+# Запуск: python -m benchmarks.bench_line_layout [макс. строчек]
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from billing_system.domain.value_objects import InvoiceId
+from billing_system.infrastructure.migrations import migrate
+from billing_system.infrastructure.migrations.versions import MIGRATIONS
+from billing_system.infrastructure.protocols import (
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+)
+
+LINES_PER_INVOICE = 20
+DEFAULT_MAX_LINES = 10_000_000
+GETS = 2_000
+
+# Ключ счета k в бд - 16 байт детерминированного UUID из номера.
+INVOICE_ID_SQL = "invoice_key(k)"
+
+
+def invoice_id(k: int) -> InvoiceId:
+    """Id счета с номером k."""
+    return InvoiceId(uuid.UUID(f"{k:08x}-0000-4000-8000-{k:012x}"))
+
+
+def invoice_key(k: int) -> bytes:
+    """Ключ счета с номером k (функция invoice_key для sql)."""
+    return invoice_id(k).bytes
+
+
+# Схема строчек до v4: rowid-таблица и отдельный индекс по позиции.
+ROWID_LINES_SQL = """
+DROP TABLE InvoiceLine;
+CREATE TABLE InvoiceLine
+(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    invoice_id BLOB NOT NULL,
+    position INTEGER NOT NULL,
+    description TEXT,
+    unit_price_minor INTEGER NOT NULL,
+    quantity_scaled INTEGER NOT NULL,
+    FOREIGN KEY (invoice_id) REFERENCES Invoice(id)
+);
+CREATE UNIQUE INDEX InvoiceLine_position
+ON InvoiceLine (invoice_id, position);
+"""
+
+
+def fill(path: Path, total_lines: int, *, clustered: bool) -> None:
+    """Создает бд с total_lines строчками по LINES_PER_INVOICE на счет.
+
+    Строчка i принадлежит счету i % n: строчки одного счета
+    вставляются не подряд, а вперемешку с чужими.
+    """
+    n = total_lines // LINES_PER_INVOICE
+    conn = sqlite3.connect(path)
+    conn.create_function("invoice_key", 1, invoice_key, deterministic=True)
+    migrate(conn, MIGRATIONS)
+    if not clustered:
+        conn.executescript(ROWID_LINES_SQL)
+    conn.execute("PRAGMA journal_mode = OFF;")
+    conn.execute("PRAGMA synchronous = OFF;")
+    with conn:
+        conn.execute(
+            f"""
+            WITH RECURSIVE seq(k) AS (
+                SELECT 0 UNION ALL SELECT k + 1 FROM seq WHERE k + 1 < ?
+            )
+            INSERT INTO Invoice (id, currency, status)
+            SELECT {INVOICE_ID_SQL}, 'EUR', 'DRAFT' FROM seq;
+            """,  # noqa: S608 - константа модуля
+            (n,),
+        )
+        conn.execute(
+            f"""
+            WITH RECURSIVE seq(i) AS (
+                SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < ?
+            ), line(i, k) AS (SELECT i, i % ? FROM seq)
+            INSERT INTO InvoiceLine (invoice_id, position, description,
+            unit_price_minor, quantity_scaled)
+            SELECT {INVOICE_ID_SQL}, i / ?, 'Товар', i % 997, 1000000
+            FROM line;
+            """,  # noqa: S608 - константа модуля
+            (total_lines, n, n),
+        )
+    conn.close()
+
+
+def measure(path: Path, total_lines: int) -> tuple[float, float]:
+    """Медиана и p99 get() случайного счета в микросекундах."""
+    n = total_lines // LINES_PER_INVOICE
+    pool = SqliteConnectionPool(path, migrate=False)
+    uow = SqliteUnitOfWork(pool)
+    rnd = random.Random(0)  # noqa: S311 - выборка для бенчмарка
+    samples = []
+    for _ in range(GETS):
+        uid = invoice_id(rnd.randrange(n))
+        started = time.perf_counter()
+        with uow:
+            uow.invoices.get(uid)
+        samples.append((time.perf_counter() - started) * 1e6)
+    pool.close()
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+def main() -> None:
+    """Печатает задержку get() для каждой схемы и объема бд."""
+    max_lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MAX_LINES
+    print(f"{'строчек':>10} {'схема':>14} {'p50, us':>9} {'p99, us':>9}")
+    total = 10_000
+    while total <= max_lines:
+        for clustered in (False, True):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "bench.sqlite"
+                fill(path, total, clustered=clustered)
+                p50, p99 = measure(path, total)
+            layout = "without rowid" if clustered else "rowid+index"
+            print(f"{total:>10} {layout:>14} {p50:>9.0f} {p99:>9.0f}")
+        total *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/bench_memory.py
+# Бенчмарк памяти регидрированного счета с большим числом строчек.
+# Запуск: python -m benchmarks.bench_memory [кол-во строчек]
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+
+from .common import fill_invoice
+
+DEFAULT_LINES = 1_000_000
+
+
+def main() -> None:
+    """Печатает число байт на строчку счета после get()."""
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        invoice_id = fill_invoice(path, n_lines)
+        gc.collect()
+
+        uow = SqliteUnitOfWork(path)
+        tracemalloc.start()
+        with uow:
+            invoice = uow.invoices.get(invoice_id)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"строчек:           {len(invoice.lines)}")
+        print(f"удержано, байт:    {retained}")
+        print(f"пик, байт:         {peak}")
+        print(f"байт на строчку:   {retained / n_lines:.1f}")
+        print(f"пик на строчку:    {peak / n_lines:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_money.py
+# Бенчмарк арифметики Money и подсчета суммы счета по строчкам.
+# Запуск: python -m benchmarks.bench_money [кол-во строчек]
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+from decimal import Decimal
+
+from billing_system.domain.aggregates import Invoice
+from billing_system.domain.value_objects import (
+    Currency,
+    InvoiceId,
+    InvoiceLine,
+    Money,
+)
+
+DEFAULT_LINES = 10_000
+OPS = 100_000
+REPEAT = 5
+
+
+def build_invoice(n_lines: int) -> Invoice:
+    """Собирает черновик счета с n_lines строчками."""
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid.uuid4()))
+    for i in range(n_lines):
+        invoice.add_line(
+            InvoiceLine(
+                f"Товар {i}",
+                Money(Decimal(i % 997) + Decimal("0.99"), Currency.EUR),
+                Decimal(i % 7 + 1) / 4,
+            ),
+        )
+    return invoice
+
+
+def best_us(stmt: Callable[[], object], number: int) -> float:
+    """Лучшее время одного вызова stmt в микросекундах."""
+    timer = timeit.Timer(stmt)
+    return min(timer.repeat(REPEAT, number)) / number * 1e6
+
+
+def main() -> None:
+    """Печатает время операций Money и Invoice.subtotal."""
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    a = Money(Decimal("12.34"), Currency.EUR)
+    b = Money(Decimal("0.66"), Currency.EUR)
+    qty = Decimal("1.530")
+    cases: list[tuple[str, Callable[[], object]]] = [
+        ("Money(...)", lambda: Money(Decimal("12.34"), Currency.EUR)),
+        ("Money + Money", lambda: a + b),
+        ("Money - Money", lambda: a - b),
+        ("Money * Decimal", lambda: a * qty),
+        ("Money * int", lambda: a * 3),
+        ("str(Money)", lambda: str(a)),
+    ]
+    for name, stmt in cases:
+        print(f"{name:<24}{best_us(stmt, OPS):10.3f} us")
+
+    invoice = build_invoice(n_lines)
+    subtotal_us = best_us(lambda: invoice.subtotal, 10)
+    total_us = best_us(lambda: invoice.total, 10)
+    print(f"{f'subtotal, {n_lines} строчек':<24}{subtotal_us:10.3f} us")
+    print(f"{f'total, {n_lines} строчек':<24}{total_us:10.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_pool.py
+# Бенчмарк пропускной способности UOW с пулом соединений и без него.
+# Запуск: python -m benchmarks.bench_pool [кол-во потоков ...]
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from billing_system.domain.value_objects import InvoiceId
+from billing_system.infrastructure.protocols import (
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+)
+
+from .common import fill_invoice
+
+DEFAULT_WORKERS = (1, 8, 64)
+OPS = 4_000
+LINES = 10
+
+
+def run(
+    pool: SqliteConnectionPool,
+    invoice_id: InvoiceId,
+    workers: int,
+) -> float:
+    """Транзакций get() в секунду при workers параллельных потоках."""
+
+    def job(n: int) -> None:
+        uow = SqliteUnitOfWork(pool)
+        for _ in range(n):
+            with uow:
+                uow.invoices.get(invoice_id)
+
+    per_worker = OPS // workers
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as ex:
+        list(ex.map(job, [per_worker] * workers))
+    return per_worker * workers / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Печатает транзакции в секунду: новое соединение на UOW и пул."""
+    workers_list = [int(a) for a in sys.argv[1:]] or list(DEFAULT_WORKERS)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        invoice_id = fill_invoice(path, LINES)
+        print(f"{'потоков':>8}{'connect, tx/s':>16}{'пул, tx/s':>14}")
+        for workers in workers_list:
+            # max_idle=0: соединение закрывается на выходе из UOW,
+            # как до пула.
+            cold = SqliteConnectionPool(path, max_size=workers, max_idle=0)
+            warm = SqliteConnectionPool(path)
+            cold_tps = run(cold, invoice_id, workers)
+            warm_tps = run(warm, invoice_id, workers)
+            cold.close()
+            warm.close()
+            print(f"{workers:>8}{cold_tps:>16.0f}{warm_tps:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_profiles.py
+# Матрица пропускной способности записи и чтения по профилям sqlite.
+# Запуск: python -m benchmarks.bench_profiles [кол-во транзакций]
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from billing_system.domain.value_objects import InvoiceId
+from billing_system.infrastructure.protocols import (
+    PROFILES,
+    SqliteConnectionPool,
+    SqliteProfile,
+    SqliteUnitOfWork,
+)
+
+from .common import make_invoice
+
+DEFAULT_OPS = 500
+LINES = 10
+READERS = 4
+
+
+def write_tps(
+    pool: SqliteConnectionPool,
+    ops: int,
+) -> tuple[float, list[InvoiceId]]:
+    """Транзакций записи в секунду: счет с LINES строчками на транзакцию."""
+    uow = SqliteUnitOfWork(pool)
+    invoices = [make_invoice(LINES) for _ in range(ops)]
+    start = time.perf_counter()
+    for invoice in invoices:
+        with uow:
+            uow.invoices.add(invoice)
+    elapsed = time.perf_counter() - start
+    return ops / elapsed, [i.invoice_id for i in invoices]
+
+
+def read_tps(pool: SqliteConnectionPool, ids: list[InvoiceId]) -> float:
+    """Транзакций чтения в секунду у READERS потоков при одном писателе."""
+    stop = threading.Event()
+
+    def writer() -> None:
+        uow = SqliteUnitOfWork(pool)
+        while not stop.is_set():
+            with uow:
+                uow.invoices.add(make_invoice(LINES))
+
+    def reader(part: list[InvoiceId]) -> int:
+        uow = SqliteUnitOfWork(pool)
+        for invoice_id in part:
+            with uow:
+                uow.invoices.get(invoice_id)
+        return len(part)
+
+    background = threading.Thread(target=writer)
+    background.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(READERS) as ex:
+        done = sum(ex.map(reader, [ids[i::READERS] for i in range(READERS)]))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    background.join()
+    return done / elapsed
+
+
+def measure(
+    path: Path,
+    profile: SqliteProfile,
+    ops: int,
+) -> tuple[float, float]:
+    """Запись и чтение в tx/s для профиля на новой бд."""
+    pool = SqliteConnectionPool(path, profile=profile, timeout=60)
+    try:
+        writes, ids = write_tps(pool, ops)
+        reads = read_tps(pool, ids * 4)
+    finally:
+        pool.close()
+    return writes, reads
+
+
+def main() -> None:
+    """Печатает матрицу профиль x (запись, чтение под записью)."""
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OPS
+    print(f"{'профиль':<12}{'запись, tx/s':>14}{'чтение, tx/s':>14}")
+    for name, profile in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            writes, reads = measure(Path(tmp) / "bench.sqlite", profile, ops)
+        print(f"{name:<12}{writes:>14.0f}{reads:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_subtotal.py
+# Бенчмарк суммы строчек: регидрация счетов (get().subtotal) против
+# агрегата в sqlite (subtotal/subtotals) без сборки объектов Invoice.
+# Запуск: python -m benchmarks.bench_subtotal [строчек в большом счете]
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from billing_system.domain.value_objects import InvoiceId
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+
+from .common import make_invoice
+
+DEFAULT_LINES = 100_000
+MANY_INVOICES = 1_000
+LINES_PER_INVOICE = 20
+REPEAT = 5
+
+
+def best_ms(stmt: Callable[[], object]) -> float:
+    """Лучшее время вызова stmt в миллисекундах."""
+    times = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        stmt()
+        times.append(time.perf_counter() - started)
+    return min(times) * 1e3
+
+
+def fill(path: Path, sizes: list[int]) -> list[InvoiceId]:
+    """Создает счета с заданным числом строчек и возвращает их Id."""
+    invoices = [make_invoice(n) for n in sizes]
+    uow = SqliteUnitOfWork(path)
+    with uow:
+        for invoice in invoices:
+            uow.invoices.add(invoice)
+        uow.commit()
+    return [invoice.invoice_id for invoice in invoices]
+
+
+def compare(name: str, path: Path, ids: list[InvoiceId]) -> None:
+    """Печатает время обоих способов для счетов ids."""
+    uow = SqliteUnitOfWork(path)
+
+    def by_get() -> object:
+        with uow:
+            return {i: uow.invoices.get(i).subtotal for i in ids}
+
+    def by_sql() -> object:
+        with uow:
+            return uow.invoices.subtotals(ids)
+
+    assert by_get() == by_sql()  # noqa: S101 - проверка бенчмарка
+    get_ms, sql_ms = best_ms(by_get), best_ms(by_sql)
+    print(f"{name:<28}{get_ms:>10.2f}{sql_ms:>10.2f}{get_ms / sql_ms:>8.1f}x")
+
+
+def main() -> None:
+    """Печатает время get().subtotal и sql-агрегата."""
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    print(f"{'':<28}{'get, мс':>10}{'sql, мс':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite"
+        big = fill(path, [n_lines])
+        many = fill(path, [LINES_PER_INVOICE] * MANY_INVOICES)
+        compare(f"1 счет, {n_lines} строчек", path, big)
+        compare(
+            f"{MANY_INVOICES} счетов по {LINES_PER_INVOICE}",
+            path,
+            many,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_write_amplification.py
+# Бенчмарк записи: счет собирается по одной строчке через InvoiceAddLine,
+# считаются строки бд, измененные каждым сохранением.
+# Запуск: python -m benchmarks.bench_write_amplification [кол-во строчек]
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from billing_system.domain.aggregates import Invoice
+from billing_system.domain.value_objects import Currency, InvoiceId
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+
+from .common import make_line
+
+DEFAULT_LINES = 1_000
+
+
+def main() -> None:
+    """Печатает число измененных строк бд и время на добавление строчки."""
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    with tempfile.TemporaryDirectory() as tmp:
+        uow = SqliteUnitOfWork(Path(tmp) / "bench.sqlite")
+        invoice_id = InvoiceId(uuid.uuid4())
+        with uow:
+            uow.invoices.add(Invoice(Currency.EUR, invoice_id))
+
+        changed = 0
+        last = 0
+        start = time.perf_counter()
+        for i in range(n_lines):
+            with uow:
+                invoice = uow.invoices.get(invoice_id)
+                invoice.add_line(make_line(i))
+                before = uow.conn.total_changes if uow.conn else 0
+                uow.invoices.save(invoice)
+                last = (uow.conn.total_changes if uow.conn else 0) - before
+                changed += last
+        elapsed = time.perf_counter() - start
+
+    print(f"строчек добавлено:          {n_lines}")
+    print(f"строк бд изменено, всего:   {changed}")
+    print(f"строк бд на добавление:     {changed / n_lines:.1f}")
+    print(f"строк бд на последнее:      {last}")
+    print(f"мс на добавление, среднее:  {elapsed / n_lines * 1e3:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# benchmarks/common.py
+# Общие помощники бенчмарков: наполнение бд тестовыми счетами.
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+from billing_system.domain.aggregates import Invoice
+from billing_system.domain.value_objects import (
+    Currency,
+    InvoiceId,
+    InvoiceLine,
+    Money,
+)
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+
+
+def make_line(i: int) -> InvoiceLine:
+    """Детерминированная строчка счета с номером i."""
+    return InvoiceLine(
+        f"Товар {i % 1000}",
+        Money(Decimal(i % 997) + Decimal("0.99"), Currency.EUR),
+        Decimal(i % 7 + 1) / 4,
+    )
+
+
+def make_invoice(n_lines: int) -> Invoice:
+    """Черновик счета в EUR с n_lines строчками."""
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid.uuid4()))
+    for i in range(n_lines):
+        invoice.add_line(make_line(i))
+    return invoice
+
+
+def fill_invoice(path: Path, n_lines: int) -> InvoiceId:
+    """Создает в бд счет с n_lines строчками и возвращает его Id."""
+    invoice = make_invoice(n_lines)
+    uow = SqliteUnitOfWork(path)
+    with uow:
+        uow.invoices.add(invoice)
+    return invoice.invoice_id
@@ -2,7 +2,9 @@
 from decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from billing_system.domain.value_objects import QUANTITY_DECIMAL_PLACES
 
 
 class CreateInvoiceRequest(BaseModel):
@@ -20,7 +22,7 @@ class InvoiceAddLineRequest(BaseModel):
 
     invoice_id: UUID
     amount: Decimal
-    quantity: Decimal
+    quantity: Decimal = Field(decimal_places=QUANTITY_DECIMAL_PLACES)
     description: str
 
 
@@ -1,4 +1,5 @@
 # src/billing_system/application/errors/__init__.py
 from .invoice_not_found import InvoiceNotFoundError
+from .storage_busy import StorageBusyError
 
-__all__ = ["InvoiceNotFoundError"]
+__all__ = ["InvoiceNotFoundError", "StorageBusyError"]
@@ -0,0 +1,5 @@
+# src/billing_system/application/errors/storage_busy.py
+
+
+class StorageBusyError(Exception):
+    """Ошибка: хранилище занято другим писателем, операцию можно повторить."""
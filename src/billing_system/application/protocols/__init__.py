@@ -1,4 +1,4 @@
 # src/billing_system/application/protocols/__init__.py
-from .uow import UnitOfWork
+from .uow import UnitOfWork, UnitOfWorkFactory
 
-__all__ = ["UnitOfWork"]
+__all__ = ["UnitOfWork", "UnitOfWorkFactory"]
@@ -1,4 +1,5 @@
 # src/billing_system/application/protocols/uow.py
+from collections.abc import Callable
 from types import TracebackType
 from typing import Protocol
 
@@ -18,6 +19,14 @@ class UnitOfWork(Protocol):
         """Метод для отката изменений в репозиториях."""
         ...
 
+    def read_only(self) -> "UnitOfWork":
+        """Метод возвращает UOW только для чтения.
+
+        Для юзкейсов-запросов: без явной транзакции и commit,
+        запись через такой UOW - ошибка хранилища.
+        """
+        ...
+
     def __enter__(self) -> "UnitOfWork":
         """Метод для входа в контекст UOW (with)."""
         ...
@@ -30,3 +39,7 @@ class UnitOfWork(Protocol):
     ) -> None:
         """Метод для выхода из контекста UOW."""
         ...
+
+
+# Фабрика UOW: каждый запрос/операция получает собственный UOW.
+type UnitOfWorkFactory = Callable[[], UnitOfWork]
@@ -3,12 +3,19 @@ from .add_line import InvoiceAddLine
 from .create_invoice import CreateInvoice
 from .get_invoices import GetInvoice
 from .issue_invoice import IssueInvoice
+from .projection import invoice_read
+from .retry import DEFAULT_RETRY, RetryMetrics, RetryPolicy, RetryStats
 from .void_invoice import VoidInvoice
 
 __all__ = [
+    "DEFAULT_RETRY",
     "CreateInvoice",
     "GetInvoice",
     "InvoiceAddLine",
     "IssueInvoice",
+    "RetryMetrics",
+    "RetryPolicy",
+    "RetryStats",
     "VoidInvoice",
+    "invoice_read",
 ]
@@ -1,20 +1,37 @@
 # src/billing_system/application/usecase/add_line.py
-from billing_system.application.dto import InvoiceAddLineRequest
+from functools import partial
+
+from billing_system.application.dto import (
+    InvoiceAddLineRequest,
+    InvoiceRead,
+)
 from billing_system.application.protocols import UnitOfWork
 from billing_system.domain.value_objects.invoice_id import InvoiceId
 from billing_system.domain.value_objects.invoice_line import InvoiceLine
 from billing_system.domain.value_objects.money import Money
 
+from .projection import invoice_read
+from .retry import DEFAULT_RETRY, RetryPolicy
+
 
 class InvoiceAddLine:
     """Класс для представления юзкейса добавления строчки в счет."""
 
-    def __init__(self, uow: UnitOfWork) -> None:
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        retry: RetryPolicy = DEFAULT_RETRY,
+    ) -> None:
         """Метод для инициализации юзкейса для добавления строчки в счет."""
         self.__uow = uow
+        self.__retry = retry
+
+    def __call__(self, req: InvoiceAddLineRequest) -> InvoiceRead:
+        """Метод для добавления строчки в счет с повтором при конфликте."""
+        return self.__retry.run(partial(self.__add_line, req))
 
-    def __call__(self, req: InvoiceAddLineRequest) -> None:
-        """Метод для добавления строчки в счет."""
+    def __add_line(self, req: InvoiceAddLineRequest) -> InvoiceRead:
+        """Одна попытка добавления строчки в счет."""
         with self.__uow as uow:
             invoice = uow.invoices.get(InvoiceId(req.invoice_id))
             line = InvoiceLine(
@@ -24,3 +41,4 @@ class InvoiceAddLine:
             )
             invoice.add_line(line)
             uow.invoices.save(invoice)
+            return invoice_read(invoice)
@@ -1,20 +1,35 @@
 # src/billing_system/application/usecase/create_invoice.py
-from billing_system.application.dto import CreateInvoiceRequest
+from functools import partial
+
+from billing_system.application.dto import CreateInvoiceRequest, InvoiceRead
 from billing_system.application.protocols import UnitOfWork
 from billing_system.domain.aggregates import Invoice
 from billing_system.domain.value_objects import Currency, InvoiceId
 
+from .projection import invoice_read
+from .retry import DEFAULT_RETRY, RetryPolicy
+
 
 class CreateInvoice:
     """Класс юзкейс для создания счета."""
 
-    def __init__(self, uow: UnitOfWork) -> None:
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        retry: RetryPolicy = DEFAULT_RETRY,
+    ) -> None:
         self.__uow = uow
+        self.__retry = retry
 
-    def __call__(self, req: CreateInvoiceRequest) -> None:
+    def __call__(self, req: CreateInvoiceRequest) -> InvoiceRead:
         """Функция вызова юзкейса - создать счет."""
+        return self.__retry.run(partial(self.__create, req))
+
+    def __create(self, req: CreateInvoiceRequest) -> InvoiceRead:
+        """Одна попытка создания счета."""
         with self.__uow as uow:
             invoice_id = InvoiceId(req.id)
             currency = Currency.from_code(req.currency)
             invoice = Invoice(currency=currency, invoice_id=invoice_id)
             uow.invoices.add(invoice=invoice)
+            return invoice_read(invoice)
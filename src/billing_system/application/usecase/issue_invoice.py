@@ -1,9 +1,14 @@
 # src/billing_system/application/usecase/issue_invoice.py
-from billing_system.application.dto import IssueInvoiceRequest
+from functools import partial
+
+from billing_system.application.dto import InvoiceRead, IssueInvoiceRequest
 from billing_system.application.protocols import UnitOfWork
 from billing_system.domain.protocols import ClockProtocol
 from billing_system.domain.value_objects import InvoiceId
 
+from .projection import invoice_read
+from .retry import DEFAULT_RETRY, RetryPolicy
+
 
 class IssueInvoice:
     """Класс для юзкейса выставления счета."""
@@ -12,14 +17,21 @@ class IssueInvoice:
         self,
         uow: UnitOfWork,
         clock: ClockProtocol,
+        retry: RetryPolicy = DEFAULT_RETRY,
     ) -> None:
         self.__uow = uow
         self.__clock = clock
+        self.__retry = retry
 
-    def __call__(self, req: IssueInvoiceRequest) -> None:
+    def __call__(self, req: IssueInvoiceRequest) -> InvoiceRead:
         """Метод для вызова юзкейса - выставление счета."""
+        return self.__retry.run(partial(self.__issue, req))
+
+    def __issue(self, req: IssueInvoiceRequest) -> InvoiceRead:
+        """Одна попытка выставления счета."""
         with self.__uow as uow:
             invoice_id = InvoiceId(req.invoice_id)
             invoice = uow.invoices.get(invoice_id)
             invoice.issue(self.__clock)
             uow.invoices.save(invoice=invoice)
+            return invoice_read(invoice)
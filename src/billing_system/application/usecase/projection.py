@@ -0,0 +1,29 @@
+# src/billing_system/application/usecase/projection.py
+from billing_system.application.dto import InvoiceRead, LineRead
+from billing_system.domain.aggregates import Invoice
+
+
+def invoice_read(invoice: Invoice) -> InvoiceRead:
+    """Проекция агрегата счета в DTO на чтение.
+
+    Общая для запросов и команд: команда возвращает проекцию агрегата,
+    который уже держит в памяти, без повторного чтения из хранилища.
+    """
+    lines = [
+        LineRead(
+            amount=line.unit_price.amount,
+            quantity=line.quantity,
+            description=line.description,
+        )
+        for line in invoice.lines
+    ]
+    return InvoiceRead(
+        invoice_id=invoice.invoice_id,
+        currency=invoice.currency.value,
+        status=invoice.status.value,
+        lines=lines,
+        tax=invoice.tax.amount.amount if invoice.tax else None,
+        discount=invoice.discount.amount.amount if invoice.discount else None,
+        subtotal=invoice.subtotal.amount,
+        total=invoice.total.amount,
+    )
@@ -0,0 +1,113 @@
+# src/billing_system/application/usecase/retry.py
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+
+from billing_system.application.errors import StorageBusyError
+from billing_system.domain.errors import InvoiceVersionConflictError
+
+
+@dataclass(frozen=True, slots=True)
+class RetryStats:
+    """Счетчики повторов юзкейсов.
+
+    by_error - число повторов по имени класса ошибки, backoff - суммарная
+    пауза перед повторами в секундах.
+    """
+
+    calls: int
+    retries: int
+    exhausted: int
+    backoff: float
+    by_error: Mapping[str, int]
+
+
+class RetryMetrics:
+    """Потокобезопасные счетчики повторов, общие для юзкейсов политики."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls = 0
+        self.__retries = 0
+        self.__exhausted = 0
+        self.__backoff = 0.0
+        self.__by_error: dict[str, int] = {}
+
+    @property
+    def stats(self) -> RetryStats:
+        """Снимок счетчиков."""
+        with self.__lock:
+            return RetryStats(
+                calls=self.__calls,
+                retries=self.__retries,
+                exhausted=self.__exhausted,
+                backoff=self.__backoff,
+                by_error=dict(self.__by_error),
+            )
+
+    def record_call(self) -> None:
+        """Учитывает вызов юзкейса."""
+        with self.__lock:
+            self.__calls += 1
+
+    def record_retry(self, error: type[Exception], delay: float) -> None:
+        """Учитывает повтор после ошибки error с паузой delay."""
+        with self.__lock:
+            self.__retries += 1
+            self.__backoff += delay
+            name = error.__name__
+            self.__by_error[name] = self.__by_error.get(name, 0) + 1
+
+    def record_exhausted(self) -> None:
+        """Учитывает вызов, исчерпавший все попытки."""
+        with self.__lock:
+            self.__exhausted += 1
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Политика повтора юзкейса при конфликте или занятом хранилище.
+
+    Юзкейс повторяется целиком в новом UOW: счет перечитывается
+    со свежей версией, и команда применяется заново.
+    attempts - общее число попыток, включая первую. Пауза перед n-м
+    повтором случайна в [0, min(max_backoff, backoff * 2**n)) секунд
+    (full jitter), чтобы конкурирующие писатели не сталкивались снова.
+    jitter - источник случайного множителя из [0, 1).
+    """
+
+    attempts: int = 3
+    retry_on: tuple[type[Exception], ...] = (
+        InvoiceVersionConflictError,
+        StorageBusyError,
+    )
+    backoff: float = 0.005
+    max_backoff: float = 0.1
+    metrics: RetryMetrics = field(default_factory=RetryMetrics, compare=False)
+    sleep: Callable[[float], None] = field(default=time.sleep, compare=False)
+    jitter: Callable[[], float] = field(default=random.random, compare=False)
+
+    def delay(self, retry: int) -> float:
+        """Пауза перед повтором номер retry (с нуля)."""
+        return self.jitter() * min(self.max_backoff, self.backoff * 2.0**retry)
+
+    def run[T](self, func: Callable[[], T]) -> T:
+        """Вызывает func, повторяя его на ошибках из retry_on."""
+        self.metrics.record_call()
+        for retry in range(self.attempts - 1):
+            try:
+                return func()
+            except self.retry_on as e:
+                delay = self.delay(retry)
+                self.metrics.record_retry(type(e), delay)
+                self.sleep(delay)
+        try:
+            return func()
+        except self.retry_on:
+            self.metrics.record_exhausted()
+            raise
+
+
+DEFAULT_RETRY = RetryPolicy()
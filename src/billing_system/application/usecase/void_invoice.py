@@ -1,9 +1,14 @@
 # src/billing_system/application/usecase/void_invoice.py
-from billing_system.application.dto import VoidInvoiceRequest
+from functools import partial
+
+from billing_system.application.dto import InvoiceRead, VoidInvoiceRequest
 from billing_system.application.protocols import UnitOfWork
 from billing_system.domain.protocols import ClockProtocol
 from billing_system.domain.value_objects import InvoiceId
 
+from .projection import invoice_read
+from .retry import DEFAULT_RETRY, RetryPolicy
+
 
 class VoidInvoice:
     """Класс для юзкейса аннулирования счета."""
@@ -12,14 +17,21 @@ class VoidInvoice:
         self,
         uow: UnitOfWork,
         clock: ClockProtocol,
+        retry: RetryPolicy = DEFAULT_RETRY,
     ) -> None:
         self.__uow = uow
         self.__clock = clock
+        self.__retry = retry
 
-    def __call__(self, req: VoidInvoiceRequest) -> None:
+    def __call__(self, req: VoidInvoiceRequest) -> InvoiceRead:
         """Метод для вызова юзкейса - аннулирование счета."""
+        return self.__retry.run(partial(self.__void, req))
+
+    def __void(self, req: VoidInvoiceRequest) -> InvoiceRead:
+        """Одна попытка аннулирования счета."""
         with self.__uow as uow:
             invoice_id = InvoiceId(req.invoice_id)
             invoice = uow.invoices.get(invoice_id)
             invoice.void(self.__clock, req.idempotency_key)
             uow.invoices.save(invoice=invoice)
+            return invoice_read(invoice)
@@ -1,4 +1,4 @@
 # src/billing_system/domain/aggregates/__init__.py
-from .invoice import Invoice, InvoiceRehydrateData
+from .invoice import Invoice, InvoiceChanges, InvoiceRehydrateData
 
-__all__ = ["Invoice", "InvoiceRehydrateData"]
+__all__ = ["Invoice", "InvoiceChanges", "InvoiceRehydrateData"]
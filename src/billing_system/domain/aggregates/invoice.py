@@ -2,7 +2,6 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from decimal import Decimal
 
 from billing_system.domain.errors import (
     InvoiceCurrencyMismatchError,
@@ -23,7 +22,11 @@ from billing_system.domain.value_objects import (
 
 @dataclass(frozen=True)
 class InvoiceRehydrateData:
-    """Объект для регидрации счета."""
+    """Объект для регидрации счета.
+
+    version - версия записи счета в хранилище для оптимистичной
+    блокировки.
+    """
 
     invoice_id: InvoiceId
     currency: Currency
@@ -36,6 +39,25 @@ class InvoiceRehydrateData:
     voided_at: datetime | None
     void_idempotency: str | None
     paid_idempotency: str | None
+    version: int = 0
+
+
+@dataclass(frozen=True)
+class InvoiceChanges:
+    """Изменения счета с момента регидрации или последней записи в бд.
+
+    fields - имена измененных свойств счета, new_lines - добавленные
+    строчки, начиная с позиции lines_start.
+    """
+
+    fields: frozenset[str]
+    lines_start: int
+    new_lines: tuple[InvoiceLine, ...]
+
+    @property
+    def is_empty(self) -> bool:
+        """Свойство: нет ли изменений для записи."""
+        return not self.fields and not self.new_lines
 
 
 class Invoice:
@@ -51,6 +73,10 @@ class Invoice:
         self.__invoice_id = invoice_id
         self.__status = InvoiceStatus.DRAFT
         self.__lines: list[InvoiceLine] = []
+        # Суммы строчек (int, минорные единицы) и subtotal ведутся
+        # инкрементально: subtotal/total не пересчитывают строчки.
+        self.__line_totals: list[int] = []
+        self.__subtotal = Money.from_minor(0, currency)
         self.__discount: Discount | None = None
         self.__tax: Tax | None = None
         self.__iss_at: datetime | None = None
@@ -58,6 +84,11 @@ class Invoice:
         self.__voided_at: datetime | None = None
         self.__void_idempotency: str | None = None
         self.__paid_idempotency: str | None = None
+        # Отслеживание изменений для репозиториев: измененные свойства
+        # и число строчек, уже записанных в хранилище.
+        self.__changed: set[str] = set()
+        self.__persisted_lines = 0
+        self.__version = 0
 
     @classmethod
     def rehydrate(
@@ -68,6 +99,11 @@ class Invoice:
         invoice = cls(currency=data.currency, invoice_id=data.invoice_id)
         invoice.__status = data.status
         invoice.__lines = data.lines
+        invoice.__line_totals = [line.line_total.minor for line in data.lines]
+        invoice.__subtotal = Money.from_minor(
+            sum(invoice.__line_totals),
+            data.currency,
+        )
         invoice.__tax = data.tax
         invoice.__discount = data.discount
         invoice.__iss_at = data.issued_at
@@ -75,6 +111,8 @@ class Invoice:
         invoice.__voided_at = data.voided_at
         invoice.__void_idempotency = data.void_idempotency
         invoice.__paid_idempotency = data.paid_idempotency
+        invoice.__persisted_lines = len(data.lines)
+        invoice.__version = data.version
         return invoice
 
     @property
@@ -92,11 +130,23 @@ class Invoice:
         """Геттер для статуса счета."""
         return self.__status
 
+    @property
+    def version(self) -> int:
+        """Геттер для версии записи счета в хранилище."""
+        return self.__version
+
     @property
     def lines(self) -> tuple[InvoiceLine, ...]:
         """Геттер для строчек счета - возвращает копию."""
         return tuple(self.__lines)
 
+    @property
+    def line_totals(self) -> tuple[Money, ...]:
+        """Геттер для сумм строчек счета в порядке строчек."""
+        return tuple(
+            Money.from_minor(t, self.__currency) for t in self.__line_totals
+        )
+
     @property
     def discount(self) -> Discount | None:
         """Геттер для скидки счета (может быть None)."""
@@ -144,7 +194,7 @@ class Invoice:
             )
 
     def _zero(self) -> Money:
-        return Money(Decimal("0.00"), self.__currency)
+        return Money.from_minor(0, self.__currency)
 
     def _require_currency(
         self,
@@ -166,7 +216,10 @@ class Invoice:
             line.unit_price.currency,
             "Нельзя добавить строчку с валютой отличной от счета.",
         )
+        line_total = line.line_total
         self.__lines.append(line)
+        self.__line_totals.append(line_total.minor)
+        self.__subtotal = self.__subtotal + line_total
 
     def set_discount(self, discount: Discount) -> None:
         """Метод для установки скидки."""
@@ -179,6 +232,7 @@ class Invoice:
             "Нельзя добавить скидку с отличной от счета валютой.",
         )
         self.__discount = discount
+        self.__changed.add("discount")
 
     def set_tax(self, tax: Tax) -> None:
         """Метод для установки налога."""
@@ -191,6 +245,7 @@ class Invoice:
             "Нельзя установить налог с отличной от счета валютой.",
         )
         self.__tax = tax
+        self.__changed.add("tax")
 
     def issue(self, clock: ClockProtocol) -> None:
         """Метод для выставления счета."""
@@ -204,6 +259,7 @@ class Invoice:
             )
         self.__status = InvoiceStatus.ISSUED
         self.__iss_at = clock.now()
+        self.__changed.update(("status", "issued_at"))
 
     def void(self, clock: ClockProtocol, idempotency_key: str) -> None:
         """Метод для обнуления счета."""
@@ -218,6 +274,7 @@ class Invoice:
         self.__status = InvoiceStatus.VOID
         self.__voided_at = clock.now()
         self.__void_idempotency = idempotency_key
+        self.__changed.update(("status", "voided_at", "void_idempotency_key"))
 
     def _check_idempotency(self, idempotency_key: str) -> None:
         if not idempotency_key or not idempotency_key.strip():
@@ -261,14 +318,52 @@ class Invoice:
         self.__status = InvoiceStatus.PAID
         self.__paid_at = clock.now()
         self.__paid_idempotency = idempotency_key
+        self.__changed.update(
+            ("status", "paid_at", "payment_idempotency_key"),
+        )
+
+    def pending_changes(self) -> InvoiceChanges:
+        """Метод возвращает изменения счета, еще не записанные в бд."""
+        return InvoiceChanges(
+            fields=frozenset(self.__changed),
+            lines_start=self.__persisted_lines,
+            new_lines=tuple(self.__lines[self.__persisted_lines :]),
+        )
+
+    def mark_persisted(self, version: int | None = None) -> None:
+        """Метод отмечает текущее состояние счета как записанное в бд.
+
+        version - новая версия записи, если хранилище ее сменило.
+        """
+        self.__changed.clear()
+        self.__persisted_lines = len(self.__lines)
+        if version is not None:
+            self.__version = version
+
+    def snapshot(self) -> InvoiceRehydrateData:
+        """Метод возвращает данные для регидрации копии счета.
+
+        Список строчек копируется: снимок не меняется вместе со счетом.
+        """
+        return InvoiceRehydrateData(
+            invoice_id=self.__invoice_id,
+            currency=self.__currency,
+            status=self.__status,
+            lines=list(self.__lines),
+            tax=self.__tax,
+            discount=self.__discount,
+            issued_at=self.__iss_at,
+            paid_at=self.__paid_at,
+            voided_at=self.__voided_at,
+            void_idempotency=self.__void_idempotency,
+            paid_idempotency=self.__paid_idempotency,
+            version=self.__version,
+        )
 
     @property
     def subtotal(self) -> Money:
         """Метод для нахождения общей суммы счета без налога и скидок."""
-        sub = self._zero()
-        for line in self.__lines:
-            sub = sub + line.line_total
-        return sub
+        return self.__subtotal
 
     @property
     def total(self) -> Money:
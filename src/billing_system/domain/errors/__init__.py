@@ -8,6 +8,7 @@ from .invoice_currency_mismatch import InvoiceCurrencyMismatchError
 from .invoice_not_found import InvoiceNotFoundError
 from .invoice_not_unique import InvoiceNotUniqueError
 from .invoice_operation import InvoiceOperationError
+from .invoice_version_conflict import InvoiceVersionConflictError
 from .negative_money import NegativeMoneyError
 
 __all__ = [
@@ -20,5 +21,6 @@ __all__ = [
     "InvoiceNotFoundError",
     "InvoiceNotUniqueError",
     "InvoiceOperationError",
+    "InvoiceVersionConflictError",
     "NegativeMoneyError",
 ]
@@ -0,0 +1,8 @@
+# src/billing_system/domain/errors/invoice_version_conflict.py
+from .domain_error import DomainError
+
+
+class InvoiceVersionConflictError(DomainError):
+    """Ошибка: счет изменен параллельно с момента загрузки."""
+
+    status_code = 409
@@ -1,4 +1,4 @@
 # src/billing_system/domain/repositories/__init__.py
-from .invoice import InvoiceRepository
+from .invoice import InvoiceBatch, InvoiceHeader, InvoiceRepository
 
-__all__ = ["InvoiceRepository"]
+__all__ = ["InvoiceBatch", "InvoiceHeader", "InvoiceRepository"]
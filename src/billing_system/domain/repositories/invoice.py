@@ -1,8 +1,82 @@
 # src/billing_system/domain/repositories/invoice.py
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
 
 from billing_system.domain.aggregates import Invoice
-from billing_system.domain.value_objects import InvoiceId
+from billing_system.domain.value_objects import (
+    Currency,
+    InvoiceId,
+    InvoiceStatus,
+    Money,
+)
+
+
+@dataclass(frozen=True)
+class InvoiceHeader:
+    """Заголовок счета: статус, суммы и число строчек без самих строчек.
+
+    total - subtotal + налог - скидка без проверки знака
+    (Invoice.total на отрицательной сумме выбрасывает ошибку).
+    """
+
+    invoice_id: InvoiceId
+    currency: Currency
+    status: InvoiceStatus
+    subtotal: Money
+    total: Money
+    line_count: int
+    issued_at: datetime | None
+    version: int
+
+    @classmethod
+    def of(cls, invoice: Invoice) -> "InvoiceHeader":
+        """Заголовок загруженного счета."""
+        total = invoice.subtotal
+        if invoice.tax is not None:
+            total = total + invoice.tax.amount
+        if invoice.discount is not None:
+            total = total - invoice.discount.amount
+        return cls(
+            invoice_id=invoice.invoice_id,
+            currency=invoice.currency,
+            status=invoice.status,
+            subtotal=invoice.subtotal,
+            total=total,
+            line_count=len(invoice.lines),
+            issued_at=invoice.issued_at,
+            version=invoice.version,
+        )
+
+
+@dataclass(frozen=True)
+class InvoiceBatch:
+    """Результат пакетного чтения счетов.
+
+    invoices - найденные счета в порядке запроса (без повторов),
+    missing - Id, которых нет в хранилище.
+    """
+
+    invoices: dict[InvoiceId, Invoice]
+    missing: tuple[InvoiceId, ...]
+
+    @classmethod
+    def collect(
+        cls,
+        invoice_ids: Iterable[InvoiceId],
+        found: Mapping[InvoiceId, Invoice],
+    ) -> "InvoiceBatch":
+        """Раскладывает Id запроса на найденные счета и отсутствующие."""
+        invoices: dict[InvoiceId, Invoice] = {}
+        missing: list[InvoiceId] = []
+        for invoice_id in dict.fromkeys(invoice_ids):
+            invoice = found.get(invoice_id)
+            if invoice is None:
+                missing.append(invoice_id)
+            else:
+                invoices[invoice_id] = invoice
+        return cls(invoices, tuple(missing))
 
 
 class InvoiceRepository(ABC):
@@ -12,6 +86,31 @@ class InvoiceRepository(ABC):
     def get(self, invoice_id: InvoiceId) -> Invoice:
         """Метод должен возвращать счет по его Id."""
 
+    @abstractmethod
+    def get_many(self, invoice_ids: Iterable[InvoiceId]) -> InvoiceBatch:
+        """Метод должен возвращать счета по списку Id.
+
+        Отсутствующие счета не вызывают ошибку, а попадают в missing.
+        """
+
+    @abstractmethod
+    def header(self, invoice_id: InvoiceId) -> InvoiceHeader:
+        """Метод должен возвращать заголовок счета без его строчек."""
+
+    @abstractmethod
+    def headers(
+        self,
+        *,
+        status: InvoiceStatus | None = None,
+        after: InvoiceId | None = None,
+        limit: int = 100,
+    ) -> list[InvoiceHeader]:
+        """Метод должен возвращать страницу заголовков счетов.
+
+        Заголовки упорядочены по Id (по байтам), следующая страница -
+        after=<Id последнего заголовка>.
+        """
+
     @abstractmethod
     def add(self, invoice: Invoice) -> None:
         """Метод должен создавать счет."""
@@ -2,12 +2,13 @@
 from .currency import Currency
 from .discount import Discount
 from .invoice_id import InvoiceId
-from .invoice_line import InvoiceLine
+from .invoice_line import QUANTITY_DECIMAL_PLACES, InvoiceLine
 from .invoice_status import InvoiceStatus
 from .money import Money
 from .tax import Tax
 
 __all__ = [
+    "QUANTITY_DECIMAL_PLACES",
     "Currency",
     "Discount",
     "InvoiceId",
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from .money import Money
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Discount:
     """Класс Value Object для скидки.
 
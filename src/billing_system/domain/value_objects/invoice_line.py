@@ -11,9 +11,14 @@ from billing_system.domain.errors import (
 from .money import Money
 
 MAX_LINE_DESCRIPTION_LENGTH = 60
+# Точность количества: хранилища держат его целым числом
+# миллионных долей (quantity * 10**6).
+QUANTITY_DECIMAL_PLACES = 6
+# Наибольшее количество, которое умещается в int64 после * 10**6.
+MAX_QUANTITY = Decimal(2**63 - 1).scaleb(-QUANTITY_DECIMAL_PLACES)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InvoiceLine:
     """Класс данных Value Object для строчки/записи в счете."""
 
@@ -30,8 +35,20 @@ class InvoiceLine:
                 f"{MAX_LINE_DESCRIPTION_LENGTH} символов.",
             )
             raise InvalidInvoiceLineError(msg)
-        if self.quantity <= 0:
+        if not self.quantity.is_finite() or self.quantity <= 0:
             raise InvalidQuantityError("Количество должно быть положительным.")
+        if self.quantity > MAX_QUANTITY:
+            max_msg = f"Количество не может быть больше {MAX_QUANTITY}."
+            raise InvalidQuantityError(max_msg)
+        # Знаки после запятой - по показателю без хвостовых нулей:
+        # остаток % 1 на больших количествах дает InvalidOperation.
+        exponent = self.quantity.normalize().as_tuple().exponent
+        if isinstance(exponent, int) and exponent < -QUANTITY_DECIMAL_PLACES:
+            places_msg = (
+                f"Количество может иметь не больше "
+                f"{QUANTITY_DECIMAL_PLACES} знаков после запятой."
+            )
+            raise InvalidQuantityError(places_msg)
 
     @property
     def line_total(self) -> Money:
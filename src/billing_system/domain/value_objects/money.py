@@ -11,29 +11,39 @@ from billing_system.domain.errors import (
 from .currency import Currency
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, init=False, slots=True)
 class Money:
-    """Датакласс value object для представления денег в системе."""
+    """Датакласс value object для представления денег в системе.
 
-    amount: Decimal
+    Хранит сумму в целых минорных единицах валюты (копейки, центы),
+    поэтому сложение и вычитание идут по int без квантования.
+    К Decimal возвращаемся только при умножении на скаляр и при выводе.
+    """
+
+    minor: int
     currency: Currency
 
-    def __post_init__(self) -> None:
-        """Проверка инвариантов после инициализации."""
-        if not self.amount.is_finite():
+    def __init__(self, amount: Decimal, currency: Currency) -> None:
+        """Проверка инвариантов и перевод суммы в минорные единицы."""
+        if not amount.is_finite():
             raise InvalidMoneyError("Деньги должны быть вещественными.")
 
-        q: Decimal = self.__quantize(self.amount)
-        object.__setattr__(self, "amount", q)
+        q: Decimal = amount.quantize(currency.quantum, rounding=ROUND_HALF_UP)
+        object.__setattr__(self, "minor", int(q.scaleb(currency.exp)))
+        object.__setattr__(self, "currency", currency)
 
-    def __quantize(self, amount: Decimal) -> Decimal:
-        """Квантование до точности валюты."""
-        q_exp: Decimal = (
-            Decimal("1." + "0" * self.currency.exp)
-            if self.currency.exp > 0
-            else Decimal(1)
-        )
-        return amount.quantize(q_exp, rounding=ROUND_HALF_UP)
+    @classmethod
+    def from_minor(cls, minor: int, currency: Currency) -> "Money":
+        """Создает деньги из минорных единиц без квантования."""
+        money = object.__new__(cls)
+        object.__setattr__(money, "minor", minor)
+        object.__setattr__(money, "currency", currency)
+        return money
+
+    @property
+    def amount(self) -> Decimal:
+        """Сумма в мажорных единицах с точностью валюты."""
+        return Decimal(self.minor).scaleb(-self.currency.exp)
 
     def __add__(self, other: object) -> "Money":
         """Сложение с другими деньгами."""
@@ -43,10 +53,7 @@ class Money:
         if self.currency != other.currency:
             raise CurrencyMismatchError("Можно складывать только одну валюту.")
 
-        return Money(
-            amount=self.amount + other.amount,
-            currency=self.currency,
-        )
+        return Money.from_minor(self.minor + other.minor, self.currency)
 
     def __sub__(self, other: object) -> "Money":
         """Вычитание с другими деньгами."""
@@ -56,26 +63,27 @@ class Money:
         if self.currency != other.currency:
             raise CurrencyMismatchError("Можно вычитать только одну валюту.")
 
-        return Money(
-            amount=self.amount - other.amount,
-            currency=self.currency,
-        )
+        return Money.from_minor(self.minor - other.minor, self.currency)
 
     def __mul__(self, value: object) -> "Money":
         """Умножение денег на скаляр."""
-        if not isinstance(value, (int, Decimal)):
+        if isinstance(value, int):
+            return Money.from_minor(self.minor * value, self.currency)
+
+        if not isinstance(value, Decimal):
             raise TypeError("Можно умножать деньги на int и Decimal.")
 
-        value = Decimal(value)
         if not value.is_finite():
             raise InvalidMoneyError(
                 "Деньги могут умножаться только на вещественное.",
             )
 
-        return Money(
-            amount=self.amount * value,
-            currency=self.currency,
+        # Округление в минорных единицах совпадает с квантованием суммы
+        # до точности валюты: меняется только экспонента, не цифры.
+        product = (Decimal(self.minor) * value).to_integral_value(
+            rounding=ROUND_HALF_UP,
         )
+        return Money.from_minor(int(product), self.currency)
 
     def __rmul__(self, value: object) -> "Money":
         """Поддержка умножения справа."""
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from .money import Money
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Tax:
     """Класс Value Object для налога.
 
@@ -0,0 +1,58 @@
+# src/billing_system/infrastructure/api/executor.py
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import FastAPI
+
+DEFAULT_WORKERS = 16
+
+
+class UseCaseExecutor:
+    """Выполняет синхронные юзкейсы в ограниченном пуле потоков.
+
+    Юзкейсы делают блокирующий ввод-вывод sqlite3; в пуле потоков
+    медленная запись не останавливает event loop и остальные запросы.
+    Размер пула стоит держать не больше размера пула соединений.
+    on_shutdown вызывается после остановки пула (например, закрывает
+    пул соединений, которым пользовались юзкейсы).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        *,
+        on_shutdown: Callable[[], None] | None = None,
+    ) -> None:
+        self.__pool = ThreadPoolExecutor(
+            max_workers,
+            thread_name_prefix="usecase",
+        )
+        self.__on_shutdown = on_shutdown
+
+    async def run[**P, T](
+        self,
+        func: Callable[P, T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """Выполняет func(*args, **kwargs) в пуле и ждет результат."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.__pool,
+            partial(func, *args, **kwargs),
+        )
+
+    def shutdown(self) -> None:
+        """Дожидается юзкейсов, останавливает пул, вызывает on_shutdown."""
+        self.__pool.shutdown(wait=True)
+        if self.__on_shutdown is not None:
+            self.__on_shutdown()
+
+    @asynccontextmanager
+    async def lifespan(self, _: FastAPI) -> AsyncIterator[None]:
+        """Lifespan fastapi: останавливает пул при остановке приложения."""
+        yield
+        self.shutdown()
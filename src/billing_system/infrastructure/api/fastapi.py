@@ -1,5 +1,7 @@
 # src/billing_system/infrastructure/api/fastapi.py
 import uuid
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 from typing import Annotated
 
@@ -14,7 +16,11 @@ from billing_system.application.dto.invoice import (
     IssueInvoiceRequest,
     VoidInvoiceRequest,
 )
-from billing_system.application.protocols.uow import UnitOfWork
+from billing_system.application.errors import StorageBusyError
+from billing_system.application.protocols.uow import (
+    UnitOfWork,
+    UnitOfWorkFactory,
+)
 from billing_system.application.usecase import (
     CreateInvoice,
     GetInvoice,
@@ -25,22 +31,56 @@ from billing_system.application.usecase import (
 from billing_system.domain.errors import DomainError
 from billing_system.domain.protocols.clock import ClockProtocol
 from billing_system.domain.value_objects import Currency, InvoiceId
+from billing_system.infrastructure.api.executor import (
+    DEFAULT_WORKERS,
+    UseCaseExecutor,
+)
+from billing_system.infrastructure.cache import InvoiceCache
+from billing_system.infrastructure.protocols.sqlite_pool import (
+    SqliteConnectionPool,
+)
 from billing_system.infrastructure.protocols.sqlite_uow import SqliteUnitOfWork
 from billing_system.infrastructure.protocols.system_clock import SystemClock
 
 
-def create_app(_uow: UnitOfWork, _clock: ClockProtocol) -> FastAPI:
+async def storage_busy_handler(
+    _: Request,
+    exc: Exception,
+) -> JSONResponse:
+    """Хранилище занято и после повторов: клиенту стоит повторить."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+def create_app(
+    _uow_factory: UnitOfWorkFactory,
+    _clock: ClockProtocol,
+    *,
+    max_workers: int = DEFAULT_WORKERS,
+    on_shutdown: Callable[[], None] | None = None,
+) -> FastAPI:
     """Фабрика для создания fastapi адаптера.
 
-    Принимает протокол часов и UOW объект.
+    Принимает протокол часов и фабрику UOW: каждый запрос получает
+    собственный UOW, поэтому запросы не делят соединение.
+    Юзкейсы выполняются в пуле из max_workers потоков, а не в event loop.
+    on_shutdown вызывается при остановке приложения, после того как
+    пул потоков дождется запущенных юзкейсов (например, закрывает пул
+    соединений).
     """
-    _app = FastAPI()
+    executor = UseCaseExecutor(max_workers, on_shutdown=on_shutdown)
+    _app = FastAPI(lifespan=executor.lifespan)
     invoices = APIRouter(prefix="/invoice")
 
-    def get_uow() -> UnitOfWork:
-        return _uow
+    # async: создание UOW не блокирует, а sync зависимость fastapi
+    # гоняет через свой пул потоков.
+    async def get_uow() -> UnitOfWork:
+        return _uow_factory()
 
-    def get_clock() -> ClockProtocol:
+    async def get_clock() -> ClockProtocol:
         return _clock
 
     @_app.exception_handler(DomainError)
@@ -54,6 +94,8 @@ def create_app(_uow: UnitOfWork, _clock: ClockProtocol) -> FastAPI:
             content={"detail": str(exc)},
         )
 
+    _app.add_exception_handler(StorageBusyError, storage_busy_handler)
+
     @invoices.post("/", status_code=201)
     async def create_invoice(
         currency: Currency,
@@ -67,13 +109,13 @@ def create_app(_uow: UnitOfWork, _clock: ClockProtocol) -> FastAPI:
         if invoice_id is None:
             invoice_id = InvoiceId(uuid.uuid4())
 
-        CreateInvoice(uow)(
+        return await executor.run(
+            CreateInvoice(uow),
             CreateInvoiceRequest(
                 id=invoice_id,
                 currency=currency.value,
             ),
         )
-        return await get_invoice(invoice_id, uow)
 
     @invoices.get("/{invoice_id}")
     async def get_invoice(
@@ -81,7 +123,10 @@ def create_app(_uow: UnitOfWork, _clock: ClockProtocol) -> FastAPI:
         uow: Annotated[UnitOfWork, Depends(get_uow)],
     ) -> InvoiceRead:
         """Получает счет по его Id."""
-        return GetInvoice(uow)(GetInvoiceRequest(invoice_id=invoice_id))
+        return await executor.run(
+            GetInvoice(uow),
+            GetInvoiceRequest(invoice_id=invoice_id),
+        )
 
     @invoices.post("/add_line")
     async def add_line_to_invoice(
@@ -89,8 +134,7 @@ def create_app(_uow: UnitOfWork, _clock: ClockProtocol) -> FastAPI:
         uow: Annotated[UnitOfWork, Depends(get_uow)],
     ) -> InvoiceRead:
         """Добавляет строчку в счет."""
-        InvoiceAddLine(uow)(req)
-        return await get_invoice(InvoiceId(req.invoice_id), uow)
+        return await executor.run(InvoiceAddLine(uow), req)
 
     @invoices.post("/issue")
     async def issue_invoice(
@@ -99,8 +143,10 @@ def create_app(_uow: UnitOfWork, _clock: ClockProtocol) -> FastAPI:
         clock: Annotated[ClockProtocol, Depends(get_clock)],
     ) -> InvoiceRead:
         """Формирует счет."""
-        IssueInvoice(uow, clock)(IssueInvoiceRequest(invoice_id=invoice_id))
-        return await get_invoice(invoice_id, uow)
+        return await executor.run(
+            IssueInvoice(uow, clock),
+            IssueInvoiceRequest(invoice_id=invoice_id),
+        )
 
     @invoices.post("/void")
     async def void_invoice(
@@ -109,13 +155,17 @@ def create_app(_uow: UnitOfWork, _clock: ClockProtocol) -> FastAPI:
         clock: Annotated[ClockProtocol, Depends(get_clock)],
     ) -> InvoiceRead:
         """Аннулирует счет."""
-        VoidInvoice(uow, clock)(req)
-        return await get_invoice(InvoiceId(req.invoice_id), uow)
+        return await executor.run(VoidInvoice(uow, clock), req)
 
     _app.include_router(invoices)
     return _app
 
 
-app_uow = SqliteUnitOfWork(Path("db.sqlite"))
+app_pool = SqliteConnectionPool(Path("db.sqlite"))
+app_cache = InvoiceCache()
 app_clock = SystemClock()
-app = create_app(app_uow, app_clock)
+app = create_app(
+    partial(SqliteUnitOfWork, app_pool, cache=app_cache),
+    app_clock,
+    on_shutdown=app_pool.close,
+)
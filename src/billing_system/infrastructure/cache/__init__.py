@@ -0,0 +1,4 @@
+# src/billing_system/infrastructure/cache/__init__.py
+from .invoice_cache import IMMUTABLE_STATUSES, CacheStats, InvoiceCache
+
+__all__ = ["IMMUTABLE_STATUSES", "CacheStats", "InvoiceCache"]
@@ -0,0 +1,130 @@
+# src/billing_system/infrastructure/cache/invoice_cache.py
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from billing_system.domain.aggregates import InvoiceRehydrateData
+from billing_system.domain.value_objects import InvoiceId, InvoiceStatus
+
+# Оплаченный и аннулированный счета больше не меняются.
+IMMUTABLE_STATUSES = frozenset({InvoiceStatus.PAID, InvoiceStatus.VOID})
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Счетчики кэша счетов."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    snapshot: InvoiceRehydrateData
+    expires_at: float | None
+
+
+class InvoiceCache:
+    """Общий для всех UOW LRU кэш снимков счетов с TTL.
+
+    Хранит неизменяемые снимки (InvoiceRehydrateData), а не агрегаты:
+    каждый UOW регидрирует из снимка собственный экземпляр счета.
+    Счета в статусах PAID и VOID не устаревают по TTL, но вытесняются
+    по размеру как и остальные. Потокобезопасен.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size должен быть >= 1.")
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries: OrderedDict[InvoiceId, _Entry] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Номер поколения, растет при каждой инвалидации.
+
+        Запоминается до чтения из бд и передается в put: снимок,
+        прочитанный до чужой инвалидации, в кэш не попадет.
+        """
+        return self.__generation
+
+    @property
+    def stats(self) -> CacheStats:
+        """Снимок счетчиков кэша."""
+        with self.__lock:
+            return CacheStats(
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                expirations=self.__expirations,
+                invalidations=self.__invalidations,
+                size=len(self.__entries),
+            )
+
+    def get(self, invoice_id: InvoiceId) -> InvoiceRehydrateData | None:
+        """Возвращает снимок счета или None при промахе."""
+        with self.__lock:
+            entry = self.__entries.get(invoice_id)
+            if entry is not None and (
+                entry.expires_at is not None
+                and entry.expires_at <= self.__clock()
+            ):
+                del self.__entries[invoice_id]
+                self.__expirations += 1
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(invoice_id)
+            self.__hits += 1
+            return entry.snapshot
+
+    def put(self, snapshot: InvoiceRehydrateData, generation: int) -> None:
+        """Кладет снимок, если с generation не было инвалидаций."""
+        expires_at = (
+            None
+            if snapshot.status in IMMUTABLE_STATUSES
+            else self.__clock() + self.__ttl
+        )
+        with self.__lock:
+            if generation != self.__generation:
+                return
+            self.__entries[snapshot.invoice_id] = _Entry(snapshot, expires_at)
+            self.__entries.move_to_end(snapshot.invoice_id)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def invalidate(self, invoice_ids: Iterable[InvoiceId]) -> None:
+        """Удаляет снимки измененных счетов."""
+        with self.__lock:
+            self.__generation += 1
+            for invoice_id in invoice_ids:
+                if self.__entries.pop(invoice_id, None) is not None:
+                    self.__invalidations += 1
+
+    def clear(self) -> None:
+        """Удаляет все снимки."""
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
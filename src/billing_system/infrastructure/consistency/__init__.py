@@ -0,0 +1,14 @@
+# src/billing_system/infrastructure/consistency/__init__.py
+from .invoice_totals import (
+    TotalsMismatch,
+    check_database,
+    check_invoice_totals,
+    fix_invoice_totals,
+)
+
+__all__ = [
+    "TotalsMismatch",
+    "check_database",
+    "check_invoice_totals",
+    "fix_invoice_totals",
+]
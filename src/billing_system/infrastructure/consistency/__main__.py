@@ -0,0 +1,34 @@
+# src/billing_system/infrastructure/consistency/__main__.py
+# Сверка сумм: python -m billing_system.infrastructure.consistency db.sqlite
+import argparse
+import sys
+from pathlib import Path
+
+from .invoice_totals import check_database
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Сверяет суммы счетов со строчками, печатает расхождения.
+
+    Код выхода 1, если есть расхождения и они не исправлены (--fix).
+    """
+    parser = argparse.ArgumentParser(
+        description="Сверка сумм и числа строчек счетов со строчками.",
+    )
+    parser.add_argument("path", type=Path, help="путь к файлу бд")
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="переписать расходящиеся суммы по строчкам",
+    )
+    args = parser.parse_args(argv)
+    mismatches = check_database(args.path, fix=args.fix)
+    for m in mismatches:
+        sys.stdout.write(f"{m.invoice_id}: {m.stored} != {m.actual}\n")
+    action = "исправлено" if args.fix else "расхождений"
+    sys.stdout.write(f"{args.path}: {action} {len(mismatches)}\n")
+    return int(bool(mismatches) and not args.fix)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# src/billing_system/infrastructure/consistency/invoice_totals.py
+# Сверка денормализованных сумм Invoice со строчками InvoiceLine.
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from billing_system.domain.value_objects import InvoiceId
+from billing_system.infrastructure.repositories.invoice_sqlite_repo import (
+    LINE_TOTAL_SQL,
+    invoice_id_to_key,
+    key_to_invoice_id,
+)
+
+# Суммы и число строчек каждого счета, пересчитанные по InvoiceLine.
+ACTUAL_TOTALS_SQL = f"""
+SELECT i.id AS id,
+COALESCE(SUM({LINE_TOTAL_SQL}), 0) AS subtotal_minor,
+COALESCE(SUM({LINE_TOTAL_SQL}), 0) + COALESCE(i.tax_amount_minor, 0)
+    - COALESCE(i.discount_amount_minor, 0) AS total_minor,
+COUNT(l.invoice_id) AS line_count
+FROM `Invoice` AS i
+LEFT JOIN `InvoiceLine` AS l ON l.invoice_id = i.id
+GROUP BY i.id
+"""  # noqa: S608 - константа модуля
+
+MISMATCHES_SQL = f"""
+SELECT i.id, i.subtotal_minor, i.total_minor, i.line_count,
+a.subtotal_minor, a.total_minor, a.line_count
+FROM `Invoice` AS i JOIN ({ACTUAL_TOTALS_SQL}) AS a ON a.id = i.id
+WHERE (i.subtotal_minor, i.total_minor, i.line_count)
+    IS NOT (a.subtotal_minor, a.total_minor, a.line_count)
+ORDER BY i.id;
+"""  # noqa: S608 - константа модуля
+
+
+@dataclass(frozen=True)
+class TotalsMismatch:
+    """Счет, у которого суммы в Invoice расходятся со строчками.
+
+    Тройки - (subtotal_minor, total_minor, line_count).
+    """
+
+    invoice_id: InvoiceId
+    stored: tuple[int, int, int]
+    actual: tuple[int, int, int]
+
+
+def check_invoice_totals(conn: sqlite3.Connection) -> list[TotalsMismatch]:
+    """Возвращает счета с расхождением сумм или числа строчек."""
+    return [
+        TotalsMismatch(key_to_invoice_id(row[0]), row[1:4], row[4:7])
+        for row in conn.execute(MISMATCHES_SQL)
+    ]
+
+
+def fix_invoice_totals(conn: sqlite3.Connection) -> list[TotalsMismatch]:
+    """Переписывает суммы расходящихся счетов по их строчкам.
+
+    Проверка и исправление идут в одной транзакции BEGIN IMMEDIATE:
+    между ними счета не меняются. Возвращает исправленные счета.
+    """
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        mismatches = check_invoice_totals(conn)
+        conn.executemany(
+            """
+            UPDATE `Invoice` SET subtotal_minor = ?, total_minor = ?,
+            line_count = ? WHERE id = ?;
+            """,
+            ((*m.actual, invoice_id_to_key(m.invoice_id)) for m in mismatches),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return mismatches
+
+
+def check_database(path: Path, *, fix: bool = False) -> list[TotalsMismatch]:
+    """Открывает бд по пути и сверяет (с fix=True - исправляет) суммы."""
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        if fix:
+            return fix_invoice_totals(conn)
+        return check_invoice_totals(conn)
+    finally:
+        conn.close()
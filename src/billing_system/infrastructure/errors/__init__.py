@@ -1,5 +1,14 @@
 # src/billing_system/infrastructure/errors/__init__.py
 from .already_in_transaction import AlreadyInTransactionError
+from .group_commit import GroupCommitError
+from .migration_blocked import MigrationBlockedError
 from .no_connection import NoConnectionError
+from .pool_exhausted import PoolExhaustedError
 
-__all__ = ["AlreadyInTransactionError", "NoConnectionError"]
+__all__ = [
+    "AlreadyInTransactionError",
+    "GroupCommitError",
+    "MigrationBlockedError",
+    "NoConnectionError",
+    "PoolExhaustedError",
+]
@@ -0,0 +1,3 @@
+# src/billing_system/infrastructure/errors/group_commit.py
+class GroupCommitError(RuntimeError):
+    """Ошибка: общий commit пачки UOW не удался, изменения отменены."""
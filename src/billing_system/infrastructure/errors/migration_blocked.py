@@ -0,0 +1,15 @@
+# src/billing_system/infrastructure/errors/migration_blocked.py
+class MigrationBlockedError(RuntimeError):
+    """Ошибка: данные бд не проходят проверку шага миграции.
+
+    problems - найденные проблемы, шаг version не применен.
+    """
+
+    def __init__(self, version: int, problems: list[str]) -> None:
+        self.version = version
+        self.problems = problems
+        super().__init__(
+            f"Миграция {version} не применена, проблем: {len(problems)}. "
+            "Список: python -m billing_system.infrastructure.migrations "
+            "--check <бд>.",
+        )
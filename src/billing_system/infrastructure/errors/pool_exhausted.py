@@ -0,0 +1,6 @@
+# src/billing_system/infrastructure/errors/pool_exhausted.py
+from .no_connection import NoConnectionError
+
+
+class PoolExhaustedError(NoConnectionError):
+    """Ошибка: за время ожидания в пуле не освободилось соединение."""
@@ -0,0 +1,20 @@
+# src/billing_system/infrastructure/migrations/__init__.py
+from .migration import Migration
+from .runner import (
+    SCHEMA_VERSION,
+    check_database,
+    check_migrations,
+    migrate,
+    migrate_database,
+    schema_version,
+)
+
+__all__ = [
+    "SCHEMA_VERSION",
+    "Migration",
+    "check_database",
+    "check_migrations",
+    "migrate",
+    "migrate_database",
+    "schema_version",
+]
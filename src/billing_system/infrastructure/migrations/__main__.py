@@ -0,0 +1,51 @@
+# src/billing_system/infrastructure/migrations/__main__.py
+# Раннер миграций: python -m billing_system.infrastructure.migrations db.sqlite
+import argparse
+import sys
+from pathlib import Path
+
+from billing_system.infrastructure.errors import MigrationBlockedError
+
+from .runner import SCHEMA_VERSION, check_database, migrate_database
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Применяет миграции к файлу бд и печатает итоговую версию схемы.
+
+    С --check только печатает проблемы данных, мешающие миграциям.
+    Код возврата 1, если проблемы есть.
+    """
+    parser = argparse.ArgumentParser(
+        description="Миграции схемы sqlite биллинга.",
+    )
+    parser.add_argument("path", type=Path, help="путь к файлу бд")
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="после миграций пересобрать файл бд (VACUUM)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="только проверить данные для недостающих миграций",
+    )
+    args = parser.parse_args(argv)
+    if args.check:
+        problems = check_database(args.path)
+        for problem in problems:
+            sys.stdout.write(f"{problem}\n")
+        sys.stdout.write(f"{args.path}: проблем {len(problems)}\n")
+        return 1 if problems else 0
+    try:
+        version = migrate_database(args.path, vacuum=args.vacuum)
+    except MigrationBlockedError as e:
+        for problem in e.problems:
+            sys.stderr.write(f"{problem}\n")
+        sys.stderr.write(f"{args.path}: {e}\n")
+        return 1
+    sys.stdout.write(f"{args.path}: версия схемы {version}/{SCHEMA_VERSION}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
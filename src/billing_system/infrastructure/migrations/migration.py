@@ -0,0 +1,19 @@
+# src/billing_system/infrastructure/migrations/migration.py
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Шаг миграции схемы sqlite до версии version (PRAGMA user_version).
+
+    upgrade выполняется внутри транзакции раннера и не должен сам
+    делать commit/rollback. check - проверка данных перед upgrade:
+    возвращает описания проблем, с которыми шаг применить нельзя.
+    """
+
+    version: int
+    description: str
+    upgrade: Callable[[sqlite3.Connection], None]
+    check: Callable[[sqlite3.Connection], list[str]] | None = None
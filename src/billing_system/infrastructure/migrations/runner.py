@@ -0,0 +1,112 @@
+# src/billing_system/infrastructure/migrations/runner.py
+import sqlite3
+from collections.abc import Sequence
+from pathlib import Path
+
+from billing_system.infrastructure.errors import MigrationBlockedError
+
+from .migration import Migration
+from .versions import MIGRATIONS
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Возвращает версию схемы бд (PRAGMA user_version)."""
+    res = conn.execute("PRAGMA user_version;").fetchone()
+    return int(res[0])
+
+
+def migration_problems(
+    conn: sqlite3.Connection,
+    migration: Migration,
+) -> list[str]:
+    """Проблемы данных, с которыми шаг migration применить нельзя."""
+    return [] if migration.check is None else migration.check(conn)
+
+
+def require_applicable(
+    conn: sqlite3.Connection,
+    migration: Migration,
+) -> None:
+    """MigrationBlockedError, если данные не проходят check шага."""
+    problems = migration_problems(conn, migration)
+    if problems:
+        raise MigrationBlockedError(migration.version, problems)
+
+
+def check_migrations(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration] = MIGRATIONS,
+) -> list[str]:
+    """Проверяет данные для недостающих миграций, ничего не меняя.
+
+    Проверки идут по текущей схеме, поэтому шаг, которому нужна
+    схема после предыдущего недостающего шага, может ничего не найти.
+    """
+    version = schema_version(conn)
+    return [
+        f"v{migration.version:03d}: {problem}"
+        for migration in migrations
+        if migration.version > version
+        for problem in migration_problems(conn, migration)
+    ]
+
+
+def migrate(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration] = MIGRATIONS,
+) -> int:
+    """Применяет недостающие миграции и возвращает итоговую версию.
+
+    Каждая миграция идет в своей транзакции BEGIN IMMEDIATE: версия
+    перечитывается под блокировкой записи, поэтому несколько процессов,
+    стартующих одновременно, не применят один шаг дважды, а читатели
+    не блокируются дольше одного шага.
+
+    Если данные не проходят check шага, шаг не применяется и
+    выбрасывается MigrationBlockedError со списком проблем.
+    """
+    version = schema_version(conn)
+    for migration in migrations:
+        if migration.version <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            version = schema_version(conn)
+            if migration.version > version:
+                require_applicable(conn, migration)
+                migration.upgrade(conn)
+                # PRAGMA не принимает параметры, версия - int из кода.
+                conn.execute(f"PRAGMA user_version = {migration.version:d};")
+                version = migration.version
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return version
+
+
+def check_database(path: Path) -> list[str]:
+    """Открывает бд по пути и возвращает check_migrations."""
+    conn = sqlite3.connect(path)
+    try:
+        return check_migrations(conn)
+    finally:
+        conn.close()
+
+
+def migrate_database(path: Path, *, vacuum: bool = False) -> int:
+    """Открывает бд по пути, применяет миграции и закрывает соединение.
+
+    С vacuum=True после миграций файл бд пересобирается (VACUUM):
+    место, освобожденное миграциями, возвращается файловой системе.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        version = migrate(conn)
+        if vacuum:
+            conn.execute("VACUUM;")
+        return version
+    finally:
+        conn.close()
@@ -0,0 +1,13 @@
+# src/billing_system/infrastructure/migrations/versions/__init__.py
+from .v001_initial import MIGRATION as V001
+from .v002_line_position import MIGRATION as V002
+from .v003_invoice_version import MIGRATION as V003
+from .v004_clustered_lines import MIGRATION as V004
+from .v005_binary_id import MIGRATION as V005
+from .v006_scaled_quantity import MIGRATION as V006
+from .v007_invoice_totals import MIGRATION as V007
+from .v008_line_exponent import MIGRATION as V008
+
+MIGRATIONS = (V001, V002, V003, V004, V005, V006, V007, V008)
+
+__all__ = ["MIGRATIONS"]
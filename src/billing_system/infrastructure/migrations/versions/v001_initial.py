@@ -0,0 +1,42 @@
+# src/billing_system/infrastructure/migrations/versions/v001_initial.py
+# Исходная схема: счета и строчки счетов.
+import sqlite3
+
+from billing_system.infrastructure.migrations.migration import Migration
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Создает таблицы Invoice и InvoiceLine, если их еще нет."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS `Invoice`
+        (
+            id TEXT PRIMARY KEY,
+            currency TEXT NOT NULL,
+            status TEXT NOT NULL,
+            tax_amount_minor INTEGER,
+            discount_amount_minor INTEGER,
+            issued_at INTEGER,
+            paid_at INTEGER,
+            voided_at INTEGER,
+            payment_idempotency_key TEXT,
+            void_idempotency_key TEXT
+        );
+        """,
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS `InvoiceLine`
+        (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            invoice_id TEXT NOT NULL,
+            description TEXT,
+            unit_price_minor INTEGER NOT NULL,
+            quantity TEXT NOT NULL,
+            FOREIGN KEY (invoice_id) REFERENCES Invoice(id)
+        );
+        """,
+    )
+
+
+MIGRATION = Migration(1, "Таблицы Invoice и InvoiceLine", upgrade)
@@ -0,0 +1,40 @@
+# src/billing_system/infrastructure/migrations/versions/v002_line_position.py
+# Позиция строчки внутри счета для дозаписи строчек без перезаписи.
+import sqlite3
+
+from billing_system.infrastructure.migrations.migration import Migration
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Добавляет InvoiceLine.position и заполняет ее по порядку вставки.
+
+    Бд, созданные до версионирования схемы, могут уже иметь колонку.
+    """
+    columns = {
+        row[1] for row in conn.execute("PRAGMA table_info(`InvoiceLine`);")
+    }
+    if "position" not in columns:
+        conn.execute(
+            """
+            ALTER TABLE `InvoiceLine`
+            ADD COLUMN position INTEGER NOT NULL DEFAULT 0;
+            """,
+        )
+        conn.execute(
+            """
+            UPDATE `InvoiceLine` SET position = (
+                SELECT COUNT(*) FROM `InvoiceLine` AS o
+                WHERE o.invoice_id = `InvoiceLine`.invoice_id
+                AND o.id < `InvoiceLine`.id
+            );
+            """,
+        )
+    conn.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS `InvoiceLine_position`
+        ON `InvoiceLine` (invoice_id, position);
+        """,
+    )
+
+
+MIGRATION = Migration(2, "Позиция строчки InvoiceLine.position", upgrade)
@@ -0,0 +1,20 @@
+# src/billing_system/infrastructure/migrations/versions/v003_invoice_version.py
+# Версия записи счета для оптимистичной блокировки (compare-and-swap).
+import sqlite3
+
+from billing_system.infrastructure.migrations.migration import Migration
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Добавляет Invoice.version, существующие счета получают версию 0."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(`Invoice`);")}
+    if "version" not in columns:
+        conn.execute(
+            """
+            ALTER TABLE `Invoice`
+            ADD COLUMN version INTEGER NOT NULL DEFAULT 0;
+            """,
+        )
+
+
+MIGRATION = Migration(3, "Версия счета Invoice.version", upgrade)
@@ -0,0 +1,60 @@
+# src/billing_system/infrastructure/migrations/versions/v004_clustered_lines.py
+# Строчки счета хранятся кластеризованно по (invoice_id, position).
+import sqlite3
+
+from billing_system.infrastructure.migrations.migration import Migration
+
+
+def is_without_rowid(conn: sqlite3.Connection, table: str) -> bool:
+    """Таблица уже создана как WITHOUT ROWID."""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?;",
+        (table,),
+    ).fetchone()
+    return row is not None and "WITHOUT ROWID" in row[0].upper()
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Пересоздает InvoiceLine как WITHOUT ROWID с ключом счета.
+
+    В rowid-таблице строчки счета разбросаны по порядку вставки,
+    и чтение счета - это поиск по индексу и отдельный переход в
+    таблицу на каждую строчку. В WITHOUT ROWID строки лежат в
+    B-дереве первичного ключа (invoice_id, position): строчки счета
+    читаются одним диапазоном соседних страниц, а отдельный индекс
+    InvoiceLine_position больше не нужен.
+    """
+    if is_without_rowid(conn, "InvoiceLine"):
+        return
+    conn.execute(
+        """
+        CREATE TABLE `InvoiceLine_new`
+        (
+            invoice_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            description TEXT,
+            unit_price_minor INTEGER NOT NULL,
+            quantity TEXT NOT NULL,
+            PRIMARY KEY (invoice_id, position),
+            FOREIGN KEY (invoice_id) REFERENCES Invoice(id)
+        ) WITHOUT ROWID;
+        """,
+    )
+    conn.execute(
+        """
+        INSERT INTO `InvoiceLine_new` (invoice_id, position, description,
+        unit_price_minor, quantity)
+        SELECT invoice_id, position, description, unit_price_minor, quantity
+        FROM `InvoiceLine` ORDER BY invoice_id, position;
+        """,
+    )
+    # Индекс InvoiceLine_position удаляется вместе с таблицей.
+    conn.execute("DROP TABLE `InvoiceLine`;")
+    conn.execute("ALTER TABLE `InvoiceLine_new` RENAME TO `InvoiceLine`;")
+
+
+MIGRATION = Migration(
+    4,
+    "InvoiceLine WITHOUT ROWID с ключом (invoice_id, position)",
+    upgrade,
+)
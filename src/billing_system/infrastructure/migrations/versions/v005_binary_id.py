@@ -0,0 +1,44 @@
+# src/billing_system/infrastructure/migrations/versions/v005_binary_id.py
+# Id счета хранится 16-байтовым BLOB вместо 36-символьного TEXT.
+import sqlite3
+from uuid import UUID
+
+from billing_system.infrastructure.migrations.migration import Migration
+
+
+def uuid_text_to_blob(text: str) -> bytes:
+    """Текстовый UUID -> 16 байт (функция uuid_blob для sql)."""
+    return UUID(text).bytes
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Переводит Invoice.id и InvoiceLine.invoice_id в BLOB на месте.
+
+    Ключ сокращается с 36 байт до 16 во всех B-деревьях: в таблице
+    счетов, ее индексе и первичном ключе строчек. Объявленный тип
+    колонок (TEXT) не меняется: BLOB в sqlite не приводится к
+    аффинности колонки. Обновляются только строки, где id еще текст,
+    поэтому миграция повторяема. Место освобождается внутри файла;
+    уменьшить сам файл можно VACUUM (--vacuum у раннера миграций).
+    """
+    conn.create_function(
+        "uuid_blob",
+        1,
+        uuid_text_to_blob,
+        deterministic=True,
+    )
+    conn.execute(
+        """
+        UPDATE `Invoice` SET id = uuid_blob(id)
+        WHERE typeof(id) = 'text';
+        """,
+    )
+    conn.execute(
+        """
+        UPDATE `InvoiceLine` SET invoice_id = uuid_blob(invoice_id)
+        WHERE typeof(invoice_id) = 'text';
+        """,
+    )
+
+
+MIGRATION = Migration(5, "Id счета как 16-байтовый BLOB", upgrade)
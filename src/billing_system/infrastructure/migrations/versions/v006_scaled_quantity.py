@@ -0,0 +1,114 @@
+# src/billing_system/infrastructure/migrations/versions/v006_scaled_quantity.py
+# Количество строчки хранится целым числом миллионных долей.
+#
+# Строчки с количеством точнее 1e-6 перенести нельзя: check находит их
+# до миграции (python -m billing_system.infrastructure.migrations
+# --check <бд>). Такие количества нужно исправить в схеме v5 до
+# выкладки, например:
+#   UPDATE InvoiceLine SET quantity = '0.333333'
+#   WHERE invoice_id = <id> AND position = <позиция>;
+# Новое значение (округление или разбивка строчки) согласуется
+# с бухгалтерией: оно меняет сумму счета.
+import sqlite3
+from decimal import Decimal, InvalidOperation
+
+from billing_system.domain.value_objects import QUANTITY_DECIMAL_PLACES
+from billing_system.infrastructure.migrations.migration import Migration
+
+INT64_MAX = 2**63 - 1
+
+
+def quantity_text_to_scaled(text: str) -> int:
+    """Количество-текст -> quantity * 10**6 (функция для sql).
+
+    Количество с большей точностью или вне int64 не переносится:
+    ValueError (check находит такие строчки до миграции).
+    """
+    scaled = Decimal(text).scaleb(QUANTITY_DECIMAL_PLACES)
+    if scaled != scaled.to_integral_value() or abs(scaled) > INT64_MAX:
+        msg = f"Количество {text} не представимо с точностью 1e-6."
+        raise ValueError(msg)
+    return int(scaled)
+
+
+def check(conn: sqlite3.Connection) -> list[str]:
+    """Строчки схемы v5, количество которых не переносится в v6."""
+    columns = {
+        row[1] for row in conn.execute("PRAGMA table_info(`InvoiceLine`);")
+    }
+    if "quantity" not in columns:
+        return []
+    problems = []
+    rows = conn.execute(
+        """
+        SELECT invoice_id, position, quantity FROM `InvoiceLine`
+        ORDER BY invoice_id, position;
+        """,
+    )
+    for invoice_id, position, quantity in rows:
+        try:
+            quantity_text_to_scaled(quantity)
+        except (ValueError, InvalidOperation):
+            key = (
+                invoice_id.hex()
+                if isinstance(invoice_id, bytes)
+                else invoice_id
+            )
+            problems.append(
+                f"InvoiceLine ({key}, {position}): количество {quantity} "
+                "не представимо с точностью 1e-6",
+            )
+    return problems
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Пересоздает InvoiceLine с колонкой quantity_scaled INTEGER.
+
+    Колонку нельзя перевести на месте: в колонке с аффинностью TEXT
+    sqlite хранит и целые числа как текст. Таблица остается
+    WITHOUT ROWID с ключом (invoice_id, position).
+    """
+    columns = {
+        row[1] for row in conn.execute("PRAGMA table_info(`InvoiceLine`);")
+    }
+    if "quantity_scaled" in columns:
+        return
+    conn.create_function(
+        "quantity_scaled",
+        1,
+        quantity_text_to_scaled,
+        deterministic=True,
+    )
+    conn.execute(
+        """
+        CREATE TABLE `InvoiceLine_new`
+        (
+            invoice_id BLOB NOT NULL,
+            position INTEGER NOT NULL,
+            description TEXT,
+            unit_price_minor INTEGER NOT NULL,
+            quantity_scaled INTEGER NOT NULL,
+            PRIMARY KEY (invoice_id, position),
+            FOREIGN KEY (invoice_id) REFERENCES Invoice(id)
+        ) WITHOUT ROWID;
+        """,
+    )
+    conn.execute(
+        """
+        INSERT INTO `InvoiceLine_new` (invoice_id, position, description,
+        unit_price_minor, quantity_scaled)
+        SELECT invoice_id, position, description, unit_price_minor,
+        quantity_scaled(quantity)
+        FROM `InvoiceLine` ORDER BY invoice_id, position;
+        """,
+    )
+    conn.execute("DROP TABLE `InvoiceLine`;")
+    conn.execute("ALTER TABLE `InvoiceLine_new` RENAME TO `InvoiceLine`;")
+
+
+MIGRATION = Migration(
+    6,
+    "Количество строчки InvoiceLine.quantity_scaled (* 10**6)",
+    upgrade,
+    check,
+)
@@ -0,0 +1,60 @@
+# src/billing_system/infrastructure/migrations/versions/v007_invoice_totals.py
+# Денормализованные суммы и число строчек в строке Invoice.
+import sqlite3
+
+from billing_system.infrastructure.migrations.migration import Migration
+
+# Сумма строчки с ROUND_HALF_UP при количестве * 10**6 (схема v6).
+LINE_TOTAL_SQL = """
+CASE WHEN l.unit_price_minor >= 0
+THEN (l.unit_price_minor * l.quantity_scaled + 500000) / 1000000
+ELSE -((-l.unit_price_minor * l.quantity_scaled + 500000) / 1000000)
+END
+"""
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Добавляет subtotal_minor, total_minor, line_count и заполняет их.
+
+    Суммы существующих счетов считаются по их строчкам; total_minor -
+    subtotal_minor + налог - скидка, как Invoice.total. Индекс
+    (status, id) - для списков заголовков по статусу.
+    """
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS `Invoice_status`
+        ON `Invoice` (status, id);
+        """,
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(`Invoice`);")}
+    if "line_count" in columns:
+        return
+    for column in ("subtotal_minor", "total_minor", "line_count"):
+        conn.execute(
+            f"""
+            ALTER TABLE `Invoice`
+            ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0;
+            """,
+        )
+    conn.execute(
+        f"""
+        UPDATE `Invoice` AS i SET (subtotal_minor, line_count) = (
+            SELECT COALESCE(SUM({LINE_TOTAL_SQL}), 0), COUNT(*)
+            FROM `InvoiceLine` AS l
+            WHERE l.invoice_id = i.id
+        );
+        """,  # noqa: S608 - константа модуля
+    )
+    conn.execute(
+        """
+        UPDATE `Invoice` SET total_minor = subtotal_minor
+        + COALESCE(tax_amount_minor, 0) - COALESCE(discount_amount_minor, 0);
+        """,
+    )
+
+
+MIGRATION = Migration(
+    7,
+    "Суммы и число строчек счета в Invoice",
+    upgrade,
+)
@@ -0,0 +1,29 @@
+# src/billing_system/infrastructure/migrations/versions/v008_line_exponent.py
+# Показатель степени количества строчки: запись количества как при вводе.
+import sqlite3
+
+from billing_system.infrastructure.migrations.migration import Migration
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    """Добавляет InvoiceLine.quantity_exponent.
+
+    У строчек, перенесенных v006, показатель неизвестен (NULL):
+    количество читается без хвостовых нулей.
+    """
+    columns = {
+        row[1] for row in conn.execute("PRAGMA table_info(`InvoiceLine`);")
+    }
+    if "quantity_exponent" not in columns:
+        conn.execute(
+            """
+            ALTER TABLE `InvoiceLine` ADD COLUMN quantity_exponent INTEGER;
+            """,
+        )
+
+
+MIGRATION = Migration(
+    8,
+    "Показатель количества строчки InvoiceLine.quantity_exponent",
+    upgrade,
+)
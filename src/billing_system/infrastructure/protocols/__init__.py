@@ -1,5 +1,30 @@
 # src/billing_system/infrastructre/protocols/__init__.py
+from .sqlite_group_commit import GroupCommitStats, GroupCommitWriter
+from .sqlite_group_uow import GroupCommitUnitOfWork
+from .sqlite_lock_metrics import LockMetrics, LockStats
+from .sqlite_pool import SqliteConnectionPool
+from .sqlite_profile import (
+    BALANCED,
+    BULK_LOAD,
+    DURABLE,
+    PROFILES,
+    SqliteProfile,
+)
 from .sqlite_uow import SqliteUnitOfWork
 from .system_clock import SystemClock
 
-__all__ = ["SqliteUnitOfWork", "SystemClock"]
+__all__ = [
+    "BALANCED",
+    "BULK_LOAD",
+    "DURABLE",
+    "PROFILES",
+    "GroupCommitStats",
+    "GroupCommitUnitOfWork",
+    "GroupCommitWriter",
+    "LockMetrics",
+    "LockStats",
+    "SqliteConnectionPool",
+    "SqliteProfile",
+    "SqliteUnitOfWork",
+    "SystemClock",
+]
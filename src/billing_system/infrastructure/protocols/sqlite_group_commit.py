@@ -0,0 +1,228 @@
+# src/billing_system/infrastructure/protocols/sqlite_group_commit.py
+# Групповой commit: несколько UOW записи в одной транзакции sqlite.
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from billing_system.application.errors import StorageBusyError
+from billing_system.infrastructure.errors import GroupCommitError
+
+from .sqlite_lock_metrics import is_busy
+from .sqlite_pool import SqliteConnectionPool
+
+
+@dataclass(frozen=True, slots=True)
+class GroupCommitStats:
+    """Счетчики группового commit.
+
+    batches - число общих commit, units - число успешных UOW в них,
+    failed_units - UOW, откатанные до своей точки сохранения.
+    """
+
+    batches: int
+    units: int
+    failed_units: int
+
+
+class _Batch:
+    """Открытая транзакция, в которую по очереди пишут UOW."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.units = 0
+        self.closed = False
+        self.done = False
+        # Точка сохранения UOW не снята: пачка откатывается целиком.
+        self.broken = False
+        self.error: BaseException | None = None
+
+
+class GroupCommitWriter:
+    """Писатель, объединяющий UOW записи в общие транзакции.
+
+    Первый UOW открывает транзакцию (BEGIN IMMEDIATE) на соединении
+    из пула и становится ведущим. UOW, пришедшие за window секунд
+    или до max_batch штук, выполняются в той же транзакции по очереди,
+    каждый внутри своей точки сохранения (SAVEPOINT): ошибка одного
+    UOW откатывает только его изменения. Затем ведущий делает один
+    commit (и один fsync) на всю пачку, а остальные UOW ждут его
+    результата и возвращаются только после записи на диск.
+
+    Ведущий ждет window, только если другие UOW уже ждут входа
+    в писатель: одиночная запись не задерживается. Цена: ошибка
+    commit отменяет изменения всей пачки. Остальные UOW ждут commit
+    не дольше commit_timeout секунд.
+    """
+
+    def __init__(
+        self,
+        pool: SqliteConnectionPool,
+        *,
+        window: float = 0.002,
+        max_batch: int = 64,
+        commit_timeout: float = 30.0,
+    ) -> None:
+        if max_batch < 1 or window < 0 or commit_timeout <= 0:
+            raise ValueError(
+                "Нужно 1 <= max_batch, 0 <= window и 0 < commit_timeout.",
+            )
+        self.__pool = pool
+        self.__window = window
+        self.__max_batch = max_batch
+        self.__commit_timeout = commit_timeout
+        # Держится от begin() до end(): UOW пишут в соединение пачки
+        # по одному.
+        self.__cond = threading.Condition()
+        self.__batch: _Batch | None = None
+        # Число UOW, ждущих входа в begin(), под своей блокировкой:
+        # self.__cond в это время может держать другой UOW.
+        self.__queue_lock = threading.Lock()
+        self.__queued = 0
+        self.__batches = 0
+        self.__units = 0
+        self.__failed_units = 0
+
+    @property
+    def pool(self) -> SqliteConnectionPool:
+        """Пул соединений писателя."""
+        return self.__pool
+
+    @property
+    def stats(self) -> GroupCommitStats:
+        """Снимок счетчиков."""
+        with self.__cond:
+            return GroupCommitStats(
+                batches=self.__batches,
+                units=self.__units,
+                failed_units=self.__failed_units,
+            )
+
+    def begin(self) -> sqlite3.Connection:
+        """Начинает UOW в открытой пачке или открывает новую.
+
+        Захватывает писатель до end(): соединение пачки можно
+        использовать только до вызова end().
+        """
+        with self.__queue_lock:
+            self.__queued += 1
+        self.__cond.acquire()
+        with self.__queue_lock:
+            self.__queued -= 1
+        try:
+            # Закрытая пачка держит блокировку записи до своего commit.
+            while self.__batch is not None and self.__batch.closed:
+                self.__cond.wait()
+            if self.__batch is None:
+                self.__batch = self.__open()
+            batch = self.__batch
+            try:
+                batch.conn.execute("SAVEPOINT unit;")
+            except BaseException:
+                # В новой пачке нет ведущего, который ее завершит.
+                if not batch.units:
+                    batch.broken = True
+                    self.__commit(batch)
+                raise
+            batch.units += 1
+            if batch.units >= self.__max_batch:
+                batch.closed = True
+                self.__cond.notify_all()
+        except BaseException:
+            self.__cond.release()
+            raise
+        return batch.conn
+
+    def __open(self) -> _Batch:
+        """Открывает транзакцию новой пачки."""
+        conn = self.__pool.acquire()
+        started = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+        except BaseException as e:
+            self.__pool.release(conn)
+            if is_busy(e):
+                self.__pool.lock_metrics.record_busy()
+                raise StorageBusyError("База данных занята.") from e
+            raise
+        self.__pool.lock_metrics.record_wait(time.perf_counter() - started)
+        return _Batch(conn)
+
+    def end(self, *, ok: bool) -> None:
+        """Завершает UOW, начатый begin().
+
+        ok=True оставляет изменения UOW в пачке и ждет ее commit,
+        ok=False откатывает их. Ведущий UOW делает commit пачки.
+        """
+        batch = self.__batch
+        if batch is None:
+            self.__cond.release()
+            raise GroupCommitError("end() без begin().")
+        leader = batch.units == 1
+        failure: BaseException | None = None
+        try:
+            if ok:
+                batch.conn.execute("RELEASE unit;")
+                self.__units += 1
+            else:
+                batch.conn.execute("ROLLBACK TO unit;")
+                batch.conn.execute("RELEASE unit;")
+                self.__failed_units += 1
+        except sqlite3.Error as e:
+            # Изменения UOW могли остаться в транзакции: пачку нельзя
+            # сохранять, но ведущий все равно должен ее завершить.
+            failure = e
+            batch.broken = True
+            self.__failed_units += 1
+        finally:
+            self.__cond.notify_all()
+            self.__cond.release()
+
+        with self.__cond:
+            if leader:
+                self.__cond.wait_for(
+                    lambda: batch.closed or batch.broken or not self.__queued,
+                    self.__window,
+                )
+                self.__commit(batch)
+            elif not self.__cond.wait_for(
+                lambda: batch.done,
+                self.__commit_timeout,
+            ):
+                raise GroupCommitError("Нет результата commit пачки.")
+        if failure is not None:
+            raise failure
+        if ok and batch.error is not None:
+            if is_busy(batch.error):
+                raise StorageBusyError(
+                    "База данных занята.",
+                ) from batch.error
+            raise GroupCommitError(
+                "Commit пачки не удался.",
+            ) from batch.error
+
+    def __commit(self, batch: _Batch) -> None:
+        """Commit пачки. Вызывается ведущим с захваченным self.__cond.
+
+        Сломанная пачка (broken) откатывается целиком. Соединение
+        возвращается в пул, а ждущие UOW будятся при любом исходе.
+        """
+        batch.closed = True
+        try:
+            if batch.broken:
+                batch.error = GroupCommitError(
+                    "Пачка откатана: точка сохранения UOW не снята.",
+                )
+                batch.conn.rollback()
+            else:
+                batch.conn.commit()
+        except sqlite3.Error as e:
+            batch.error = e
+            if is_busy(e):
+                self.__pool.lock_metrics.record_busy()
+        finally:
+            self.__pool.release(batch.conn)
+            self.__batch = None
+            self.__batches += 1
+            batch.done = True
+            self.__cond.notify_all()
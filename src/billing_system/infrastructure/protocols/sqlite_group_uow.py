@@ -0,0 +1,114 @@
+# src/billing_system/infrastructure/protocols/sqlite_group_uow.py
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+from billing_system.application.protocols import UnitOfWork
+from billing_system.infrastructure.cache import InvoiceCache
+from billing_system.infrastructure.errors import (
+    AlreadyInTransactionError,
+    NoConnectionError,
+)
+from billing_system.infrastructure.repositories import (
+    CachedInvoiceRepository,
+    InvoiceSqliteRepository,
+)
+
+from .sqlite_group_commit import GroupCommitWriter
+from .sqlite_uow import SqliteUnitOfWork
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+class GroupCommitUnitOfWork(UnitOfWork):
+    """Класс UOW для Sqlite с групповым commit.
+
+    Изменения UOW пишутся в общую транзакцию писателя
+    GroupCommitWriter и сохраняются на диск одним commit вместе
+    с соседними UOW. Выход из with без ошибки возвращается только
+    после commit пачки, ошибка откатывает лишь изменения этого UOW.
+
+    Для записи под нагрузкой: на сериализованных одиночных записях
+    один fsync приходится на всю пачку. Чтение идет мимо писателя,
+    через read_only().
+    """
+
+    def __init__(
+        self,
+        writer: GroupCommitWriter,
+        *,
+        cache: InvoiceCache | None = None,
+    ) -> None:
+        self.__writer = writer
+        self.__cache = cache
+        self.conn: sqlite3.Connection | None = None
+        self.invoices: InvoiceSqliteRepository | CachedInvoiceRepository
+
+    def __enter__(self) -> "GroupCommitUnitOfWork":
+        if self.conn is not None:
+            raise AlreadyInTransactionError
+        self.conn = self.__writer.begin()
+        repo = InvoiceSqliteRepository(self.conn)
+        self.invoices = (
+            repo
+            if self.__cache is None
+            else CachedInvoiceRepository(
+                repo,
+                self.__cache,
+                serve_cached=False,
+            )
+        )
+        return self
+
+    def read_only(self) -> SqliteUnitOfWork:
+        """UOW только для чтения поверх read-only пула той же бд."""
+        return SqliteUnitOfWork(
+            self.__writer.pool.read_only_pool(),
+            cache=self.__cache,
+        )
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self.conn is None:
+            return
+        if exc_type is not None:
+            self.rollback()
+        else:
+            self.commit()
+
+    def commit(self) -> None:
+        """Оставляет изменения в пачке и ждет ее commit.
+
+        Перед этим сбрасывает изменения счетов, полученных через
+        репозиторий. Ошибка сброса откатывает изменения UOW.
+        """
+        if self.conn is None:
+            raise NoConnectionError(
+                "Запуск commit() без with (вне контекста).",
+            )
+        try:
+            self.invoices.flush()
+        except BaseException:
+            self.rollback()
+            raise
+        self.conn = None
+        try:
+            self.__writer.end(ok=True)
+        except BaseException:
+            self.invoices.clear()
+            raise
+        self.invoices.committed()
+
+    def rollback(self) -> None:
+        """Откат изменений этого UOW до его точки сохранения."""
+        if self.conn is None:
+            raise NoConnectionError(
+                "Запуск rollback() без with (вне контекста).",
+            )
+        self.conn = None
+        self.__writer.end(ok=False)
+        self.invoices.clear()
@@ -0,0 +1,64 @@
+# src/billing_system/infrastructure/protocols/sqlite_lock_metrics.py
+# Метрики ожидания блокировки записи sqlite.
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+
+def is_busy(exc: BaseException | None) -> bool:
+    """Ошибка sqlite "database is locked" (SQLITE_BUSY/SQLITE_LOCKED)."""
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    # Расширенный код ошибки: младший байт - основной код.
+    return exc.sqlite_errorcode & 0xFF in {
+        sqlite3.SQLITE_BUSY,
+        sqlite3.SQLITE_LOCKED,
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class LockStats:
+    """Счетчики ожидания блокировки записи.
+
+    waits - число взятых блокировок, wait_total и wait_max - время
+    их ожидания в секундах, busy - число отказов по busy_timeout.
+    """
+
+    waits: int
+    wait_total: float
+    wait_max: float
+    busy: int
+
+
+class LockMetrics:
+    """Потокобезопасные счетчики ожидания блокировки записи пула."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__waits = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+        self.__busy = 0
+
+    @property
+    def stats(self) -> LockStats:
+        """Снимок счетчиков."""
+        with self.__lock:
+            return LockStats(
+                waits=self.__waits,
+                wait_total=self.__wait_total,
+                wait_max=self.__wait_max,
+                busy=self.__busy,
+            )
+
+    def record_wait(self, seconds: float) -> None:
+        """Учитывает взятую блокировку и время ее ожидания."""
+        with self.__lock:
+            self.__waits += 1
+            self.__wait_total += seconds
+            self.__wait_max = max(self.__wait_max, seconds)
+
+    def record_busy(self) -> None:
+        """Учитывает отказ sqlite по busy_timeout."""
+        with self.__lock:
+            self.__busy += 1
@@ -0,0 +1,243 @@
+# src/billing_system/infrastructure/protocols/sqlite_pool.py
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+
+from billing_system.infrastructure.errors import (
+    NoConnectionError,
+    PoolExhaustedError,
+)
+from billing_system.infrastructure.migrations import migrate
+
+from .sqlite_lock_metrics import LockMetrics
+from .sqlite_profile import DURABLE, SqliteProfile
+
+
+class SqliteConnectionPool:
+    """Ограниченный пул соединений sqlite3 к одному файлу бд.
+
+    Отдает прогретые соединения: схема уже разобрана, страничный кэш
+    и кэш подготовленных запросов сохраняются между транзакциями.
+    Схема мигрируется один раз, при открытии первого соединения.
+    Каждое новое соединение настраивается профилем profile.
+
+    Пул с read_only=True открывает бд с mode=ro и query_only и
+    не мигрирует схему; такой пул для того же файла отдает
+    read_only_pool().
+
+    busy_timeout (мс) переопределяет одноименную настройку профиля.
+    В lock_metrics UOW пула пишут ожидание блокировки записи.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: Path,
+        *,
+        max_size: int = 16,
+        max_idle: int | None = None,
+        timeout: float = 5.0,
+        cached_statements: int = 256,
+        profile: SqliteProfile = DURABLE,
+        busy_timeout: int | None = None,
+        migrate: bool = True,
+        read_only: bool = False,
+    ) -> None:
+        """max_idle по умолчанию равен max_size."""
+        max_idle = max_size if max_idle is None else max_idle
+        if max_size < 1 or not 0 <= max_idle <= max_size:
+            raise ValueError(
+                "Нужно 1 <= max_size и 0 <= max_idle <= max_size.",
+            )
+        self.__path = path
+        self.__max_size = max_size
+        self.__max_idle = max_idle
+        self.__timeout = timeout
+        self.__cached_statements = cached_statements
+        self.__profile = (
+            profile
+            if busy_timeout is None
+            else replace(profile, busy_timeout=busy_timeout)
+        )
+        self.__lock_metrics = LockMetrics()
+        self.__read_only = read_only
+        self.__migrated = not migrate or read_only
+        self.__readers: SqliteConnectionPool | None = None
+        self.__idle: list[sqlite3.Connection] = []
+        self.__opened = 0
+        self.__closed = False
+        self.__cond = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """Число открытых соединений (выданных и простаивающих)."""
+        return self.__opened
+
+    @property
+    def profile(self) -> SqliteProfile:
+        """Профиль настроек соединений пула."""
+        return self.__profile
+
+    @property
+    def lock_metrics(self) -> LockMetrics:
+        """Метрики ожидания блокировки записи."""
+        return self.__lock_metrics
+
+    @property
+    def read_only(self) -> bool:
+        """Соединения пула только для чтения."""
+        return self.__read_only
+
+    @property
+    def idle(self) -> int:
+        """Число простаивающих соединений."""
+        return len(self.__idle)
+
+    def __connect(self) -> sqlite3.Connection:
+        """Открывает новое соединение и настраивает его."""
+        conn = sqlite3.connect(
+            f"{self.__path.resolve().as_uri()}?mode=ro"
+            if self.__read_only
+            else self.__path,
+            check_same_thread=False,
+            cached_statements=self.__cached_statements,
+            uri=self.__read_only,
+        )
+        try:
+            self.__profile.apply(conn, read_only=self.__read_only)
+            if not self.__migrated:
+                migrate(conn)
+                self.__migrated = True
+            if self.__read_only:
+                conn.execute("PRAGMA query_only = ON;")
+            else:
+                conn.execute("PRAGMA foreign_keys = ON;")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    @staticmethod
+    def __is_healthy(conn: sqlite3.Connection) -> bool:
+        """Проверка, что соединение живо и не висит в транзакции."""
+        try:
+            conn.execute("SELECT 1;").fetchone()
+        except sqlite3.Error:
+            return False
+        return not conn.in_transaction
+
+    def __discard(self, conn: sqlite3.Connection) -> None:
+        """Закрывает соединение и освобождает его место в пуле."""
+        try:
+            conn.close()
+        finally:
+            with self.__cond:
+                self.__opened -= 1
+                self.__cond.notify()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Выдает соединение: простаивающее или новое, если есть место.
+
+        Если пул заполнен, ждет освобождения не дольше timeout.
+        """
+        deadline = time.monotonic() + self.__timeout
+        while True:
+            with self.__cond:
+                conn = self.__take(deadline)
+            if conn is None:
+                break
+            if self.__is_healthy(conn):
+                return conn
+            self.__discard(conn)
+        try:
+            return self.__connect()
+        except BaseException:
+            with self.__cond:
+                self.__opened -= 1
+                self.__cond.notify()
+            raise
+
+    def __take(self, deadline: float) -> sqlite3.Connection | None:
+        """Берет простаивающее соединение или резервирует место (None).
+
+        Вызывается с захваченным self.__cond.
+        """
+        while True:
+            if self.__closed:
+                raise NoConnectionError("Пул соединений закрыт.")
+            if self.__idle:
+                return self.__idle.pop()
+            if self.__opened < self.__max_size:
+                self.__opened += 1
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.__cond.wait(remaining):
+                msg = f"Нет свободного соединения за {self.__timeout} с."
+                raise PoolExhaustedError(msg)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Возвращает соединение в пул, сбрасывая его состояние.
+
+        Незавершенная транзакция откатывается. Лишние сверх max_idle
+        и сломанные соединения закрываются.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            self.__discard(conn)
+            return
+        with self.__cond:
+            if not self.__closed and len(self.__idle) < self.__max_idle:
+                self.__idle.append(conn)
+                self.__cond.notify()
+                return
+        self.__discard(conn)
+
+    def read_only_pool(self) -> "SqliteConnectionPool":
+        """Пул только для чтения к той же бд с теми же настройками.
+
+        Создается один раз; перед этим схема бд мигрируется через
+        соединение на запись. Закрывается вместе с этим пулом.
+        """
+        if self.__read_only:
+            return self
+        if not self.__migrated:
+            self.release(self.acquire())
+        with self.__cond:
+            if self.__readers is None:
+                self.__readers = SqliteConnectionPool(
+                    self.__path,
+                    max_size=self.__max_size,
+                    max_idle=self.__max_idle,
+                    timeout=self.__timeout,
+                    cached_statements=self.__cached_statements,
+                    profile=self.__profile,
+                    read_only=True,
+                )
+            return self.__readers
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Контекст: соединение из пула, возвращаемое на выходе."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Закрывает пул: выданные соединения закроются при возврате."""
+        with self.__cond:
+            self.__closed = True
+            idle, self.__idle = self.__idle, []
+            readers, self.__readers = self.__readers, None
+            self.__cond.notify_all()
+        for conn in idle:
+            self.__discard(conn)
+        if readers is not None:
+            readers.close()
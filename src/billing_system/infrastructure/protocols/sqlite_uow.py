@@ -1,34 +1,131 @@
 # src/billing_system/infrastructure/protocols/sqlite_uow.py
 import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from types import TracebackType
 
+from billing_system.application.errors import StorageBusyError
 from billing_system.application.protocols import UnitOfWork
+from billing_system.infrastructure.cache import InvoiceCache
 from billing_system.infrastructure.errors import (
     AlreadyInTransactionError,
     NoConnectionError,
 )
-from billing_system.infrastructure.repositories import InvoiceSqliteRepository
+from billing_system.infrastructure.repositories import (
+    CachedInvoiceRepository,
+    InvoiceSqliteRepository,
+)
+
+from .sqlite_lock_metrics import is_busy
+from .sqlite_pool import SqliteConnectionPool
+from .sqlite_profile import DURABLE, SqliteProfile
 
 
 class SqliteUnitOfWork(UnitOfWork):
-    """Класс UOW для Sqlite."""
+    """Класс UOW для Sqlite.
+
+    Соединения берутся из пула SqliteConnectionPool: можно передать
+    общий пул или путь к бд, тогда UOW создаст собственный пул
+    с профилем настроек profile.
+    Схема бд мигрируется пулом один раз, при первом соединении.
+    С migrate=False схему поднимает внешний раннер миграций.
+
+    Над пулом только для чтения UOW не открывает транзакцию: каждый
+    запрос читает свой согласованный снимок, а в WAL читатели
+    не ждут писателя.
+
+    С общим кэшем cache счета читаются через CachedInvoiceRepository:
+    UOW только для чтения отдает снимки из кэша, записи инвалидируют
+    кэш после commit.
 
-    def __init__(self, path: Path) -> None:
-        self.__path = path
+    Если блокировку не удалось взять за busy_timeout (мс, по умолчанию
+    из профиля), "database is locked" превращается в StorageBusyError,
+    который юзкейс может повторить. Ожидание блокировки записи и отказы
+    учитываются в lock_metrics пула.
+    """
+
+    def __init__(
+        self,
+        db: Path | SqliteConnectionPool,
+        *,
+        profile: SqliteProfile = DURABLE,
+        busy_timeout: int | None = None,
+        migrate: bool = True,
+        cache: InvoiceCache | None = None,
+    ) -> None:
+        self.__cache = cache
+        self.__pool = (
+            db
+            if isinstance(db, SqliteConnectionPool)
+            else SqliteConnectionPool(
+                db,
+                profile=profile,
+                busy_timeout=busy_timeout,
+                migrate=migrate,
+            )
+        )
         self.conn: sqlite3.Connection | None = None
+        self.invoices: InvoiceSqliteRepository | CachedInvoiceRepository
 
     def __enter__(self) -> "SqliteUnitOfWork":
-        if (
-            isinstance(self.conn, sqlite3.Connection)
-            and self.conn.in_transaction
-        ):
+        # Проверка по соединению, а не по транзакции: UOW только для
+        # чтения транзакцию не открывает, и повторный вход потерял бы
+        # соединение пула.
+        if self.conn is not None:
             raise AlreadyInTransactionError
-        self.conn = sqlite3.connect(self.__path)
-        self.invoices = InvoiceSqliteRepository(self.conn)
-        self.conn.cursor().execute("BEGIN;")
+        with self.__busy_as_error():
+            self.conn = self.__pool.acquire()
+        repo = InvoiceSqliteRepository(self.conn)
+        self.invoices = (
+            repo
+            if self.__cache is None
+            else CachedInvoiceRepository(
+                repo,
+                self.__cache,
+                serve_cached=self.__pool.read_only,
+            )
+        )
+        if not self.__pool.read_only:
+            try:
+                self.__begin_immediate(self.conn)
+            except BaseException:
+                self.__pool.release(self.conn)
+                self.conn = None
+                raise
         return self
 
+    def __begin_immediate(self, conn: sqlite3.Connection) -> None:
+        """Открывает транзакцию записи, учитывая время ожидания.
+
+        IMMEDIATE: блокировка записи берется сразу. С отложенным
+        BEGIN две транзакции "прочитал, потом пишу" взаимно
+        блокируются, и sqlite отвечает "database is locked".
+        """
+        started = time.perf_counter()
+        with self.__busy_as_error():
+            conn.cursor().execute("BEGIN IMMEDIATE;")
+        self.__pool.lock_metrics.record_wait(time.perf_counter() - started)
+
+    @contextmanager
+    def __busy_as_error(self) -> Iterator[None]:
+        """Контекст: "database is locked" -> StorageBusyError."""
+        try:
+            yield
+        except sqlite3.OperationalError as e:
+            if not is_busy(e):
+                raise
+            self.__pool.lock_metrics.record_busy()
+            raise StorageBusyError("База данных занята.") from e
+
+    def read_only(self) -> "SqliteUnitOfWork":
+        """UOW только для чтения поверх read-only пула той же бд."""
+        return SqliteUnitOfWork(
+            self.__pool.read_only_pool(),
+            cache=self.__cache,
+        )
+
     def __exit__(
         self,
         exc_type: type[BaseException] | None,
@@ -44,16 +141,30 @@ class SqliteUnitOfWork(UnitOfWork):
             elif self.conn.in_transaction:
                 self.commit()
         finally:
-            self.conn.close()
+            self.__pool.release(self.conn)
             self.conn = None
+        if is_busy(exc):
+            self.__pool.lock_metrics.record_busy()
+            raise StorageBusyError("База данных занята.") from exc
 
     def commit(self) -> None:
-        """Сохранение изменений в sqlite."""
+        """Сохранение изменений в sqlite.
+
+        Перед commit сбрасывает изменения счетов, полученных через
+        репозиторий, даже если save для них не вызывали.
+        """
         if self.conn is None:
             raise NoConnectionError(
                 "Запуск commit() без with (вне контекста).",
             )
-        self.conn.commit()
+        self.invoices.flush()
+        try:
+            with self.__busy_as_error():
+                self.conn.commit()
+        except BaseException:
+            self.invoices.clear()
+            raise
+        self.invoices.committed()
 
     def rollback(self) -> None:
         """Откат изменений в sqlite."""
@@ -62,3 +173,4 @@ class SqliteUnitOfWork(UnitOfWork):
                 "Запуск rollback() без with (вне контекста).",
             )
         self.conn.rollback()
+        self.invoices.clear()
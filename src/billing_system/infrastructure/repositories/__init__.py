@@ -1,4 +1,5 @@
 # src/billing_system/infrastructure/repositories/__init__.py
+from .cached_invoice_repo import CachedInvoiceRepository
 from .invoice_sqlite_repo import InvoiceSqliteRepository
 
-__all__ = ["InvoiceSqliteRepository"]
+__all__ = ["CachedInvoiceRepository", "InvoiceSqliteRepository"]
@@ -0,0 +1,139 @@
+# src/billing_system/infrastructure/repositories/cached_invoice_repo.py
+from collections.abc import Iterable
+from dataclasses import replace
+
+from billing_system.domain.aggregates import Invoice
+from billing_system.domain.repositories import (
+    InvoiceBatch,
+    InvoiceHeader,
+    InvoiceRepository,
+)
+from billing_system.domain.value_objects import InvoiceId, InvoiceStatus, Money
+from billing_system.infrastructure.cache import InvoiceCache
+
+from .invoice_sqlite_repo import InvoiceSqliteRepository
+
+
+class CachedInvoiceRepository(InvoiceRepository):
+    """Репозиторий счета с read-through кэшем поверх sqlite репозитория.
+
+    Identity map, запись и flush ведет внутренний репозиторий, обертка
+    добавляет только кэш. Снимки счетов из общего InvoiceCache
+    отдаются только при serve_cached (UOW только для чтения): команды
+    читают из бд, чтобы не менять устаревшую копию. Записанные счета
+    вычеркиваются из кэша после commit (committed), до него кэш
+    не трогается.
+    """
+
+    def __init__(
+        self,
+        inner: InvoiceSqliteRepository,
+        cache: InvoiceCache,
+        *,
+        serve_cached: bool,
+    ) -> None:
+        self.__inner = inner
+        self.__cache = cache
+        self.__serve_cached = serve_cached
+
+    def __known(self, invoice_id: InvoiceId) -> Invoice | None:
+        """Счет из identity map или (при serve_cached) из кэша."""
+        invoice = self.__inner.tracked(invoice_id)
+        if invoice is None and self.__serve_cached:
+            snapshot = self.__cache.get(invoice_id)
+            if snapshot is not None:
+                invoice = Invoice.rehydrate(
+                    replace(snapshot, lines=list(snapshot.lines)),
+                )
+                self.__inner.track(invoice)
+        return invoice
+
+    def __loaded(self, invoice: Invoice, generation: int) -> None:
+        """Кладет снимок прочитанного из бд счета в кэш.
+
+        Счета, записанные в текущей транзакции, не кэшируются:
+        их данные еще не подтверждены commit.
+        """
+        if (
+            invoice.invoice_id not in self.__inner.written
+            and invoice.pending_changes().is_empty
+        ):
+            self.__cache.put(invoice.snapshot(), generation)
+
+    def get(self, invoice_id: InvoiceId) -> Invoice:
+        """Метод должен возвращать счет по его Id."""
+        invoice = self.__known(invoice_id)
+        if invoice is not None:
+            return invoice
+        generation = self.__cache.generation
+        invoice = self.__inner.get(invoice_id)
+        self.__loaded(invoice, generation)
+        return invoice
+
+    def get_many(self, invoice_ids: Iterable[InvoiceId]) -> InvoiceBatch:
+        """Пакетное чтение: identity map, кэш (при serve_cached), бд.
+
+        Счета, которых нет ни в identity map, ни в кэше, читаются
+        одним вызовом get_many sqlite репозитория.
+        """
+        ids = list(dict.fromkeys(invoice_ids))
+        found = {
+            i: invoice for i in ids if (invoice := self.__known(i)) is not None
+        }
+        generation = self.__cache.generation
+        loaded = self.__inner.get_many(i for i in ids if i not in found)
+        for invoice in loaded.invoices.values():
+            self.__loaded(invoice, generation)
+        return InvoiceBatch.collect(ids, found | loaded.invoices)
+
+    def add(self, invoice: Invoice) -> None:
+        """Создает счет в БД."""
+        self.__inner.add(invoice)
+
+    def save(self, invoice: Invoice) -> None:
+        """Обновляет объект счета в БД."""
+        self.__inner.save(invoice)
+
+    def subtotals(
+        self,
+        invoice_ids: Iterable[InvoiceId],
+    ) -> dict[InvoiceId, Money]:
+        """Суммы строчек счетов, посчитанные в sqlite (без кэша)."""
+        self.flush()
+        return self.__inner.subtotals(invoice_ids)
+
+    def subtotal(self, invoice_id: InvoiceId) -> Money:
+        """Сумма строчек одного счета, посчитанная в sqlite (без кэша)."""
+        self.flush()
+        return self.__inner.subtotal(invoice_id)
+
+    def header(self, invoice_id: InvoiceId) -> InvoiceHeader:
+        """Заголовок счета из бд (без кэша)."""
+        self.flush()
+        return self.__inner.header(invoice_id)
+
+    def headers(
+        self,
+        *,
+        status: InvoiceStatus | None = None,
+        after: InvoiceId | None = None,
+        limit: int = 100,
+    ) -> list[InvoiceHeader]:
+        """Страница заголовков счетов из бд (без кэша)."""
+        self.flush()
+        return self.__inner.headers(status=status, after=after, limit=limit)
+
+    def flush(self) -> None:
+        """Сохраняет изменения всех счетов из identity map."""
+        self.__inner.flush()
+
+    def committed(self) -> None:
+        """После commit: инвалидирует записанные счета в кэше."""
+        written = self.__inner.written
+        if written:
+            self.__cache.invalidate(written)
+        self.__inner.committed()
+
+    def clear(self) -> None:
+        """Очищает identity map и неподтвержденные записи."""
+        self.__inner.clear()
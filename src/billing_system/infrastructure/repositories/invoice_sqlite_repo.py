@@ -1,16 +1,28 @@
 # src/billing_system/infrastructure/repositories/invoice_sqlite_repo.py
+import json
 import sqlite3
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
+from itertools import batched
+from operator import itemgetter
+from typing import Any
+from uuid import UUID
 
 from billing_system.domain.aggregates import Invoice, InvoiceRehydrateData
 from billing_system.domain.errors import (
     InvoiceNotFoundError,
     InvoiceNotUniqueError,
+    InvoiceVersionConflictError,
+)
+from billing_system.domain.repositories import (
+    InvoiceBatch,
+    InvoiceHeader,
+    InvoiceRepository,
 )
-from billing_system.domain.repositories import InvoiceRepository
 from billing_system.domain.value_objects import (
+    QUANTITY_DECIMAL_PLACES,
     Currency,
     Discount,
     InvoiceId,
@@ -33,18 +45,24 @@ def dt_to_unix(dt: datetime | None) -> int | None:
     return int(dt.timestamp())
 
 
+def invoice_id_to_key(invoice_id: InvoiceId) -> bytes:
+    """Преобразовывает Id счета в 16-байтовый ключ для бд."""
+    return invoice_id.bytes
+
+
+def key_to_invoice_id(key: bytes) -> InvoiceId:
+    """Преобразовывает 16-байтовый ключ из бд в Id счета."""
+    return InvoiceId(UUID(bytes=key))
+
+
 def minor_to_money(amount_minor: int, currency: Currency) -> Money:
     """Преобразовывает минорную сумму в объект денег."""
-    amount = Decimal(amount_minor) / 10**currency.exp
-    return Money(amount=amount, currency=currency)
+    return Money.from_minor(amount_minor, currency)
 
 
 def money_to_minor(money: Money) -> int:
     """Преобразовывает объект денег в минорную сумму для бд."""
-    minor = money.amount * 10**money.currency.exp
-    if minor != minor.to_integral_value():
-        raise ValueError("Не числовой размер суммы в миноре.")
-    return int(minor)
+    return money.minor
 
 
 def read_tax(amount: int | None, currency: Currency) -> Tax | None:
@@ -61,6 +79,182 @@ def read_discount(amount: int | None, currency: Currency) -> Discount | None:
     return Discount(minor_to_money(amount, currency))
 
 
+# Количество в бд - целое quantity * QUANTITY_SCALE.
+QUANTITY_SCALE = 10**QUANTITY_DECIMAL_PLACES
+# Сумма строчки в sql считается в int64, к |цена * количество|
+# прибавляется QUANTITY_SCALE // 2 для округления (LINE_TOTAL_SQL).
+MAX_LINE_PRODUCT = 2**63 - 1 - QUANTITY_SCALE // 2
+
+
+def quantity_to_scaled(quantity: Decimal) -> int:
+    """Преобразовывает количество в целое число миллионных долей."""
+    scaled = quantity.scaleb(QUANTITY_DECIMAL_PLACES)
+    if scaled != scaled.to_integral_value():
+        msg = f"Количество {quantity} не представимо с точностью 1e-6."
+        raise ValueError(msg)
+    return int(scaled)
+
+
+def quantity_exponent(quantity: Decimal) -> int:
+    """Показатель степени количества для бд (не меньше -6).
+
+    По нему scaled_to_quantity восстанавливает запись количества:
+    1.50 читается как 1.50, а не 1.5.
+    """
+    exponent = quantity.as_tuple().exponent
+    if not isinstance(exponent, int):
+        msg = f"Количество {quantity} должно быть конечным."
+        raise TypeError(msg)
+    return max(exponent, -QUANTITY_DECIMAL_PLACES)
+
+
+def scaled_to_quantity(scaled: int, exponent: int | None = None) -> Decimal:
+    """Преобразовывает целое число миллионных долей в количество.
+
+    С показателем exponent количество записывается с ним, как при
+    вводе. Без него (строчки до v008) целые количества возвращаются
+    без дробной части, дробные - без хвостовых нулей.
+    """
+    quantity = Decimal(scaled).scaleb(-QUANTITY_DECIMAL_PLACES)
+    if exponent is not None:
+        return quantity.quantize(Decimal(1).scaleb(exponent))
+    whole, frac = divmod(scaled, QUANTITY_SCALE)
+    if not frac:
+        return Decimal(whole)
+    return quantity.normalize()
+
+
+def rehydrate_line(
+    description: str,
+    unit_price: Money,
+    quantity: Decimal,
+) -> InvoiceLine:
+    """Собирает строчку из бд без повторной проверки инвариантов.
+
+    Только для репозиториев: данные уже проверены при записи в бд.
+    """
+    line = object.__new__(InvoiceLine)
+    object.__setattr__(line, "description", description)
+    object.__setattr__(line, "unit_price", unit_price)
+    object.__setattr__(line, "quantity", quantity)
+    return line
+
+
+def read_lines(lines_json: str, currency: Currency) -> list[InvoiceLine]:
+    """Собирает строчки счета из JSON.
+
+    Элемент - [позиция, описание, минор, кол-во, показатель кол-ва].
+
+    Порядок элементов json_group_array sqlite не гарантирует, поэтому
+    строчки сортируются по позиции здесь.
+    """
+    return [
+        rehydrate_line(
+            description,
+            Money.from_minor(minor, currency),
+            scaled_to_quantity(qty, exponent),
+        )
+        for _, description, minor, qty, exponent in sorted(
+            json.loads(lines_json),
+            key=itemgetter(0),
+        )
+    ]
+
+
+# Сумма строчки в минорных единицах: цена * количество с округлением
+# ROUND_HALF_UP (от нуля), как Money * Decimal в домене. Деление целых
+# в sqlite отбрасывает дробь, поэтому округление идет по модулю цены
+# (количество всегда положительно).
+LINE_TOTAL_SQL = f"""
+CASE WHEN l.unit_price_minor >= 0
+THEN (l.unit_price_minor * l.quantity_scaled + {QUANTITY_SCALE // 2})
+    / {QUANTITY_SCALE}
+ELSE -((-l.unit_price_minor * l.quantity_scaled + {QUANTITY_SCALE // 2})
+    / {QUANTITY_SCALE})
+END
+"""
+
+
+# Сколько Id передается в один запрос WHERE id IN (...).
+ID_CHUNK_SIZE = 500
+
+
+def id_chunks(
+    invoice_ids: Iterable[InvoiceId],
+) -> Iterator[tuple[bytes, ...]]:
+    """Разбивает Id счетов на пачки ключей для запросов с IN (...)."""
+    keys = dict.fromkeys(invoice_id_to_key(i) for i in invoice_ids)
+    return batched(keys, ID_CHUNK_SIZE)
+
+
+def placeholders(n: int) -> str:
+    """Список плейсхолдеров для IN (...)."""
+    return ", ".join("?" * n)
+
+
+# Соответствие отслеживаемых свойств агрегата колонкам таблицы Invoice.
+INVOICE_FIELD_COLUMNS: dict[str, str] = {
+    "status": "status",
+    "tax": "tax_amount_minor",
+    "discount": "discount_amount_minor",
+    "issued_at": "issued_at",
+    "paid_at": "paid_at",
+    "voided_at": "voided_at",
+    "payment_idempotency_key": "payment_idempotency_key",
+    "void_idempotency_key": "void_idempotency_key",
+}
+
+
+def invoice_row(invoice: Invoice) -> dict[str, str | int | None]:
+    """Собирает значения изменяемых колонок Invoice по агрегату."""
+    return {
+        "status": invoice.status.value,
+        "tax_amount_minor": money_to_minor(invoice.tax.amount)
+        if isinstance(invoice.tax, Tax)
+        else None,
+        "discount_amount_minor": money_to_minor(invoice.discount.amount)
+        if isinstance(invoice.discount, Discount)
+        else None,
+        "issued_at": dt_to_unix(invoice.issued_at),
+        "paid_at": dt_to_unix(invoice.paid_at),
+        "voided_at": dt_to_unix(invoice.voided_at),
+        "payment_idempotency_key": invoice.payment_idempotency_key,
+        "void_idempotency_key": invoice.void_idempotency_key,
+    }
+
+
+def invoice_totals(invoice: Invoice) -> dict[str, int]:
+    """Денормализованные суммы и число строчек счета для строки Invoice.
+
+    total_minor - subtotal + налог - скидка без проверки знака
+    (Invoice.total на отрицательной сумме выбрасывает ошибку).
+    """
+    subtotal = money_to_minor(invoice.subtotal)
+    tax = money_to_minor(invoice.tax.amount) if invoice.tax else 0
+    discount = (
+        money_to_minor(invoice.discount.amount) if invoice.discount else 0
+    )
+    return {
+        "subtotal_minor": subtotal,
+        "total_minor": subtotal + tax - discount,
+        "line_count": len(invoice.lines),
+    }
+
+
+def line_values(line: InvoiceLine) -> tuple[int, int, int]:
+    """Цена в минорных единицах, количество и его показатель для бд.
+
+    ValueError, если сумму строчки нельзя посчитать в sql без
+    переполнения int64.
+    """
+    minor = money_to_minor(line.unit_price)
+    scaled = quantity_to_scaled(line.quantity)
+    if abs(minor * scaled) > MAX_LINE_PRODUCT:
+        msg = f"Сумма строчки {line} не помещается в int64 бд."
+        raise ValueError(msg)
+    return minor, scaled, quantity_exponent(line.quantity)
+
+
 @dataclass(frozen=True)
 class InvoiceResultSQL:
     """Объект для преобразованных данных результатов запросов SQL."""
@@ -75,86 +269,133 @@ class InvoiceResultSQL:
     voided_at: datetime | None
     paid_idempotency: str | None
     voided_idempotency: str | None
+    lines: list[InvoiceLine]
+    version: int
+
+
+@dataclass(frozen=True)
+class PendingMark:
+    """Запись счета в текущей транзакции, еще не подтвержденная commit.
+
+    row - записанные значения колонок Invoice, lines - число записанных
+    строчек, version - версия записи после нее.
+    """
+
+    invoice: Invoice
+    row: dict[str, str | int | None]
+    lines: int
+    version: int
+
+
+HEADER_COLUMNS = """
+id, currency, status, subtotal_minor, total_minor, line_count,
+issued_at, version
+"""
+
+
+def read_header(_: sqlite3.Cursor, row: tuple[Any, ...]) -> InvoiceHeader:
+    """Row factory для HEADER_COLUMNS."""
+    currency = Currency[row[1]]
+    return InvoiceHeader(
+        invoice_id=key_to_invoice_id(row[0]),
+        currency=currency,
+        status=InvoiceStatus(row[2]),
+        subtotal=minor_to_money(row[3], currency),
+        total=minor_to_money(row[4], currency),
+        line_count=row[5],
+        issued_at=fromtimestamp(row[6]),
+        version=row[7],
+    )
+
+
+# Счет со строчками одной строкой результата: строчки упаковываются
+# в JSON-массив коррелированным подзапросом по первичному ключу
+# InvoiceLine (invoice_id, position).
+SELECT_INVOICES_SQL = """
+SELECT i.id, i.currency, i.status, i.tax_amount_minor,
+i.discount_amount_minor, i.issued_at, i.paid_at, i.voided_at,
+i.payment_idempotency_key, i.void_idempotency_key,
+(
+    SELECT json_group_array(
+        json_array(
+            l.position, l.description, l.unit_price_minor, l.quantity_scaled,
+            l.quantity_exponent
+        )
+    )
+    FROM `InvoiceLine` AS l
+    WHERE l.invoice_id = i.id
+),
+i.version
+FROM `Invoice` AS i
+"""
 
 
 class InvoiceSqliteRepository(InvoiceRepository):
-    """Класс репозитория счета с sqlite3."""
+    """Класс репозитория счета с sqlite3.
+
+    Схему бд создают миграции (infrastructure.migrations), репозиторий
+    только работает с переданным соединением.
+
+    Живет в пределах одного UOW и ведет identity map: повторный get
+    возвращает тот же экземпляр счета без повторной регидрации.
+    UOW сбрасывает изменения отслеживаемых счетов (flush) на commit.
+
+    Записанные счета отмечаются сохраненными (mark_persisted) только
+    в committed(): при сбое COMMIT счет остается с изменениями и
+    прежней версией. До этого повторная запись в той же транзакции
+    сверяется с PendingMark.
+    """
 
     def __init__(self, conn: sqlite3.Connection) -> None:
         self.__conn = conn
-        self.__create_tables()
+        self.__identity: dict[InvoiceId, Invoice] = {}
+        self.__pending: dict[InvoiceId, PendingMark] = {}
 
     @property
     def __cursor(self) -> sqlite3.Cursor:
         return self.__conn.cursor()
 
-    def __create_tables(self) -> None:
-        """Метод должен создать таблицы на старте репозитория."""
-        queries = [
-            """
-            PRAGMA foreign_keys = ON;
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS `Invoice`
-            (
-                id TEXT PRIMARY KEY,
-                currency TEXT NOT NULL,
-                status TEXT NOT NULL,
-                tax_amount_minor INTEGER,
-                discount_amount_minor INTEGER,
-                issued_at INTEGER,
-                paid_at INTEGER,
-                voided_at INTEGER,
-                payment_idempotency_key TEXT,
-                void_idempotency_key TEXT
-            );
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS `InvoiceLine`
-            (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                invoice_id TEXT NOT NULL,
-                description TEXT,
-                unit_price_minor INTEGER NOT NULL,
-                quantity TEXT NOT NULL,
-                FOREIGN KEY (invoice_id) REFERENCES Invoice(id)
-            );
-            """,
-        ]
-        for q in queries:
-            self.__cursor.execute(q)
+    @staticmethod
+    def __read_invoice_row(
+        _: sqlite3.Cursor,
+        row: tuple[Any, ...],
+    ) -> InvoiceResultSQL:
+        """Row factory: сразу собирает данные счета и его строчки."""
+        currency = Currency[row[1]]
+        return InvoiceResultSQL(
+            id=key_to_invoice_id(row[0]),
+            currency=currency,
+            status=InvoiceStatus(row[2]),
+            tax=read_tax(row[3], currency),
+            discount=read_discount(row[4], currency),
+            iss_at=fromtimestamp(row[5]),
+            paid_at=fromtimestamp(row[6]),
+            voided_at=fromtimestamp(row[7]),
+            paid_idempotency=row[8],
+            voided_idempotency=row[9],
+            lines=read_lines(row[10], currency),
+            version=row[11],
+        )
 
     def __get_invoice_data(self, invoice_id: InvoiceId) -> InvoiceResultSQL:
-        """Метод возвращает сырые данные счета по Id."""
-        _id = str(invoice_id)
-        q = """
-        SELECT * FROM `Invoice`
-        WHERE `id` = ?
-        LIMIT 1;
+        """Метод возвращает данные счета со строчками за один запрос.
+
+        Строчки упаковываются в JSON-массив коррелированным подзапросом:
+        заголовок не дублируется в каждой строке результата, а массив
+        разбирается на стороне C модулем json.
         """
-        res = self.__cursor.execute(q, (_id,))
-        i = res.fetchone()
-        if not i:
+        q = f"{SELECT_INVOICES_SQL} WHERE i.id = ?;"
+        cur = self.__cursor
+        cur.row_factory = self.__read_invoice_row
+        data: InvoiceResultSQL | None = cur.execute(
+            q,
+            (invoice_id_to_key(invoice_id),),
+        ).fetchone()
+        if data is None:
             raise InvoiceNotFoundError("Счет не найден.")
-        currency = Currency(i[1])
-        return InvoiceResultSQL(
-            id=InvoiceId(i[0]),
-            currency=currency,
-            status=InvoiceStatus(i[2]),
-            tax=read_tax(i[3], currency),
-            discount=read_discount(i[4], currency),
-            iss_at=fromtimestamp(i[5]),
-            paid_at=fromtimestamp(i[6]),
-            voided_at=fromtimestamp(i[7]),
-            paid_idempotency=i[8],
-            voided_idempotency=i[9],
-        )
+        return data
 
-    def __get_invoice(
-        self,
-        data: InvoiceResultSQL,
-        lines: list[InvoiceLine],
-    ) -> Invoice:
+    def __get_invoice(self, data: InvoiceResultSQL) -> Invoice:
         """Метод возвращает базовый объект счета по его данным."""
         return Invoice.rehydrate(
             InvoiceRehydrateData(
@@ -164,135 +405,279 @@ class InvoiceSqliteRepository(InvoiceRepository):
                 issued_at=data.iss_at,
                 paid_at=data.paid_at,
                 voided_at=data.voided_at,
-                lines=lines,
+                lines=data.lines,
                 tax=data.tax,
                 discount=data.discount,
                 paid_idempotency=data.paid_idempotency,
                 void_idempotency=data.voided_idempotency,
+                version=data.version,
             ),
         )
 
-    def __get_invoice_lines(
+    def __append_invoice_lines(
         self,
         invoice_id: InvoiceId,
-        invoice_currency: Currency,
-    ) -> list[InvoiceLine]:
-        """Метод возвращает список строчек счета по его Id и валюте."""
-        _id = str(invoice_id)
-        cur = self.__cursor
-        q = """
-        SELECT * FROM `InvoiceLine`
-        WHERE `invoice_id` = ?;
-        """
-        res = cur.execute(q, (_id,))
-        lines = res.fetchall()
-        return [
-            InvoiceLine(
-                description=line[2],
-                unit_price=minor_to_money(line[3], invoice_currency),
-                quantity=Decimal(line[4]),
-            )
-            for line in lines
-        ]
+        start: int,
+        lines: Iterable[InvoiceLine],
+    ) -> None:
+        """Метод дописывает строчки счета, начиная с позиции start.
 
-    def __delete_old_invoice_lines(self, invoice: Invoice) -> None:
-        """Метод для удаления старых строчек счета."""
-        q = """
-        DELETE FROM `InvoiceLine` WHERE
-        `invoice_id` = ?;
+        Строчки счета неизменяемы и только добавляются, поэтому уже
+        записанные строчки не удаляются и не перезаписываются.
         """
-        self.__cursor.execute(q, (str(invoice.invoice_id),))
-
-    def __create_new_invoice_lines(self, invoice: Invoice) -> None:
-        """Метод для создания новых строчек счета."""
         q = """
         INSERT INTO `InvoiceLine` (invoice_id, description,
-        unit_price_minor, quantity) VALUES (?, ?, ?, ?);
+        unit_price_minor, quantity_scaled, quantity_exponent, position)
+        VALUES (?, ?, ?, ?, ?, ?);
         """
-        cur = self.__cursor
-        for line in invoice.lines:
-            cur.execute(
-                q,
+        _id = invoice_id_to_key(invoice_id)
+        self.__cursor.executemany(
+            q,
+            (
                 (
-                    str(invoice.invoice_id),
+                    _id,
                     line.description,
-                    money_to_minor(line.unit_price),
-                    str(line.quantity),
-                ),
-            )
+                    *line_values(line),
+                    position,
+                )
+                for position, line in enumerate(lines, start=start)
+            ),
+        )
+
+    def tracked(self, invoice_id: InvoiceId) -> Invoice | None:
+        """Счет из identity map или None, бд не читается."""
+        return self.__identity.get(invoice_id)
+
+    def track(self, invoice: Invoice) -> None:
+        """Добавляет счет, собранный вне репозитория, в identity map.
+
+        Например, счет из снимка кэша: его изменения сбросит flush.
+        """
+        self.__identity.setdefault(invoice.invoice_id, invoice)
 
-    def __update_invoice_lines(self, invoice: Invoice) -> None:
-        """Метод для обновления строчек счета на записи."""
-        self.__delete_old_invoice_lines(invoice)
-        self.__create_new_invoice_lines(invoice)
+    @property
+    def written(self) -> frozenset[InvoiceId]:
+        """Id счетов, записанных в текущей транзакции до commit."""
+        return frozenset(self.__pending)
 
     def get(self, invoice_id: InvoiceId) -> Invoice:
         """Метод должен возвращать счет по его Id."""
-        invoice_data = self.__get_invoice_data(invoice_id)
-        lines = self.__get_invoice_lines(invoice_id, invoice_data.currency)
-        return self.__get_invoice(invoice_data, lines=lines)
+        invoice = self.__identity.get(invoice_id)
+        if invoice is None:
+            invoice = self.__get_invoice(self.__get_invoice_data(invoice_id))
+            self.__identity[invoice_id] = invoice
+        return invoice
+
+    def get_many(self, invoice_ids: Iterable[InvoiceId]) -> InvoiceBatch:
+        """Возвращает счета по списку Id пачками по ID_CHUNK_SIZE.
+
+        На пачку - один запрос SELECT_INVOICES_SQL с IN (...), строчки
+        каждого счета приходят уже сгруппированными в его строке.
+        Счета из identity map не перечитываются, загруженные
+        попадают в нее. Отсутствующие Id возвращаются в missing.
+        """
+        ids = list(dict.fromkeys(invoice_ids))
+        found = {i: self.__identity[i] for i in ids if i in self.__identity}
+        cur = self.__cursor
+        cur.row_factory = self.__read_invoice_row
+        for keys in id_chunks(i for i in ids if i not in found):
+            marks = placeholders(len(keys))
+            q = f"{SELECT_INVOICES_SQL} WHERE i.id IN ({marks});"
+            data: InvoiceResultSQL
+            for data in cur.execute(q, keys):
+                invoice = self.__get_invoice(data)
+                self.__identity[data.id] = invoice
+                found[data.id] = invoice
+        return InvoiceBatch.collect(ids, found)
 
     def add(self, invoice: Invoice) -> None:
         """Создает счет в БД."""
-        q = """
-        INSERT INTO `Invoice` (id, currency, status, tax_amount_minor,
-        discount_amount_minor, issued_at, paid_at, voided_at,
-        payment_idempotency_key, void_idempotency_key) VALUES (
-            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-        );
-        """
+        row = invoice_row(invoice) | invoice_totals(invoice)
+        q = f"""
+        INSERT INTO `Invoice` (id, currency, version, {", ".join(row)})
+        VALUES (?, ?, ?{", ?" * len(row)});
+        """  # noqa: S608 - колонки из INVOICE_FIELD_COLUMNS
         try:
             self.__cursor.execute(
                 q,
                 (
-                    str(invoice.invoice_id),
+                    invoice_id_to_key(invoice.invoice_id),
                     invoice.currency.value,
-                    invoice.status.value,
-                    money_to_minor(invoice.tax.amount)
-                    if isinstance(invoice.tax, Tax)
-                    else None,
-                    money_to_minor(invoice.discount.amount)
-                    if isinstance(invoice.discount, Discount)
-                    else None,
-                    dt_to_unix(invoice.issued_at),
-                    dt_to_unix(invoice.paid_at),
-                    dt_to_unix(invoice.voided_at),
-                    invoice.payment_idempotency_key,
-                    invoice.void_idempotency_key,
+                    invoice.version,
+                    *row.values(),
                 ),
             )
-            self.__update_invoice_lines(invoice)
+            self.__append_invoice_lines(
+                invoice.invoice_id,
+                start=0,
+                lines=invoice.lines,
+            )
 
         except sqlite3.IntegrityError as e:
             raise InvoiceNotUniqueError(
                 "InvoiceId должен быть уникальным.",
             ) from e
+        self.__pending[invoice.invoice_id] = PendingMark(
+            invoice=invoice,
+            row=row,
+            lines=len(invoice.lines),
+            version=invoice.version,
+        )
+        self.__identity[invoice.invoice_id] = invoice
 
     def save(self, invoice: Invoice) -> None:
-        """Обновляет объект счета в БД."""
-        q = """
-        UPDATE `Invoice` SET currency = ?, status = ?, tax_amount_minor = ?,
-        discount_amount_minor = ?, issued_at = ?, paid_at = ?, voided_at = ?,
-        payment_idempotency_key = ?, void_idempotency_key = ?
-        WHERE id = ?;
+        """Обновляет объект счета в БД.
+
+        Пишет только измененные с регидрации поля и новые строчки,
+        при отсутствии изменений в бд ничего не пишется.
+
+        Обновление идет через compare-and-swap по Invoice.version:
+        если запись сменила версию с момента загрузки счета,
+        выбрасывается InvoiceVersionConflictError. Суммы и число
+        строчек (invoice_totals) пишутся тем же UPDATE.
+
+        Если счет уже записан в этой транзакции, пишется только разница
+        с PendingMark, а версия для сравнения берется из нее.
         """
-        self.__cursor.execute(
+        changes = invoice.pending_changes()
+        if changes.is_empty:
+            return
+        row = invoice_row(invoice) | invoice_totals(invoice)
+        columns = [INVOICE_FIELD_COLUMNS[f] for f in sorted(changes.fields)]
+        start, version = changes.lines_start, invoice.version
+        mark = self.__pending.get(invoice.invoice_id)
+        if mark is not None:
+            columns = [c for c in columns if row[c] != mark.row[c]]
+            start, version = mark.lines, mark.version
+        new_lines = invoice.lines[start:]
+        if not columns and not new_lines:
+            return
+        columns += ["subtotal_minor", "total_minor", "line_count"]
+        assignments = "".join(f"{c} = ?, " for c in columns)
+        q = f"""
+        UPDATE `Invoice` SET {assignments}version = version + 1
+        WHERE id = ? AND version = ?;
+        """  # noqa: S608 - колонки из INVOICE_FIELD_COLUMNS
+        cur = self.__cursor
+        cur.execute(
             q,
             (
-                invoice.currency.value,
-                invoice.status.value,
-                money_to_minor(invoice.tax.amount)
-                if isinstance(invoice.tax, Tax)
-                else None,
-                money_to_minor(invoice.discount.amount)
-                if isinstance(invoice.discount, Discount)
-                else None,
-                dt_to_unix(invoice.issued_at),
-                dt_to_unix(invoice.paid_at),
-                dt_to_unix(invoice.voided_at),
-                invoice.payment_idempotency_key,
-                invoice.void_idempotency_key,
-                str(invoice.invoice_id),
+                *(row[c] for c in columns),
+                invoice_id_to_key(invoice.invoice_id),
+                version,
             ),
         )
-        self.__update_invoice_lines(invoice)
+        if cur.rowcount != 1:
+            raise InvoiceVersionConflictError(
+                "Счет изменен параллельно, повторите операцию.",
+            )
+        self.__append_invoice_lines(
+            invoice.invoice_id,
+            start=start,
+            lines=new_lines,
+        )
+        self.__pending[invoice.invoice_id] = PendingMark(
+            invoice=invoice,
+            row=row,
+            lines=len(invoice.lines),
+            version=version + 1,
+        )
+
+    def subtotals(
+        self,
+        invoice_ids: Iterable[InvoiceId],
+    ) -> dict[InvoiceId, Money]:
+        """Суммы строчек счетов без налога и скидок, посчитанные в sqlite.
+
+        Счета не регидрируются: строчки суммируются запросом по
+        LINE_TOTAL_SQL, результат совпадает с Invoice.subtotal.
+        Отсутствующих в бд счетов в результате нет. Несохраненные
+        изменения отслеживаемых счетов сначала сбрасываются (flush).
+        """
+        self.flush()
+        result: dict[InvoiceId, Money] = {}
+        cur = self.__cursor
+        for keys in id_chunks(invoice_ids):
+            q = f"""
+            SELECT i.id, i.currency, COALESCE(SUM({LINE_TOTAL_SQL}), 0)
+            FROM `Invoice` AS i
+            LEFT JOIN `InvoiceLine` AS l ON l.invoice_id = i.id
+            WHERE i.id IN ({placeholders(len(keys))})
+            GROUP BY i.id;
+            """  # noqa: S608 - только плейсхолдеры
+            for key, currency, minor in cur.execute(q, keys):
+                result[key_to_invoice_id(key)] = Money.from_minor(
+                    minor,
+                    Currency[currency],
+                )
+        return result
+
+    def subtotal(self, invoice_id: InvoiceId) -> Money:
+        """Сумма строчек одного счета, посчитанная в sqlite."""
+        subtotal = self.subtotals((invoice_id,)).get(invoice_id)
+        if subtotal is None:
+            raise InvoiceNotFoundError("Счет не найден.")
+        return subtotal
+
+    def header(self, invoice_id: InvoiceId) -> InvoiceHeader:
+        """Заголовок счета без чтения строчек."""
+        self.flush()
+        q = f"SELECT {HEADER_COLUMNS} FROM `Invoice` WHERE id = ?;"  # noqa: S608
+        cur = self.__cursor
+        cur.row_factory = read_header
+        header: InvoiceHeader | None = cur.execute(
+            q,
+            (invoice_id_to_key(invoice_id),),
+        ).fetchone()
+        if header is None:
+            raise InvoiceNotFoundError("Счет не найден.")
+        return header
+
+    def headers(
+        self,
+        *,
+        status: InvoiceStatus | None = None,
+        after: InvoiceId | None = None,
+        limit: int = 100,
+    ) -> list[InvoiceHeader]:
+        """Страница заголовков счетов по возрастанию ключа.
+
+        Пагинация по ключу: следующая страница - after=<Id последнего
+        заголовка>. Строчки счетов не читаются.
+        """
+        self.flush()
+        where = ["id > ?"] if after is not None else []
+        params: list[bytes | str | int] = (
+            [invoice_id_to_key(after)] if after is not None else []
+        )
+        if status is not None:
+            where.append("status = ?")
+            params.append(status.value)
+        q = f"""
+        SELECT {HEADER_COLUMNS} FROM `Invoice`
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY id LIMIT ?;
+        """  # noqa: S608 - только плейсхолдеры
+        cur = self.__cursor
+        cur.row_factory = read_header
+        headers: list[InvoiceHeader] = cur.execute(
+            q,
+            (*params, limit),
+        ).fetchall()
+        return headers
+
+    def flush(self) -> None:
+        """Сохраняет изменения всех счетов из identity map."""
+        for invoice in self.__identity.values():
+            self.save(invoice)
+
+    def committed(self) -> None:
+        """После commit: записанные счета отмечаются сохраненными."""
+        for mark in self.__pending.values():
+            mark.invoice.mark_persisted(version=mark.version)
+        self.clear()
+
+    def clear(self) -> None:
+        """Очищает identity map и неподтвержденные записи (rollback)."""
+        self.__identity.clear()
+        self.__pending.clear()
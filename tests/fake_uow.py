@@ -16,6 +16,10 @@ class FakeUnitOfWork(UnitOfWork):
     def rollback(self) -> None:
         """Метод заглушка. Модуль для тестов. Не использовать."""
 
+    def read_only(self) -> UnitOfWork:
+        """Метод заглушка. Модуль для тестов. Не использовать."""
+        return self
+
     def __enter__(self) -> UnitOfWork:
         """Метод заглушка. Модуль для тестов. Не использовать."""
         return self
@@ -1,8 +1,14 @@
 # tests/invoice_in_memory.py
+from collections.abc import Iterable
+
 from billing_system.application.errors import InvoiceNotFoundError
 from billing_system.domain.aggregates import Invoice
-from billing_system.domain.repositories import InvoiceRepository
-from billing_system.domain.value_objects import InvoiceId
+from billing_system.domain.repositories import (
+    InvoiceBatch,
+    InvoiceHeader,
+    InvoiceRepository,
+)
+from billing_system.domain.value_objects import InvoiceId, InvoiceStatus
 
 
 class InvoiceRepoInMemo(InvoiceRepository):
@@ -22,6 +28,30 @@ class InvoiceRepoInMemo(InvoiceRepository):
             raise InvoiceNotFoundError(msg)
         return self.__data[invoice_id]
 
+    def get_many(self, invoice_ids: Iterable[InvoiceId]) -> InvoiceBatch:
+        """Возвращает сохраненные счета, отсутствующие - в missing."""
+        return InvoiceBatch.collect(invoice_ids, self.__data)
+
+    def header(self, invoice_id: InvoiceId) -> InvoiceHeader:
+        """Заголовок сохраненного счета."""
+        return InvoiceHeader.of(self.get(invoice_id))
+
+    def headers(
+        self,
+        *,
+        status: InvoiceStatus | None = None,
+        after: InvoiceId | None = None,
+        limit: int = 100,
+    ) -> list[InvoiceHeader]:
+        """Страница заголовков сохраненных счетов по байтам Id."""
+        ids = sorted(self.__data, key=lambda i: i.bytes)
+        if after is not None:
+            ids = [i for i in ids if i.bytes > after.bytes]
+        headers = [InvoiceHeader.of(self.__data[i]) for i in ids]
+        if status is not None:
+            headers = [h for h in headers if h.status == status]
+        return headers[:limit]
+
     def add(self, invoice: Invoice) -> None:
         """Создает счет в памяти (словарь)."""
         self.__data[invoice.invoice_id] = invoice
@@ -0,0 +1,55 @@
+# tests/unit/test_currency.py
+# Unit тесты для реестра валют ISO 4217.
+from decimal import Decimal
+
+import pytest
+
+from billing_system.domain.errors import CurrencyMismatchError
+from billing_system.domain.value_objects import Currency, Money
+
+CODE_LENGTH = 3
+
+
+@pytest.mark.parametrize(
+    "code, numeric, exp",
+    [
+        ("RUB", 643, 2),
+        ("EUR", 978, 2),
+        ("USD", 840, 2),
+        ("JPY", 392, 0),
+        ("BHD", 48, 3),
+        ("KWD", 414, 3),
+        ("CLF", 990, 4),
+        ("ALL", 8, 2),
+    ],
+)
+def test_registry(code: str, numeric: int, exp: int) -> None:
+    cur = Currency.from_code(code)
+    assert cur.value == code
+    assert cur.numeric == numeric
+    assert cur.exp == exp
+    assert cur.quantum.as_tuple().exponent == -exp
+    assert Currency.from_numeric(numeric) is cur
+
+
+def test_registry_is_consistent() -> None:
+    assert len({c.numeric for c in Currency}) == len(Currency)
+    for cur in Currency:
+        assert cur.name == cur.value
+        assert len(cur.value) == CODE_LENGTH
+        assert cur.quantum == Decimal(1).scaleb(-cur.exp)
+
+
+def test_unknown_code() -> None:
+    with pytest.raises(CurrencyMismatchError):
+        Currency.from_code("AAA")
+
+    with pytest.raises(CurrencyMismatchError):
+        Currency.from_numeric(0)
+
+
+def test_three_decimal_money() -> None:
+    mon = Money(Decimal("1.2345"), Currency.KWD)
+    assert mon.amount == Decimal("1.235")
+    assert mon.minor == Money.from_minor(1235, Currency.KWD).minor
+    assert str(mon * Decimal("0.5")) == "0.618 KWD"
@@ -1,23 +1,31 @@
 # tests/unit/test_fastapi_adapter.py
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from functools import partial
 from pathlib import Path
 from uuid import uuid4
 
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
 from billing_system.domain.value_objects.currency import Currency
 from billing_system.domain.value_objects.invoice_status import InvoiceStatus
 from billing_system.infrastructure.api.fastapi import create_app
+from billing_system.infrastructure.errors import NoConnectionError
+from billing_system.infrastructure.protocols.sqlite_pool import (
+    SqliteConnectionPool,
+)
 from billing_system.infrastructure.protocols.sqlite_uow import SqliteUnitOfWork
 from tests.fake_clock import FakeClock
 
 
 def test_create_and_get_invoice(tmp_path: Path) -> None:
     f = tmp_path / "test.sqlite"
-    uow = SqliteUnitOfWork(f)
+    pool = SqliteConnectionPool(f)
     clock = FakeClock()
-    app = create_app(uow, clock)
+    app = create_app(partial(SqliteUnitOfWork, pool), clock)
     client = TestClient(app)
 
     uid = uuid4()
@@ -36,9 +44,9 @@ def test_create_and_get_invoice(tmp_path: Path) -> None:
 
 def test_create_non_unique_invoices(tmp_path: Path) -> None:
     f = tmp_path / "test.sqlite"
-    uow = SqliteUnitOfWork(f)
+    pool = SqliteConnectionPool(f)
     clock = FakeClock()
-    app = create_app(uow, clock)
+    app = create_app(partial(SqliteUnitOfWork, pool), clock)
     client = TestClient(app)
 
     uid = uuid4()
@@ -56,9 +64,9 @@ def test_create_non_unique_invoices(tmp_path: Path) -> None:
 
 def test_random_uuid(tmp_path: Path) -> None:
     f = tmp_path / "test.sqlite"
-    uow = SqliteUnitOfWork(f)
+    pool = SqliteConnectionPool(f)
     clock = FakeClock()
-    app = create_app(uow, clock)
+    app = create_app(partial(SqliteUnitOfWork, pool), clock)
     client = TestClient(app)
 
     r = client.post("/invoice/", params={"currency": "EUR"})
@@ -68,9 +76,9 @@ def test_random_uuid(tmp_path: Path) -> None:
 
 def test_add_line(tmp_path: Path) -> None:
     f = tmp_path / "test.sqlite"
-    uow = SqliteUnitOfWork(f)
+    pool = SqliteConnectionPool(f)
     clock = FakeClock()
-    app = create_app(uow, clock)
+    app = create_app(partial(SqliteUnitOfWork, pool), clock)
     client = TestClient(app)
     uid = uuid4()
     client.post(
@@ -92,9 +100,9 @@ def test_add_line(tmp_path: Path) -> None:
 
 def test_issue_invoice(tmp_path: Path) -> None:
     f = tmp_path / "test.sqlite"
-    uow = SqliteUnitOfWork(f)
+    pool = SqliteConnectionPool(f)
     clock = FakeClock()
-    app = create_app(uow, clock)
+    app = create_app(partial(SqliteUnitOfWork, pool), clock)
     client = TestClient(app)
     uid = uuid4()
     client.post(
@@ -117,9 +125,9 @@ def test_issue_invoice(tmp_path: Path) -> None:
 
 def test_void_invoice(tmp_path: Path) -> None:
     f = tmp_path / "test.sqlite"
-    uow = SqliteUnitOfWork(f)
+    pool = SqliteConnectionPool(f)
     clock = FakeClock()
-    app = create_app(uow, clock)
+    app = create_app(partial(SqliteUnitOfWork, pool), clock)
     client = TestClient(app)
     uid = uuid4()
     client.post(
@@ -136,3 +144,65 @@ def test_void_invoice(tmp_path: Path) -> None:
     )
     assert r.status_code == status.HTTP_200_OK
     assert r.json()["status"] == InvoiceStatus.VOID.value
+
+
+def test_parallel_requests(tmp_path: Path) -> None:
+    # Без with каждый запрос TestClient идет в своем event loop и потоке,
+    # поэтому обработчики действительно выполняются параллельно.
+    f = tmp_path / "test.sqlite"
+    pool = SqliteConnectionPool(f)
+    app = create_app(partial(SqliteUnitOfWork, pool), FakeClock())
+    client = TestClient(app)
+    uid = uuid4()
+    client.post("/invoice/", params={"currency": "EUR", "invoice_id": uid})
+
+    def create(_: int) -> int:
+        r = client.post("/invoice/", params={"currency": "EUR"})
+        return int(r.status_code)
+
+    def get(_: int) -> int:
+        return int(client.get(f"/invoice/{uid}").status_code)
+
+    n = 150
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        created = list(ex.map(create, range(n)))
+        fetched = list(ex.map(get, range(n)))
+        mixed = [ex.submit(create if i % 2 else get, i) for i in range(n)]
+    assert created == [status.HTTP_201_CREATED] * n
+    assert fetched == [status.HTTP_200_OK] * n
+    assert {r.result() for r in mixed} == {
+        status.HTTP_200_OK,
+        status.HTTP_201_CREATED,
+    }
+
+
+def test_busy_database_is_503(tmp_path: Path) -> None:
+    f = tmp_path / "test.sqlite"
+    pool = SqliteConnectionPool(f, busy_timeout=1)
+    app = create_app(partial(SqliteUnitOfWork, pool), FakeClock())
+    client = TestClient(app)
+    pool.release(pool.acquire())
+
+    holder = sqlite3.connect(f, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE;")
+    r = client.post("/invoice/", params={"currency": "EUR"})
+    holder.rollback()
+    holder.close()
+    assert r.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert r.headers["Retry-After"] == "1"
+
+
+def test_shutdown_closes_pool(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "test.sqlite")
+    app = create_app(
+        partial(SqliteUnitOfWork, pool),
+        FakeClock(),
+        on_shutdown=pool.close,
+    )
+    with TestClient(app) as client:
+        r = client.post("/invoice/", params={"currency": "EUR"})
+        assert r.status_code == status.HTTP_201_CREATED
+        assert pool.idle == 1
+    assert pool.idle == 0
+    with pytest.raises(NoConnectionError):
+        pool.acquire()
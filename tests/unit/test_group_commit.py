@@ -0,0 +1,169 @@
+# tests/unit/test_group_commit.py
+# Unit тесты для группового commit sqlite.
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+
+from billing_system.application.dto import CreateInvoiceRequest
+from billing_system.application.usecase import CreateInvoice
+from billing_system.domain.aggregates import Invoice
+from billing_system.domain.errors import InvoiceNotFoundError
+from billing_system.domain.value_objects import Currency, InvoiceId
+from billing_system.infrastructure.errors import GroupCommitError
+from billing_system.infrastructure.protocols import (
+    GroupCommitUnitOfWork,
+    GroupCommitWriter,
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+)
+
+THREADS = 8
+
+
+def count_invoices(pool: SqliteConnectionPool) -> int:
+    with pool.connection() as conn:
+        (count,) = conn.execute("SELECT COUNT(*) FROM Invoice;").fetchone()
+    return int(count)
+
+
+def run_parallel(target: list[threading.Thread]) -> None:
+    for t in target:
+        t.start()
+    for t in target:
+        t.join()
+
+
+def test_single_unit(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    writer = GroupCommitWriter(pool, window=0)
+    uid = uuid4()
+    CreateInvoice(GroupCommitUnitOfWork(writer))(
+        CreateInvoiceRequest(id=uid, currency="EUR"),
+    )
+    with SqliteUnitOfWork(pool).read_only() as uow:
+        assert uow.invoices.get(InvoiceId(uid)).currency == Currency.EUR
+    assert writer.stats.batches == 1
+    assert pool.idle == pool.size
+
+
+def test_units_share_commit(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    writer = GroupCommitWriter(pool, window=1.0, max_batch=THREADS)
+    barrier = threading.Barrier(THREADS)
+
+    def create() -> None:
+        barrier.wait()
+        CreateInvoice(GroupCommitUnitOfWork(writer))(
+            CreateInvoiceRequest(id=uuid4(), currency="EUR"),
+        )
+
+    run_parallel([threading.Thread(target=create) for _ in range(THREADS)])
+    assert count_invoices(pool) == THREADS
+    stats = writer.stats
+    assert stats.units == THREADS
+    assert stats.batches < THREADS
+
+
+def add_invoice(uow: GroupCommitUnitOfWork, uid: UUID, *, fail: bool) -> None:
+    with uow:
+        uow.invoices.add(Invoice(Currency.EUR, InvoiceId(uid)))
+        if fail:
+            raise RuntimeError
+
+
+def test_failed_unit_does_not_poison_batch(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    writer = GroupCommitWriter(pool, window=1.0, max_batch=THREADS)
+    barrier = threading.Barrier(THREADS)
+    failed: list[UUID] = []
+
+    def create(fail: bool) -> None:
+        uid = uuid4()
+        barrier.wait()
+        try:
+            add_invoice(GroupCommitUnitOfWork(writer), uid, fail=fail)
+        except RuntimeError:
+            failed.append(uid)
+
+    run_parallel(
+        [
+            threading.Thread(target=create, args=(i % 2 == 0,))
+            for i in range(THREADS)
+        ],
+    )
+    assert len(failed) == THREADS // 2
+    assert count_invoices(pool) == THREADS - len(failed)
+    with SqliteUnitOfWork(pool).read_only() as uow:
+        assert all(not invoice_exists(uow, uid) for uid in failed)
+    assert writer.stats.failed_units == len(failed)
+
+
+def invoice_exists(uow: SqliteUnitOfWork, uid: UUID) -> bool:
+    try:
+        uow.invoices.get(InvoiceId(uid))
+    except InvoiceNotFoundError:
+        return False
+    return True
+
+
+def test_max_batch_closes_batch(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    writer = GroupCommitWriter(pool, window=1.0, max_batch=1)
+    for _ in range(THREADS):
+        CreateInvoice(GroupCommitUnitOfWork(writer))(
+            CreateInvoiceRequest(id=uuid4(), currency="EUR"),
+        )
+    assert writer.stats.batches == THREADS
+
+
+def test_bad_limits(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    with pytest.raises(ValueError, match="max_batch"):
+        GroupCommitWriter(pool, max_batch=0)
+
+
+def test_leader_release_failure_aborts_batch(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    writer = GroupCommitWriter(pool, window=0)
+    conn = writer.begin()
+    conn.execute("RELEASE unit;")
+    with pytest.raises(sqlite3.OperationalError, match="no such savepoint"):
+        writer.end(ok=True)
+    assert pool.idle == pool.size
+
+    uid = uuid4()
+    CreateInvoice(GroupCommitUnitOfWork(writer))(
+        CreateInvoiceRequest(id=uid, currency="EUR"),
+    )
+    assert count_invoices(pool) == 1
+    assert writer.stats.failed_units == 1
+    assert pool.idle == pool.size
+
+
+def test_follower_wait_is_bounded(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    window = 1.0
+    writer = GroupCommitWriter(pool, window=window, commit_timeout=0.05)
+    # Ведущий ждет всю window: писатель считает, что вход ждут.
+    writer._GroupCommitWriter__queued = 1  # type: ignore[attr-defined]  # noqa: SLF001
+
+    def leader() -> None:
+        writer.begin()
+        writer.end(ok=True)
+
+    t = threading.Thread(target=leader)
+    t.start()
+    while writer.stats.units == 0:
+        time.sleep(0.001)
+    writer.begin()
+    started = time.perf_counter()
+    with pytest.raises(GroupCommitError, match="Нет результата"):
+        writer.end(ok=True)
+    assert time.perf_counter() - started < window
+    t.join()
+    assert writer.stats.batches == 1
+    assert pool.idle == pool.size
@@ -4,14 +4,17 @@ import uuid
 from decimal import Decimal
 
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
-from billing_system.domain.aggregates import Invoice
+from billing_system.domain.aggregates import Invoice, InvoiceRehydrateData
 from billing_system.domain.errors import (
     InvoiceCurrencyMismatchError,
     InvoiceOperationError,
     NegativeMoneyError,
 )
 from billing_system.domain.value_objects import (
+    QUANTITY_DECIMAL_PLACES,
     Currency,
     Discount,
     InvoiceId,
@@ -425,3 +428,106 @@ def test_payment_idempotency() -> None:
     # Попытка использования другого ключа (другая оплата)
     with pytest.raises(InvoiceOperationError):
         invoice_draft.mark_paid(clock, "123")
+
+
+def full_subtotal(invoice: Invoice) -> Money:
+    """Полный пересчет суммы по строчкам для сверки с инкрементом."""
+    sub = Money(Decimal(0), invoice.currency)
+    for line in invoice.lines:
+        sub = sub + line.unit_price * line.quantity
+    return sub
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.decimals(
+                allow_nan=False,
+                allow_infinity=False,
+                min_value=Decimal("-1e6"),
+                max_value=Decimal("1e6"),
+            ),
+            st.decimals(
+                allow_nan=False,
+                allow_infinity=False,
+                min_value=Decimal("1e-3"),
+                max_value=Decimal("1e3"),
+                places=QUANTITY_DECIMAL_PLACES,
+            ),
+        ),
+        max_size=20,
+    ),
+)
+def test_running_subtotal_matches_recompute(
+    lines: list[tuple[Decimal, Decimal]],
+) -> None:
+    invoice_draft = Invoice(Currency.EUR, InvoiceId(uuid.uuid4()))
+    for price, qty in lines:
+        invoice_draft.add_line(
+            InvoiceLine("Товар", Money(price, Currency.EUR), qty),
+        )
+        assert invoice_draft.subtotal == full_subtotal(invoice_draft)
+
+    assert invoice_draft.line_totals == tuple(
+        line.line_total for line in invoice_draft.lines
+    )
+
+    rehydrated = Invoice.rehydrate(
+        InvoiceRehydrateData(
+            invoice_id=invoice_draft.invoice_id,
+            currency=invoice_draft.currency,
+            status=invoice_draft.status,
+            lines=list(invoice_draft.lines),
+            tax=None,
+            discount=None,
+            issued_at=None,
+            paid_at=None,
+            voided_at=None,
+            void_idempotency=None,
+            paid_idempotency=None,
+        ),
+    )
+    assert rehydrated.subtotal == full_subtotal(invoice_draft)
+    assert rehydrated.line_totals == invoice_draft.line_totals
+
+
+def test_pending_changes() -> None:
+    invoice_draft = Invoice(Currency.EUR, InvoiceId(uuid.uuid4()))
+    assert invoice_draft.pending_changes().is_empty
+
+    line = InvoiceLine(
+        "Banana",
+        Money(Decimal("1.29"), Currency.EUR),
+        Decimal(4),
+    )
+    invoice_draft.add_line(line)
+    invoice_draft.set_tax(Tax(Money(Decimal("0.2"), Currency.EUR)))
+    changes = invoice_draft.pending_changes()
+    assert changes.fields == {"tax"}
+    assert changes.lines_start == 0
+    assert changes.new_lines == (line,)
+
+    invoice_draft.mark_persisted()
+    assert invoice_draft.pending_changes().is_empty
+
+    clock = FakeClock()
+    invoice_draft.issue(clock)
+    changes = invoice_draft.pending_changes()
+    assert changes.fields == {"status", "issued_at"}
+    assert changes.lines_start == 1
+    assert changes.new_lines == ()
+
+
+def test_idempotent_void_has_no_changes() -> None:
+    invoice_draft = Invoice(Currency.EUR, InvoiceId(uuid.uuid4()))
+    clock = FakeClock()
+    invoice_draft.void(clock, "key")
+    assert invoice_draft.pending_changes().fields == {
+        "status",
+        "voided_at",
+        "void_idempotency_key",
+    }
+    invoice_draft.mark_persisted()
+
+    invoice_draft.void(clock, "key")
+    assert invoice_draft.pending_changes().is_empty
@@ -0,0 +1,186 @@
+# tests/unit/test_invoice_cache.py
+# Unit тесты для кэша снимков счетов и кэширующего репозитория.
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from billing_system.domain.aggregates import Invoice, InvoiceRehydrateData
+from billing_system.domain.value_objects import (
+    Currency,
+    InvoiceId,
+    InvoiceLine,
+    InvoiceStatus,
+    Money,
+)
+from billing_system.infrastructure.cache import InvoiceCache
+from billing_system.infrastructure.protocols import SqliteUnitOfWork
+from billing_system.infrastructure.repositories import (
+    CachedInvoiceRepository,
+)
+from tests.fake_clock import FakeClock
+
+TTL = 10.0
+
+
+class Ticker:
+    """Управляемые монотонные часы для TTL."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def snapshot(
+    status: InvoiceStatus = InvoiceStatus.DRAFT,
+) -> InvoiceRehydrateData:
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid4()))
+    data = invoice.snapshot()
+    return InvoiceRehydrateData(**{**data.__dict__, "status": status})
+
+
+def line() -> InvoiceLine:
+    return InvoiceLine("Чай", Money(Decimal(2), Currency.EUR), Decimal(1))
+
+
+def test_lru_eviction() -> None:
+    cache = InvoiceCache(max_size=2)
+    a, b, c = snapshot(), snapshot(), snapshot()
+    for snap in (a, b):
+        cache.put(snap, cache.generation)
+    assert cache.get(a.invoice_id) is a
+    cache.put(c, cache.generation)
+    assert cache.get(b.invoice_id) is None
+    assert cache.get(a.invoice_id) is a
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (1 + 1, 1, 1)
+    assert stats.size == 1 + 1
+
+
+@pytest.mark.parametrize(
+    "status, expires",
+    [
+        (InvoiceStatus.DRAFT, True),
+        (InvoiceStatus.ISSUED, True),
+        (InvoiceStatus.PAID, False),
+        (InvoiceStatus.VOID, False),
+    ],
+)
+def test_ttl(status: InvoiceStatus, expires: bool) -> None:
+    ticker = Ticker()
+    cache = InvoiceCache(ttl=TTL, clock=ticker)
+    snap = snapshot(status)
+    cache.put(snap, cache.generation)
+    ticker.now = TTL * 1000
+    assert (cache.get(snap.invoice_id) is None) is expires
+    assert cache.stats.expirations == int(expires)
+
+
+def test_stale_put_is_ignored() -> None:
+    cache = InvoiceCache()
+    snap = snapshot()
+    generation = cache.generation
+    cache.invalidate([snap.invoice_id])
+    cache.put(snap, generation)
+    assert cache.get(snap.invoice_id) is None
+
+
+def test_uow_reads_from_cache(tmp_path: Path) -> None:
+    cache = InvoiceCache()
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite", cache=cache)
+    uid = InvoiceId(uuid4())
+    with uow:
+        invoice = Invoice(Currency.EUR, uid)
+        invoice.add_line(line())
+        uow.invoices.add(invoice)
+
+    reader = uow.read_only()
+    with reader:
+        assert isinstance(reader.invoices, CachedInvoiceRepository)
+        first = reader.invoices.get(uid)
+        assert reader.invoices.get(uid) is first
+        # Изменение копии не трогает снимок в кэше.
+        first.add_line(line())
+    with reader:
+        second = reader.invoices.get(uid)
+    assert second is not first
+    assert len(second.lines) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_get_many_reads_through_cache(tmp_path: Path) -> None:
+    cache = InvoiceCache()
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite", cache=cache)
+    uids = [InvoiceId(uuid4()) for _ in range(3)]
+    missing = InvoiceId(uuid4())
+    with uow:
+        for uid in uids:
+            invoice = Invoice(Currency.EUR, uid)
+            invoice.add_line(line())
+            uow.invoices.add(invoice)
+
+    reader = uow.read_only()
+    with reader:
+        reader.invoices.get(uids[0])
+    with reader:
+        batch = reader.invoices.get_many([*uids, missing])
+        assert reader.invoices.get(uids[-1]) is batch.invoices[uids[-1]]
+    assert list(batch.invoices) == uids
+    assert batch.missing == (missing,)
+    assert all(len(i.lines) == 1 for i in batch.invoices.values())
+    # uids[0] - из кэша, остальные прочитаны из бд и положены в кэш.
+    assert cache.stats.hits == 1
+    assert cache.stats.size == len(uids)
+
+
+def test_commit_invalidates(tmp_path: Path) -> None:
+    cache = InvoiceCache()
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite", cache=cache)
+    reader = uow.read_only()
+    uid = InvoiceId(uuid4())
+    with uow:
+        invoice = Invoice(Currency.EUR, uid)
+        invoice.add_line(line())
+        uow.invoices.add(invoice)
+    with reader:
+        reader.invoices.get(uid)
+
+    # Откат не трогает кэш.
+    def fail() -> None:
+        with uow:
+            uow.invoices.get(uid).issue(FakeClock())
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        fail()
+    assert cache.stats.invalidations == 0
+
+    with uow:
+        uow.invoices.get(uid).issue(FakeClock())
+    assert cache.stats.invalidations == 1
+    with reader:
+        assert reader.invoices.get(uid).status == InvoiceStatus.ISSUED
+
+
+def test_flush_saves_each_invoice_once(tmp_path: Path) -> None:
+    cache = InvoiceCache()
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite", cache=cache)
+    uid = InvoiceId(uuid4())
+    with uow:
+        invoice = Invoice(Currency.EUR, uid)
+        invoice.add_line(line())
+        uow.invoices.add(invoice)
+
+    statements: list[str] = []
+    with uow:
+        assert uow.conn is not None
+        uow.conn.set_trace_callback(statements.append)
+        uow.invoices.get(uid).issue(FakeClock())
+        uow.invoices.flush()
+        uow.invoices.flush()
+    updates = [s for s in statements if "UPDATE `Invoice`" in s]
+    assert len(updates) == 1
+    assert cache.stats.invalidations == 1
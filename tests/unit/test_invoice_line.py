@@ -1,5 +1,6 @@
 # tests/unit/test_invoice_line.py
 # Unit тесты для invoice line value object.
+from dataclasses import FrozenInstanceError
 from decimal import Decimal
 
 import pytest
@@ -10,7 +11,14 @@ from billing_system.domain.errors import (
     InvalidInvoiceLineError,
     InvalidQuantityError,
 )
-from billing_system.domain.value_objects import Currency, InvoiceLine, Money
+from billing_system.domain.value_objects import (
+    QUANTITY_DECIMAL_PLACES,
+    Currency,
+    Discount,
+    InvoiceLine,
+    Money,
+    Tax,
+)
 
 
 def test_empty_description() -> None:
@@ -57,6 +65,29 @@ def test_str() -> None:
     assert str(line) == "Фруктовая корзина: 20 * 50.00 EUR = 1000.00 EUR"
 
 
+def test_value_objects_are_slotted() -> None:
+    mon = Money(Decimal(50), Currency.EUR)
+    line = InvoiceLine("Яблоко", mon, Decimal(2))
+    for vo in (mon, line, Tax(mon), Discount(mon)):
+        assert not hasattr(vo, "__dict__")
+
+    with pytest.raises(FrozenInstanceError):
+        line.quantity = Decimal(3)  # type: ignore[misc]
+
+    with pytest.raises(FrozenInstanceError):
+        mon.minor = 1  # type: ignore[misc]
+
+    same = InvoiceLine(
+        "Яблоко",
+        Money(Decimal("50.00"), mon.currency),
+        Decimal(2),
+    )
+    assert line == same
+    assert hash(line) == hash(same)
+    assert Tax(mon) == Tax(same.unit_price)
+    assert hash(Discount(mon)) == hash(Discount(same.unit_price))
+
+
 @given(
     st.decimals(
         allow_infinity=False,
@@ -69,6 +100,7 @@ def test_str() -> None:
         allow_nan=False,
         min_value=Decimal("1e-4"),
         max_value=Decimal("1e4"),
+        places=QUANTITY_DECIMAL_PLACES,
     ),
 )
 def test_correct_line_total(price: Decimal, count: Decimal) -> None:
@@ -79,3 +111,24 @@ def test_correct_line_total(price: Decimal, count: Decimal) -> None:
         count,
     )
     assert line.line_total == price_money * count
+
+
+def test_quantity_precision() -> None:
+    price = Money(Decimal(1), Currency.EUR)
+    assert InvoiceLine("Соль", price, Decimal("0.000001")).quantity
+    with pytest.raises(InvalidQuantityError):
+        InvoiceLine("Соль", price, Decimal("0.0000001"))
+
+
+@pytest.mark.parametrize("quantity", ["1E+30", "1E+13", "NaN", "Infinity"])
+def test_quantity_out_of_range(quantity: str) -> None:
+    price = Money(Decimal(1), Currency.EUR)
+    with pytest.raises(InvalidQuantityError):
+        InvoiceLine("Соль", price, Decimal(quantity))
+
+
+def test_quantity_trailing_zeros() -> None:
+    price = Money(Decimal(1), Currency.EUR)
+    line = InvoiceLine("Соль", price, Decimal("1.5000000"))
+    assert line.quantity == Decimal("1.5")
+    assert InvoiceLine("Соль", price, Decimal("1E+12")).quantity
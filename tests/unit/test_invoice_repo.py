@@ -6,17 +6,28 @@ import pytest
 
 from billing_system.application.dto import (
     CreateInvoiceRequest,
+    GetInvoiceRequest,
     InvoiceAddLineRequest,
     IssueInvoiceRequest,
+    VoidInvoiceRequest,
 )
-from billing_system.application.errors import InvoiceNotFoundError
+from billing_system.application.errors import (
+    InvoiceNotFoundError,
+    StorageBusyError,
+)
+from billing_system.application.protocols import UnitOfWork
 from billing_system.application.usecase import (
     CreateInvoice,
+    GetInvoice,
     InvoiceAddLine,
     IssueInvoice,
+    RetryPolicy,
+    VoidInvoice,
 )
+from billing_system.domain.aggregates import Invoice
 from billing_system.domain.errors import (
     CurrencyMismatchError,
+    InvoiceVersionConflictError,
 )
 from billing_system.domain.value_objects import (
     Currency,
@@ -26,6 +37,9 @@ from billing_system.domain.value_objects import (
 )
 from tests.fake_clock import FakeClock
 from tests.fake_uow import FakeUnitOfWork
+from tests.invoice_in_memory import InvoiceRepoInMemo
+
+ATTEMPTS = 3
 
 
 def test_create_invoice() -> None:
@@ -89,6 +103,18 @@ def test_find_non_existing_invoice() -> None:
         uow.invoices.get(InvoiceId(uuid4()))
 
 
+def test_get_many_reports_missing() -> None:
+    uow = FakeUnitOfWork()
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid4()))
+    missing = InvoiceId(uuid4())
+    uow.invoices.add(invoice)
+    batch = uow.invoices.get_many(
+        [missing, invoice.invoice_id, invoice.invoice_id],
+    )
+    assert batch.invoices == {invoice.invoice_id: invoice}
+    assert batch.missing == (missing,)
+
+
 def test_invoice_total_matches() -> None:
     uow = FakeUnitOfWork()
     clock = FakeClock()
@@ -115,3 +141,143 @@ def test_invoice_total_matches() -> None:
     mon1 = Money(Decimal("1.5"), Currency.EUR) * Decimal("2.0")
     mon2 = Money(Decimal("5.3"), Currency.EUR) * Decimal("1.0")
     assert invoice.total == mon1 + mon2
+
+
+def test_get_invoice_reads_through_read_only_uow() -> None:
+    class SpyUnitOfWork(FakeUnitOfWork):
+        def __init__(self) -> None:
+            super().__init__()
+            self.read_only_calls = 0
+
+        def read_only(self) -> UnitOfWork:
+            self.read_only_calls += 1
+            return self
+
+    uid = uuid4()
+    uow = SpyUnitOfWork()
+    CreateInvoice(uow)(CreateInvoiceRequest(id=uid, currency="EUR"))
+    assert uow.read_only_calls == 0
+    assert GetInvoice(uow)(GetInvoiceRequest(invoice_id=uid)).invoice_id == uid
+    assert uow.read_only_calls == 1
+
+
+def test_commands_return_read_model() -> None:
+    uow = FakeUnitOfWork()
+    clock = FakeClock()
+    uid = uuid4()
+    get = GetInvoice(uow)
+    req = GetInvoiceRequest(invoice_id=uid)
+
+    created = CreateInvoice(uow)(CreateInvoiceRequest(id=uid, currency="EUR"))
+    assert created == get(req)
+
+    added = InvoiceAddLine(uow)(
+        InvoiceAddLineRequest(
+            invoice_id=uid,
+            amount=Decimal("1.5"),
+            quantity=Decimal("2.0"),
+            description="Печенье",
+        ),
+    )
+    assert added == get(req)
+    assert added.subtotal == Decimal("3.00")
+
+    issued = IssueInvoice(uow, clock)(IssueInvoiceRequest(invoice_id=uid))
+    assert issued == get(req)
+    assert issued.status == InvoiceStatus.ISSUED.value
+
+    voided = VoidInvoice(uow, clock)(
+        VoidInvoiceRequest(invoice_id=uid, idempotency_key="key"),
+    )
+    assert voided == get(req)
+    assert voided.status == InvoiceStatus.VOID.value
+
+
+class ConflictingRepo(InvoiceRepoInMemo):
+    """Репозиторий, первые conflicts сохранений которого конфликтуют."""
+
+    def __init__(self, conflicts: int) -> None:
+        super().__init__()
+        self.conflicts = conflicts
+        self.saves = 0
+
+    def save(self, invoice: Invoice) -> None:
+        self.saves += 1
+        if self.saves <= self.conflicts:
+            raise InvoiceVersionConflictError
+        super().save(invoice)
+
+
+def make_conflicting_uow(conflicts: int) -> tuple[FakeUnitOfWork, InvoiceId]:
+    uow = FakeUnitOfWork()
+    uow.invoices = ConflictingRepo(conflicts)
+    uid = uuid4()
+    CreateInvoice(uow)(CreateInvoiceRequest(id=uid, currency="EUR"))
+    return uow, InvoiceId(uid)
+
+
+def test_retry_on_version_conflict() -> None:
+    uow, uid = make_conflicting_uow(conflicts=1)
+    req = VoidInvoiceRequest(invoice_id=uid, idempotency_key="key")
+    read = VoidInvoice(uow, FakeClock())(req)
+    assert read.status == InvoiceStatus.VOID.value
+    assert isinstance(uow.invoices, ConflictingRepo)
+    assert uow.invoices.saves == 1 + 1
+
+
+def test_retry_is_bounded() -> None:
+    uow, uid = make_conflicting_uow(conflicts=10)
+    req = VoidInvoiceRequest(invoice_id=uid, idempotency_key="key")
+    with pytest.raises(InvoiceVersionConflictError):
+        VoidInvoice(uow, FakeClock(), RetryPolicy(attempts=ATTEMPTS))(req)
+    assert isinstance(uow.invoices, ConflictingRepo)
+    assert uow.invoices.saves == ATTEMPTS
+
+
+def test_retry_backoff_and_metrics() -> None:
+    delays: list[float] = []
+    policy = RetryPolicy(
+        attempts=4,
+        backoff=0.01,
+        max_backoff=0.03,
+        sleep=delays.append,
+        jitter=lambda: 0.5,
+    )
+    uow, uid = make_conflicting_uow(conflicts=3)
+    req = VoidInvoiceRequest(invoice_id=uid, idempotency_key="key")
+    VoidInvoice(uow, FakeClock(), policy)(req)
+    assert delays == [0.005, 0.01, 0.015]
+
+    stats = policy.metrics.stats
+    assert (stats.calls, stats.retries, stats.exhausted) == (1, 3, 0)
+    assert stats.by_error == {"InvoiceVersionConflictError": 3}
+    assert stats.backoff == pytest.approx(sum(delays))
+
+
+class BusyRepo(InvoiceRepoInMemo):
+    """Репозиторий, первые busy добавлений которого упираются в блокировку."""
+
+    def __init__(self, busy: int) -> None:
+        super().__init__()
+        self.busy = busy
+        self.adds = 0
+
+    def add(self, invoice: Invoice) -> None:
+        self.adds += 1
+        if self.adds <= self.busy:
+            raise StorageBusyError
+        super().add(invoice)
+
+
+def test_create_retries_busy_storage() -> None:
+    repo = BusyRepo(busy=2)
+    uow = FakeUnitOfWork()
+    uow.invoices = repo
+    policy = RetryPolicy(attempts=3, sleep=lambda _: None)
+    uid = uuid4()
+    read = CreateInvoice(uow, policy)(
+        CreateInvoiceRequest(id=uid, currency="EUR"),
+    )
+    assert read.invoice_id == uid
+    assert repo.adds == policy.attempts
+    assert policy.metrics.stats.by_error == {"StorageBusyError": repo.busy}
@@ -1,8 +1,9 @@
 # tests/unit/test_invoice_sql_repo.py
 import datetime
+import sqlite3
 from decimal import Decimal
 from pathlib import Path
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -19,6 +20,7 @@ from billing_system.application.usecase import CreateInvoice, InvoiceAddLine
 from billing_system.application.usecase.get_invoices import GetInvoice
 from billing_system.application.usecase.issue_invoice import IssueInvoice
 from billing_system.application.usecase.void_invoice import VoidInvoice
+from billing_system.domain.aggregates import Invoice
 from billing_system.domain.errors.invoice_not_found import InvoiceNotFoundError
 from billing_system.domain.errors.invoice_not_unique import (
     InvoiceNotUniqueError,
@@ -26,6 +28,9 @@ from billing_system.domain.errors.invoice_not_unique import (
 from billing_system.domain.errors.invoice_operation import (
     InvoiceOperationError,
 )
+from billing_system.domain.errors.invoice_version_conflict import (
+    InvoiceVersionConflictError,
+)
 from billing_system.domain.value_objects import (
     Currency,
     Discount,
@@ -42,9 +47,13 @@ from billing_system.infrastructure.errors.no_connection import (
     NoConnectionError,
 )
 from billing_system.infrastructure.protocols.sqlite_uow import SqliteUnitOfWork
+from billing_system.infrastructure.repositories import invoice_sqlite_repo
 from billing_system.infrastructure.repositories.invoice_sqlite_repo import (
+    MAX_LINE_PRODUCT,
+    line_values,
     read_discount,
     read_tax,
+    rehydrate_line,
 )
 from tests.fake_clock import FakeClock
 
@@ -220,3 +229,508 @@ def test_empty_result_on_exit(tmp_path: Path) -> None:
     f = tmp_path / "db.sqlite"
     uow = SqliteUnitOfWork(f)
     uow.__exit__(None, None, None)
+
+
+def test_get_keeps_line_order_and_text(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = uuid4()
+    descriptions = ['Печенье "Юбилейное"', "Tab\tи \\ слэш", "🍌", "Чай"]
+    CreateInvoice(uow)(CreateInvoiceRequest(id=uid, currency="KWD"))
+    for i, description in enumerate(descriptions, start=1):
+        InvoiceAddLine(uow)(
+            InvoiceAddLineRequest(
+                invoice_id=uid,
+                amount=Decimal("1.234") * i,
+                quantity=Decimal("0.125"),
+                description=description,
+            ),
+        )
+
+    with uow:
+        invoice = uow.invoices.get(InvoiceId(uid))
+        empty = uuid4()
+        uow.invoices.add(
+            Invoice(currency=Currency.EUR, invoice_id=InvoiceId(empty)),
+        )
+        assert uow.invoices.get(InvoiceId(empty)).lines == ()
+
+    assert [line.description for line in invoice.lines] == descriptions
+    assert invoice.lines[-1].unit_price == Money(
+        Decimal("4.936"),
+        Currency.KWD,
+    )
+    assert invoice.lines[0].quantity == Decimal("0.125")
+
+
+def test_quantity_keeps_its_exponent(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = uuid4()
+    CreateInvoice(uow)(CreateInvoiceRequest(id=uid, currency="EUR"))
+    for quantity in ("1.50", "20", "0.125000"):
+        added = InvoiceAddLine(uow)(
+            InvoiceAddLineRequest(
+                invoice_id=uid,
+                amount=Decimal(1),
+                quantity=Decimal(quantity),
+                description="Товар",
+            ),
+        )
+    read = GetInvoice(uow)(GetInvoiceRequest(invoice_id=uid))
+    quantities = [str(line.quantity) for line in read.lines]
+    assert quantities == ["1.50", "20", "0.125000"]
+    assert [str(line.quantity) for line in added.lines] == quantities
+
+    # Строчки без показателя (до v008) читаются без хвостовых нулей.
+    conn = sqlite3.connect(f)
+    with conn:
+        conn.execute("UPDATE InvoiceLine SET quantity_exponent = NULL;")
+    conn.close()
+    read = GetInvoice(uow)(GetInvoiceRequest(invoice_id=uid))
+    assert [str(line.quantity) for line in read.lines] == [
+        "1.5",
+        "20",
+        "0.125",
+    ]
+
+
+def test_get_orders_lines_by_position(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uid = InvoiceId(uuid4())
+    uow = SqliteUnitOfWork(f)
+    with uow:
+        uow.invoices.add(Invoice(currency=Currency.EUR, invoice_id=uid))
+    # Строчки вставлены в обратном порядке: rowid не совпадает с position.
+    conn = sqlite3.connect(f)
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO InvoiceLine (invoice_id, position, description,
+            unit_price_minor, quantity_scaled) VALUES (?, ?, ?, 100, 1000000);
+            """,
+            [(uid.bytes, p, d) for p, d in ((2, "C"), (0, "A"), (1, "B"))],
+        )
+    conn.close()
+
+    with uow:
+        invoice = uow.invoices.get(uid)
+    assert [line.description for line in invoice.lines] == ["A", "B", "C"]
+
+
+def line_rows(f: Path) -> list[tuple[str, int]]:
+    conn = sqlite3.connect(f)
+    try:
+        q = "SELECT description, position FROM InvoiceLine ORDER BY position;"
+        return conn.execute(q).fetchall()
+    finally:
+        conn.close()
+
+
+def test_save_appends_only_new_lines(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = InvoiceId(uuid4())
+    price = Money(Decimal("1.00"), Currency.EUR)
+    with uow:
+        invoice = Invoice(currency=Currency.EUR, invoice_id=uid)
+        invoice.add_line(InvoiceLine("A", price, Decimal(1)))
+        uow.invoices.add(invoice)
+
+    with uow:
+        invoice = uow.invoices.get(uid)
+        invoice.add_line(InvoiceLine("B", price, Decimal(1)))
+        invoice.add_line(InvoiceLine("C", price, Decimal(1)))
+        uow.invoices.save(invoice)
+        uow.invoices.save(invoice)  # повторное сохранение ничего не пишет
+
+    # Строчки, записанные ранее, не удаляются и не вставляются заново.
+    assert line_rows(f) == [("A", 0), ("B", 1), ("C", 1 + 1)]
+
+
+def test_save_without_get_continues_positions(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = InvoiceId(uuid4())
+    price = Money(Decimal("1.00"), Currency.EUR)
+    with uow:
+        invoice = Invoice(currency=Currency.EUR, invoice_id=uid)
+        invoice.add_line(InvoiceLine("A", price, Decimal(1)))
+        uow.invoices.add(invoice)
+
+    with uow:
+        invoice.add_line(InvoiceLine("B", price, Decimal(1)))
+        uow.invoices.save(invoice)
+
+    assert line_rows(f) == [("A", 0), ("B", 1)]
+
+
+def test_legacy_lines_get_positions(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uid = str(uuid4())
+    conn = sqlite3.connect(f)
+    conn.executescript(
+        """
+        CREATE TABLE `Invoice` (
+            id TEXT PRIMARY KEY, currency TEXT NOT NULL,
+            status TEXT NOT NULL, tax_amount_minor INTEGER,
+            discount_amount_minor INTEGER, issued_at INTEGER,
+            paid_at INTEGER, voided_at INTEGER,
+            payment_idempotency_key TEXT, void_idempotency_key TEXT
+        );
+        CREATE TABLE `InvoiceLine` (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            invoice_id TEXT NOT NULL, description TEXT,
+            unit_price_minor INTEGER NOT NULL, quantity TEXT NOT NULL,
+            FOREIGN KEY (invoice_id) REFERENCES Invoice(id)
+        );
+        """,
+    )
+    conn.execute(
+        "INSERT INTO Invoice (id, currency, status) VALUES (?, ?, ?);",
+        (uid, "EUR", "DRAFT"),
+    )
+    conn.executemany(
+        """
+        INSERT INTO InvoiceLine (invoice_id, description,
+        unit_price_minor, quantity) VALUES (?, ?, ?, ?);
+        """,
+        [(uid, "A", 100, "1"), (uid, "B", 200, "2")],
+    )
+    conn.commit()
+    conn.close()
+
+    uow = SqliteUnitOfWork(f)
+    with uow:
+        invoice = uow.invoices.get(InvoiceId(UUID(uid)))
+    assert [line.description for line in invoice.lines] == ["A", "B"]
+    assert line_rows(f) == [("A", 0), ("B", 1)]
+
+
+def test_save_writes_only_changes(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = uuid4()
+    clock = FakeClock()
+    CreateInvoice(uow)(CreateInvoiceRequest(id=uid, currency="EUR"))
+    VoidInvoice(uow, clock)(
+        VoidInvoiceRequest(invoice_id=uid, idempotency_key="key"),
+    )
+
+    # Повтор аннулирования с тем же ключом ничего не пишет в бд.
+    with uow:
+        invoice = uow.invoices.get(InvoiceId(uid))
+        invoice.void(clock, "key")
+        assert uow.conn is not None
+        before = uow.conn.total_changes
+        uow.invoices.save(invoice)
+        assert uow.conn.total_changes == before
+
+    with uow:
+        invoice = uow.invoices.get(InvoiceId(uid))
+    assert invoice.void_idempotency_key == "key"
+    assert invoice.status == InvoiceStatus.VOID
+
+
+def test_identity_map(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = InvoiceId(uuid4())
+    with uow:
+        invoice = Invoice(Currency.EUR, uid)
+        uow.invoices.add(invoice)
+        assert uow.invoices.get(uid) is invoice
+
+    with uow:
+        first = uow.invoices.get(uid)
+        assert uow.invoices.get(uid) is first
+        # Изменение без save сбрасывается на commit.
+        first.set_tax(Tax(Money(Decimal(1), Currency.EUR)))
+
+    with uow:
+        loaded = uow.invoices.get(uid)
+        assert loaded is not first
+        assert loaded.tax == Tax(Money(Decimal(1), Currency.EUR))
+
+
+def test_identity_map_cleared_on_rollback(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = uuid4()
+    CreateInvoice(uow)(CreateInvoiceRequest(id=uid, currency="EUR"))
+
+    def change_and_fail() -> None:
+        with uow:
+            invoice = uow.invoices.get(InvoiceId(uid))
+            invoice.set_tax(Tax(Money(Decimal(1), Currency.EUR)))
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        change_and_fail()
+
+    with uow:
+        assert uow.invoices.get(InvoiceId(uid)).tax is None
+
+
+def test_save_bumps_version(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = InvoiceId(uuid4())
+    with uow:
+        uow.invoices.add(Invoice(Currency.EUR, uid))
+
+    with uow:
+        invoice = uow.invoices.get(uid)
+        assert invoice.version == 0
+        invoice.set_tax(Tax(Money(Decimal(1), Currency.EUR)))
+        uow.invoices.save(invoice)
+        # Новая версия применяется к счету только после commit.
+        assert invoice.version == 0
+        # Повторная запись без новых изменений версию не меняет.
+        uow.invoices.save(invoice)
+    assert invoice.version == 1
+    assert invoice.pending_changes().is_empty
+
+    with uow:
+        assert uow.invoices.get(uid).version == 1
+
+
+def test_failed_commit_keeps_invoice_dirty(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = InvoiceId(uuid4())
+    with uow:
+        uow.invoices.add(Invoice(Currency.EUR, uid))
+
+    def save_and_fail_commit() -> None:
+        with uow:
+            assert uow.conn is not None
+            invoice = uow.invoices.get(uid)
+            invoice.set_tax(Tax(Money(Decimal(1), Currency.EUR)))
+            uow.invoices.save(invoice)
+            # Отложенная проверка внешних ключей: COMMIT падает.
+            uow.conn.execute("PRAGMA defer_foreign_keys = ON;")
+            uow.conn.execute(
+                """
+                INSERT INTO InvoiceLine (invoice_id, position, description,
+                unit_price_minor, quantity_scaled) VALUES (?, 0, 'A', 1, 1);
+                """,
+                (uuid4().bytes,),
+            )
+            failed.append(invoice)
+            uow.commit()
+
+    failed: list[Invoice] = []
+    with pytest.raises(sqlite3.IntegrityError):
+        save_and_fail_commit()
+    [invoice] = failed
+    assert invoice.version == 0
+    assert invoice.pending_changes().fields == {"tax"}
+    with uow:
+        uow.invoices.save(invoice)
+    with uow:
+        stored = uow.invoices.get(uid)
+    assert stored.version == 1
+    assert stored.tax == invoice.tax
+
+
+def test_stale_save_conflicts(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = InvoiceId(uuid4())
+    with uow:
+        uow.invoices.add(Invoice(Currency.EUR, uid))
+    with uow:
+        stale = uow.invoices.get(uid)
+
+    with uow:
+        fresh = uow.invoices.get(uid)
+        fresh.set_tax(Tax(Money(Decimal(1), Currency.EUR)))
+
+    def save_stale() -> None:
+        with uow:
+            stale.set_discount(Discount(Money(Decimal(1), Currency.EUR)))
+            uow.invoices.save(stale)
+
+    with pytest.raises(InvoiceVersionConflictError):
+        save_stale()
+
+    with uow:
+        invoice = uow.invoices.get(uid)
+    assert invoice.discount is None
+    assert invoice.tax == Tax(Money(Decimal(1), Currency.EUR))
+
+
+def test_ids_stored_as_16_byte_blobs(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    uid = InvoiceId(uuid4())
+    with uow:
+        invoice = Invoice(Currency.EUR, uid)
+        invoice.add_line(
+            InvoiceLine("A", Money(Decimal(1), Currency.EUR), Decimal(1)),
+        )
+        uow.invoices.add(invoice)
+
+    conn = sqlite3.connect(f)
+    try:
+        q = "SELECT typeof(id), length(id) FROM Invoice;"
+        assert conn.execute(q).fetchall() == [("blob", len(uid.bytes))]
+        q = "SELECT typeof(invoice_id), invoice_id FROM InvoiceLine;"
+        assert conn.execute(q).fetchall() == [("blob", uid.bytes)]
+    finally:
+        conn.close()
+
+
+def draft_with_lines(
+    currency: Currency,
+    lines: list[tuple[str, str]],
+) -> Invoice:
+    invoice = Invoice(currency=currency, invoice_id=InvoiceId(uuid4()))
+    for price, qty in lines:
+        invoice.add_line(
+            InvoiceLine(
+                "Товар",
+                Money(Decimal(price), currency),
+                Decimal(qty),
+            ),
+        )
+    return invoice
+
+
+@pytest.mark.parametrize(
+    "currency, lines",
+    [
+        (Currency.EUR, []),
+        (Currency.EUR, [("0.01", "0.5"), ("0.01", "0.49"), ("0.03", "0.5")]),
+        (Currency.EUR, [("-0.01", "0.5"), ("-0.03", "0.5"), ("1", "0.125")]),
+        (Currency.KWD, [("1.234", "0.000001"), ("999.999", "123.456789")]),
+        (Currency.JPY, [("7", "0.071429"), ("12345", "3")]),
+    ],
+)
+def test_sql_subtotal_matches_domain(
+    tmp_path: Path,
+    currency: Currency,
+    lines: list[tuple[str, str]],
+) -> None:
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite")
+    invoice = draft_with_lines(currency, lines)
+    with uow:
+        uow.invoices.add(invoice)
+        uow.commit()
+
+    with uow:
+        assert uow.invoices.subtotal(invoice.invoice_id) == invoice.subtotal
+
+
+def test_sql_subtotals_of_many(tmp_path: Path) -> None:
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite")
+    invoices = [
+        draft_with_lines(Currency.EUR, [("1.5", str(i))] * i)
+        for i in range(1, 10)
+    ]
+    missing = InvoiceId(uuid4())
+    with uow:
+        for invoice in invoices:
+            uow.invoices.add(invoice)
+        uow.commit()
+
+    with uow:
+        # Несохраненная строчка учитывается: subtotals делает flush.
+        uow.invoices.get(invoices[0].invoice_id).add_line(
+            InvoiceLine("Еще", Money(Decimal(1), Currency.EUR), Decimal(1)),
+        )
+        subtotals = uow.invoices.subtotals(
+            [*(i.invoice_id for i in invoices), missing],
+        )
+        first = uow.invoices.get(invoices[0].invoice_id)
+        with pytest.raises(InvoiceNotFoundError):
+            uow.invoices.subtotal(missing)
+
+    assert subtotals == {i.invoice_id: i.subtotal for i in invoices} | {
+        first.invoice_id: first.subtotal,
+    }
+
+
+def test_line_overflowing_int64_is_rejected() -> None:
+    line = InvoiceLine(
+        "Товар",
+        Money.from_minor(10**13, Currency.EUR),
+        Decimal(10**6),
+    )
+    with pytest.raises(ValueError, match="int64"):
+        line_values(line)
+
+
+@pytest.mark.parametrize("sign", [1, -1])
+def test_line_product_at_int64_edge(tmp_path: Path, sign: int) -> None:
+    def line(minor: int) -> InvoiceLine:
+        price = Money.from_minor(sign * minor, Currency.JPY)
+        return InvoiceLine("Товар", price, Decimal("0.000001"))
+
+    # Цена * 10**6 * количество = 1 * цена: на границе sql не уходит в REAL.
+    with pytest.raises(ValueError, match="int64"):
+        line_values(line(MAX_LINE_PRODUCT + 1))
+    invoice = Invoice(Currency.JPY, InvoiceId(uuid4()))
+    invoice.add_line(line(MAX_LINE_PRODUCT))
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite")
+    with uow:
+        uow.invoices.add(invoice)
+        assert uow.invoices.subtotal(invoice.invoice_id) == invoice.subtotal
+
+
+def test_get_many_in_chunks(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(invoice_sqlite_repo, "ID_CHUNK_SIZE", 1 + 1)
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite")
+    invoices = [
+        draft_with_lines(Currency.EUR, [(str(i), "0.5")] * i) for i in range(5)
+    ]
+    invoices.append(draft_with_lines(Currency.JPY, [("7", "3")]))
+    with uow:
+        for invoice in invoices:
+            uow.invoices.add(invoice)
+        uow.commit()
+
+    missing = [InvoiceId(uuid4()), InvoiceId(uuid4())]
+    ids = [
+        invoices[3].invoice_id,
+        missing[0],
+        *(i.invoice_id for i in invoices),
+    ]
+    with uow:
+        known = uow.invoices.get(invoices[1].invoice_id)
+        batch = uow.invoices.get_many([*ids, missing[1], ids[0]])
+        assert batch.invoices[known.invoice_id] is known
+        assert (
+            uow.invoices.get(invoices[4].invoice_id)
+            is batch.invoices[invoices[4].invoice_id]
+        )
+
+    assert list(batch.invoices) == list(dict.fromkeys(ids[:1] + ids[2:]))
+    assert batch.missing == tuple(missing)
+    for invoice in invoices:
+        loaded = batch.invoices[invoice.invoice_id]
+        assert loaded.lines == invoice.lines
+        assert loaded.currency == invoice.currency
+        assert loaded.subtotal == invoice.subtotal
+        assert loaded.version == invoice.version
+
+
+def test_rehydrate_matches_constructor() -> None:
+    price = Money(Decimal("1.50"), Currency.EUR)
+    line = rehydrate_line("Яблоко", price, Decimal("2.5"))
+    assert line == InvoiceLine("Яблоко", price, Decimal("2.5"))
+    assert line.line_total == price * Decimal("2.5")
+
+
+def test_rehydrate_skips_validation() -> None:
+    # Доверенный путь для репозиториев: инварианты не проверяются.
+    line = rehydrate_line(
+        "",
+        Money(Decimal(1), Currency.EUR),
+        Decimal(0),
+    )
+    assert line.description == ""
@@ -0,0 +1,195 @@
+# tests/unit/test_invoice_totals.py
+# Unit тесты для денормализованных сумм счета и их сверки.
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from billing_system.domain.aggregates import Invoice
+from billing_system.domain.errors import InvoiceNotFoundError
+from billing_system.domain.value_objects import (
+    Currency,
+    Discount,
+    InvoiceId,
+    InvoiceLine,
+    InvoiceStatus,
+    Money,
+    Tax,
+)
+from billing_system.infrastructure.consistency import (
+    check_database,
+    check_invoice_totals,
+)
+from billing_system.infrastructure.consistency.__main__ import main
+from billing_system.infrastructure.migrations import migrate
+from billing_system.infrastructure.migrations.versions import MIGRATIONS
+from billing_system.infrastructure.migrations.versions.v007_invoice_totals import (  # noqa: E501
+    MIGRATION as V007,
+)
+from billing_system.infrastructure.protocols.sqlite_uow import SqliteUnitOfWork
+from tests.fake_clock import FakeClock
+
+PAGE = 3
+
+
+def eur(amount: str) -> Money:
+    return Money(Decimal(amount), Currency.EUR)
+
+
+def line(price: str, qty: str = "1") -> InvoiceLine:
+    return InvoiceLine("Товар", eur(price), Decimal(qty))
+
+
+def stored_totals(f: Path, invoice_id: InvoiceId) -> tuple[int, int, int]:
+    conn = sqlite3.connect(f)
+    row: tuple[int, int, int] = conn.execute(
+        """
+        SELECT subtotal_minor, total_minor, line_count FROM Invoice
+        WHERE id = ?;
+        """,
+        (invoice_id.bytes,),
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def test_add_and_save_maintain_totals(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid4()))
+    invoice.add_line(line("1.25", "2"))
+    with uow:
+        uow.invoices.add(invoice)
+        uow.commit()
+    assert stored_totals(f, invoice.invoice_id) == (250, 250, 1)
+
+    with uow:
+        loaded = uow.invoices.get(invoice.invoice_id)
+        loaded.add_line(line("0.01", "0.5"))
+        loaded.set_tax(Tax(eur("0.5")))
+        loaded.set_discount(Discount(eur("0.2")))
+        uow.commit()
+    assert stored_totals(f, invoice.invoice_id) == (251, 281, 1 + 1)
+    assert check_invoice_totals(sqlite3.connect(f)) == []
+
+
+def test_header_matches_aggregate(tmp_path: Path) -> None:
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite")
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid4()))
+    invoice.add_line(line("3.33", "3"))
+    invoice.set_tax(Tax(eur("1")))
+    with uow:
+        uow.invoices.add(invoice)
+        uow.commit()
+
+    with uow:
+        header = uow.invoices.header(invoice.invoice_id)
+        with pytest.raises(InvoiceNotFoundError):
+            uow.invoices.header(InvoiceId(uuid4()))
+    assert header.invoice_id == invoice.invoice_id
+    assert header.status is InvoiceStatus.DRAFT
+    assert header.subtotal == invoice.subtotal
+    assert header.total == invoice.total
+    assert header.line_count == len(invoice.lines)
+    assert header.version == invoice.version
+
+
+def test_headers_page_by_status(tmp_path: Path) -> None:
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite")
+    invoices = [Invoice(Currency.EUR, InvoiceId(uuid4())) for _ in range(5)]
+    with uow:
+        for invoice in invoices:
+            invoice.add_line(line("1"))
+            uow.invoices.add(invoice)
+        uow.commit()
+    with uow:
+        # Несохраненный выпуск виден: headers делает flush.
+        uow.invoices.get(invoices[0].invoice_id).issue(FakeClock())
+        issued = uow.invoices.headers(status=InvoiceStatus.ISSUED)
+        first = uow.invoices.headers(limit=PAGE)
+        rest = uow.invoices.headers(after=first[-1].invoice_id)
+
+    assert [h.invoice_id for h in issued] == [invoices[0].invoice_id]
+    assert issued[0].issued_at is not None
+    ids = [h.invoice_id for h in first + rest]
+    assert ids == sorted(
+        (i.invoice_id for i in invoices),
+        key=lambda i: i.bytes,
+    )
+
+
+def test_header_queries_do_not_read_lines(tmp_path: Path) -> None:
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite")
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid4()))
+    invoice.add_line(line("1"))
+    with uow:
+        uow.invoices.add(invoice)
+        uow.commit()
+
+    with uow:
+        assert uow.conn is not None
+        statements: list[str] = []
+        uow.conn.set_trace_callback(statements.append)
+        uow.invoices.header(invoice.invoice_id)
+        uow.invoices.headers(status=InvoiceStatus.DRAFT)
+        uow.conn.set_trace_callback(None)
+    assert statements
+    assert not any("InvoiceLine" in s for s in statements)
+
+
+def test_check_and_fix(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    invoice = Invoice(Currency.EUR, InvoiceId(uuid4()))
+    invoice.add_line(line("2"))
+    with uow:
+        uow.invoices.add(invoice)
+        uow.commit()
+    conn = sqlite3.connect(f)
+    with conn:
+        conn.execute("UPDATE Invoice SET subtotal_minor = 1, line_count = 7;")
+    conn.close()
+
+    assert main([str(f)]) == 1
+    out = capsys.readouterr().out
+    assert str(invoice.invoice_id) in out
+    assert "(1, 200, 7) != (200, 200, 1)" in out
+
+    assert main([str(f), "--fix"]) == 0
+    assert stored_totals(f, invoice.invoice_id) == (200, 200, 1)
+    assert check_database(f) == []
+    assert main([str(f)]) == 0
+
+
+def test_migration_backfills_totals(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uid = uuid4()
+    empty = uuid4()
+    conn = sqlite3.connect(f)
+    migrate(conn, [m for m in MIGRATIONS if m.version < V007.version])
+    conn.executemany(
+        """
+        INSERT INTO Invoice (id, currency, status, tax_amount_minor,
+        discount_amount_minor) VALUES (?, 'EUR', 'DRAFT', 10, 5);
+        """,
+        [(uid.bytes,), (empty.bytes,)],
+    )
+    conn.executemany(
+        """
+        INSERT INTO InvoiceLine (invoice_id, position, description,
+        unit_price_minor, quantity_scaled) VALUES (?, ?, 'A', ?, ?);
+        """,
+        [(uid.bytes, 0, 101, 500_000), (uid.bytes, 1, -3, 1_500_000)],
+    )
+    conn.commit()
+
+    migrate(conn)
+    assert check_invoice_totals(conn) == []
+    conn.close()
+    assert stored_totals(f, InvoiceId(uid)) == (46, 51, 1 + 1)
+    assert stored_totals(f, InvoiceId(empty)) == (0, 5, 0)
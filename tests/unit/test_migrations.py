@@ -0,0 +1,230 @@
+# tests/unit/test_migrations.py
+# Unit тесты для раннера миграций схемы sqlite.
+import sqlite3
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from billing_system.infrastructure.errors import MigrationBlockedError
+from billing_system.infrastructure.migrations import (
+    SCHEMA_VERSION,
+    Migration,
+    check_migrations,
+    migrate,
+    migrate_database,
+    schema_version,
+)
+from billing_system.infrastructure.migrations.__main__ import main
+from billing_system.infrastructure.migrations.versions import (
+    MIGRATIONS,
+    v004_clustered_lines,
+)
+from billing_system.infrastructure.migrations.versions.v005_binary_id import (
+    MIGRATION as V005,
+)
+from billing_system.infrastructure.migrations.versions.v006_scaled_quantity import (  # noqa: E501
+    MIGRATION as V006,
+)
+from billing_system.infrastructure.protocols.sqlite_uow import SqliteUnitOfWork
+from billing_system.infrastructure.repositories import InvoiceSqliteRepository
+
+
+def tables(conn: sqlite3.Connection) -> set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
+    return {row[0] for row in rows}
+
+
+def test_fresh_database(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    assert migrate_database(f) == SCHEMA_VERSION
+    conn = sqlite3.connect(f)
+    assert schema_version(conn) == SCHEMA_VERSION
+    assert {"Invoice", "InvoiceLine"} <= tables(conn)
+    conn.close()
+
+
+def test_migrate_is_idempotent(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    migrate_database(f)
+    conn = sqlite3.connect(f)
+    before = conn.total_changes
+    assert migrate(conn) == SCHEMA_VERSION
+    assert conn.total_changes == before
+    assert not conn.in_transaction
+    conn.close()
+
+
+def test_failed_migration_rolls_back() -> None:
+    conn = sqlite3.connect(":memory:")
+
+    def ok(c: sqlite3.Connection) -> None:
+        c.execute("CREATE TABLE `Ok` (id INTEGER);")
+
+    def broken(c: sqlite3.Connection) -> None:
+        c.execute("CREATE TABLE `Partial` (id INTEGER);")
+        raise RuntimeError
+
+    migrations = [
+        Migration(1, "ok", ok),
+        Migration(1 + 1, "broken", broken),
+    ]
+    with pytest.raises(RuntimeError):
+        migrate(conn, migrations)
+    assert schema_version(conn) == 1
+    assert tables(conn) == {"Ok"}
+
+
+def test_repository_does_not_touch_schema() -> None:
+    conn = sqlite3.connect(":memory:")
+    InvoiceSqliteRepository(conn)
+    assert tables(conn) == set()
+
+
+def test_uow_migrates_once(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uow = SqliteUnitOfWork(f)
+    assert not f.exists()
+    with uow:
+        assert uow.conn is not None
+        assert schema_version(uow.conn) == SCHEMA_VERSION
+
+    skip = SqliteUnitOfWork(tmp_path / "other.sqlite", migrate=False)
+    with skip:
+        assert skip.conn is not None
+        assert schema_version(skip.conn) == 0
+
+
+def test_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    f = tmp_path / "db.sqlite"
+    assert main([str(f)]) == 0
+    assert f"{SCHEMA_VERSION}/{SCHEMA_VERSION}" in capsys.readouterr().out
+
+
+def test_lines_are_clustered_by_invoice() -> None:
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    assert v004_clustered_lines.is_without_rowid(conn, "InvoiceLine")
+    plan = " ".join(
+        row[-1]
+        for row in conn.execute(
+            """
+            EXPLAIN QUERY PLAN SELECT description FROM InvoiceLine
+            WHERE invoice_id = ? ORDER BY position;
+            """,
+            ("id",),
+        )
+    )
+    assert "USING PRIMARY KEY (invoice_id=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_text_ids_become_blobs(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    uid = uuid4()
+    conn = sqlite3.connect(f)
+    migrate(conn, [m for m in MIGRATIONS if m.version < V005.version])
+    conn.execute(
+        "INSERT INTO Invoice (id, currency, status) VALUES (?, 'EUR', 'D');",
+        (str(uid),),
+    )
+    conn.execute(
+        """
+        INSERT INTO InvoiceLine (invoice_id, position, description,
+        unit_price_minor, quantity) VALUES (?, 0, 'A', 1, '1');
+        """,
+        (str(uid),),
+    )
+    conn.commit()
+    conn.close()
+
+    assert main([str(f), "--vacuum"]) == 0
+    conn = sqlite3.connect(f)
+    assert conn.execute("SELECT id FROM Invoice;").fetchall() == [
+        (uid.bytes,),
+    ]
+    lines = conn.execute("SELECT invoice_id FROM InvoiceLine;").fetchall()
+    assert lines == [(uid.bytes,)]
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "text, scaled",
+    [("1", 1_000_000), ("2.0", 2_000_000), ("0.125", 125_000), ("1E-6", 1)],
+)
+def test_quantity_becomes_scaled(
+    tmp_path: Path,
+    text: str,
+    scaled: int,
+) -> None:
+    f = tmp_path / "db.sqlite"
+    uid = uuid4()
+    conn = sqlite3.connect(f)
+    migrate(conn, [m for m in MIGRATIONS if m.version < V006.version])
+    conn.execute(
+        "INSERT INTO Invoice (id, currency, status) VALUES (?, 'EUR', 'D');",
+        (uid.bytes,),
+    )
+    conn.execute(
+        """
+        INSERT INTO InvoiceLine (invoice_id, position, description,
+        unit_price_minor, quantity) VALUES (?, 0, 'A', 1, ?);
+        """,
+        (uid.bytes, text),
+    )
+    conn.commit()
+
+    migrate(conn)
+    row = conn.execute(
+        "SELECT quantity_scaled, typeof(quantity_scaled) FROM InvoiceLine;",
+    ).fetchone()
+    assert row == (scaled, "integer")
+    assert v004_clustered_lines.is_without_rowid(conn, "InvoiceLine")
+    conn.close()
+
+
+def test_too_precise_quantity_blocks_migration(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    f = tmp_path / "db.sqlite"
+    uid = uuid4()
+    conn = sqlite3.connect(f)
+    migrate(conn, [m for m in MIGRATIONS if m.version < V006.version])
+    conn.execute(
+        "INSERT INTO Invoice (id, currency, status) VALUES (?, 'EUR', 'D');",
+        (uid.bytes,),
+    )
+    conn.executemany(
+        """
+        INSERT INTO InvoiceLine (invoice_id, position, description,
+        unit_price_minor, quantity) VALUES (?, ?, 'A', 1, ?);
+        """,
+        [(uid.bytes, 0, "0.0000001"), (uid.bytes, 1, "1E+30")],
+    )
+    conn.commit()
+
+    assert check_migrations(conn) == [
+        f"v006: InvoiceLine ({uid.hex}, {position}): количество {quantity}"
+        " не представимо с точностью 1e-6"
+        for position, quantity in ((0, "0.0000001"), (1, "1E+30"))
+    ]
+    with pytest.raises(MigrationBlockedError) as e:
+        migrate(conn)
+    assert e.value.version == V006.version
+    assert len(e.value.problems) == len(check_migrations(conn))
+    assert schema_version(conn) == V005.version
+    assert not conn.in_transaction
+
+    assert main([str(f), "--check"]) == 1
+    assert "0.0000001" in capsys.readouterr().out
+    assert main([str(f)]) == 1
+    assert "1E+30" in capsys.readouterr().err
+
+    # Исправленные строчки переносятся.
+    conn.execute("UPDATE InvoiceLine SET quantity = '0.000001';")
+    conn.commit()
+    assert check_migrations(conn) == []
+    assert migrate(conn) == SCHEMA_VERSION
+    conn.close()
+    assert main([str(f), "--check"]) == 0
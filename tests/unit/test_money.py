@@ -223,12 +223,30 @@ def test_money_accepts_less_places(d: Decimal, places: int) -> None:
     assert mon.amount == dec.quantize(q_exp)
 
 
-def test_money_to_minor() -> None:
-    m = Money(Decimal("1.00"), Currency.EUR)
+@pytest.mark.parametrize(
+    "amount, cur, minor",
+    [
+        (Decimal("1.005"), Currency.EUR, 101),
+        (Decimal("-1.005"), Currency.EUR, -101),
+        (Decimal("1.5"), Currency.JPY, 2),
+    ],
+)
+def test_money_to_minor(amount: Decimal, cur: Currency, minor: int) -> None:
+    # Сумма хранится в минорных единицах, дробный минор невозможен.
+    assert money_to_minor(Money(amount, cur)) == minor
+
+
+def test_from_minor() -> None:
+    mon = Money.from_minor(1536, Currency.EUR)
+    assert mon == Money(Decimal("15.36"), Currency.EUR)
+    assert mon.amount == Decimal("15.36")
+    assert mon.amount.as_tuple().exponent == -Currency.EUR.exp
+    assert str(Money.from_minor(-5, Currency.USD)) == "-0.05 USD"
+    assert str(Money.from_minor(17, Currency.JPY)) == "17 JPY"
 
-    # Специально ломаем инвариант для проверки сейфгарда.
-    object.__setattr__(m, "amount", Decimal("1.005"))  # Экспонента EUR - 2
 
-    msg = "Не числовой размер суммы в миноре."
-    with pytest.raises(ValueError, match=msg):
-        money_to_minor(m)
+def test_money_hash() -> None:
+    mon1 = Money(Decimal(36), Currency.RUB)
+    mon2 = Money(Decimal("36.001"), Currency.RUB)
+    assert hash(mon1) == hash(mon2)
+    assert len({mon1, mon2, Money(Decimal(36), Currency.EUR)}) == 1 + 1
@@ -0,0 +1,100 @@
+# tests/unit/test_money_equivalence.py
+# Свойства эквивалентности Money на минорных единицах и прежней
+# реализации на Decimal (квантование после каждой операции).
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from billing_system.domain.value_objects import Currency, Money
+
+
+@dataclass(frozen=True)
+class DecimalMoney:
+    """Эталон: прежняя реализация Money, хранящая квантованный Decimal."""
+
+    amount: Decimal
+    currency: Currency
+
+    def __post_init__(self) -> None:
+        q_exp = (
+            Decimal("1." + "0" * self.currency.exp)
+            if self.currency.exp > 0
+            else Decimal(1)
+        )
+        q = self.amount.quantize(q_exp, rounding=ROUND_HALF_UP)
+        object.__setattr__(self, "amount", q)
+
+    def __add__(self, other: "DecimalMoney") -> "DecimalMoney":
+        return DecimalMoney(self.amount + other.amount, self.currency)
+
+    def __sub__(self, other: "DecimalMoney") -> "DecimalMoney":
+        return DecimalMoney(self.amount - other.amount, self.currency)
+
+    def __mul__(self, value: int | Decimal) -> "DecimalMoney":
+        return DecimalMoney(self.amount * Decimal(value), self.currency)
+
+
+amounts = st.decimals(
+    allow_nan=False,
+    allow_infinity=False,
+    min_value=Decimal("-1e9"),
+    max_value=Decimal("1e9"),
+)
+scalars = st.decimals(
+    allow_nan=False,
+    allow_infinity=False,
+    min_value=Decimal("-1e4"),
+    max_value=Decimal("1e4"),
+)
+currencies = st.sampled_from(list(Currency))
+
+
+def assert_same(mon: Money, ref: DecimalMoney) -> None:
+    assert mon.amount == ref.amount
+    assert mon.amount.as_tuple().exponent == ref.amount.as_tuple().exponent
+    assert mon.currency == ref.currency
+
+
+@given(amounts, currencies)
+def test_construction(x: Decimal, cur: Currency) -> None:
+    assert_same(Money(x, cur), DecimalMoney(x, cur))
+
+
+@given(amounts, amounts, currencies)
+def test_add_sub(x: Decimal, y: Decimal, cur: Currency) -> None:
+    mon1, mon2 = Money(x, cur), Money(y, cur)
+    ref1, ref2 = DecimalMoney(x, cur), DecimalMoney(y, cur)
+    assert_same(mon1 + mon2, ref1 + ref2)
+    assert_same(mon1 - mon2, ref1 - ref2)
+
+
+@given(amounts, scalars, currencies)
+def test_mul_decimal(x: Decimal, k: Decimal, cur: Currency) -> None:
+    assert_same(Money(x, cur) * k, DecimalMoney(x, cur) * k)
+    assert_same(k * Money(x, cur), DecimalMoney(x, cur) * k)
+
+
+@given(amounts, st.integers(min_value=-(10**6), max_value=10**6), currencies)
+def test_mul_int(x: Decimal, k: int, cur: Currency) -> None:
+    assert_same(Money(x, cur) * k, DecimalMoney(x, cur) * k)
+
+
+@given(st.lists(st.tuples(amounts, scalars), max_size=30), currencies)
+def test_sum_of_line_totals(
+    lines: list[tuple[Decimal, Decimal]],
+    cur: Currency,
+) -> None:
+    total = Money(Decimal(0), cur)
+    ref = DecimalMoney(Decimal(0), cur)
+    for price, qty in lines:
+        total = total + Money(price, cur) * qty
+        ref = ref + DecimalMoney(price, cur) * qty
+    assert_same(total, ref)
+
+
+@given(amounts, amounts, currencies)
+def test_equality_matches(x: Decimal, y: Decimal, cur: Currency) -> None:
+    same = DecimalMoney(x, cur) == DecimalMoney(y, cur)
+    assert (Money(x, cur) == Money(y, cur)) is same
@@ -0,0 +1,195 @@
+# tests/unit/test_sqlite_pool.py
+# Unit тесты для пула соединений sqlite.
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from billing_system.application.errors import StorageBusyError
+from billing_system.infrastructure.errors import (
+    AlreadyInTransactionError,
+    NoConnectionError,
+    PoolExhaustedError,
+)
+from billing_system.infrastructure.migrations import (
+    SCHEMA_VERSION,
+    schema_version,
+)
+from billing_system.infrastructure.protocols import (
+    BALANCED,
+    SqliteConnectionPool,
+    SqliteUnitOfWork,
+)
+
+BUSY_TIMEOUT = 10
+
+
+def test_reuses_connection(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    with pool.connection() as conn:
+        assert schema_version(conn) == SCHEMA_VERSION
+        assert conn.execute("PRAGMA foreign_keys;").fetchone() == (1,)
+    with pool.connection() as again:
+        assert again is conn
+    assert pool.size == pool.idle == 1
+
+
+def test_release_resets_state(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    conn = pool.acquire()
+    conn.execute("BEGIN;")
+    conn.execute(
+        "INSERT INTO Invoice (id, currency, status) VALUES (1, 2, 3);",
+    )
+    conn.row_factory = sqlite3.Row
+    pool.release(conn)
+
+    with pool.connection() as again:
+        assert again is conn
+        assert not again.in_transaction
+        assert again.row_factory is None
+        assert again.execute("SELECT COUNT(*) FROM Invoice;").fetchone() == (
+            0,
+        )
+
+
+def test_broken_connection_is_replaced(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    with pool.connection() as fresh:
+        assert fresh is not conn
+    assert pool.size == 1
+
+
+def test_idle_cap(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite", max_size=3, max_idle=1)
+    conns = [pool.acquire() for _ in range(3)]
+    assert pool.size == len(conns)
+    for conn in conns:
+        pool.release(conn)
+    assert pool.size == pool.idle == 1
+
+
+def test_exhausted(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite", max_size=1, timeout=0)
+    conn = pool.acquire()
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire()
+    pool.release(conn)
+    pool.release(pool.acquire())
+
+
+def test_waits_for_release(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite", max_size=1)
+    conn = pool.acquire()
+    timer = threading.Timer(0.05, pool.release, (conn,))
+    timer.start()
+    assert pool.acquire() is conn
+    timer.join()
+
+
+def test_close(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    conn = pool.acquire()
+    pool.close()
+    pool.release(conn)
+    assert pool.size == 0
+    with pytest.raises(NoConnectionError):
+        pool.acquire()
+
+
+def test_bad_limits(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="max_size"):
+        SqliteConnectionPool(tmp_path / "db.sqlite", max_size=1, max_idle=2)
+
+
+def test_uow_shares_pool(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    first, second = SqliteUnitOfWork(pool), SqliteUnitOfWork(pool)
+    with first:
+        conn = first.conn
+    with second:
+        assert second.conn is conn
+    assert first.conn is None
+
+
+def test_read_only_pool(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite")
+    readers = pool.read_only_pool()
+    assert readers.read_only
+    assert pool.read_only_pool() is readers
+    assert readers.read_only_pool() is readers
+    with readers.connection() as conn:
+        assert conn.execute("PRAGMA query_only;").fetchone() == (1,)
+        assert schema_version(conn) == SCHEMA_VERSION
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM Invoice;")
+    pool.close()
+    with pytest.raises(NoConnectionError):
+        readers.acquire()
+
+
+def test_read_only_uow_reentry_keeps_connection(tmp_path: Path) -> None:
+    readers = SqliteConnectionPool(tmp_path / "db.sqlite").read_only_pool()
+    uow = SqliteUnitOfWork(readers)
+    with pytest.raises(AlreadyInTransactionError), uow, uow as _:
+        ...
+    assert uow.conn is None
+    assert readers.idle == readers.size
+
+
+def test_read_only_uow_does_not_wait_for_writer(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite", profile=BALANCED)
+    writer = SqliteUnitOfWork(pool)
+    reader = writer.read_only()
+    with writer:
+        assert writer.conn is not None
+        writer.conn.execute(
+            "INSERT INTO Invoice (id, currency, status) VALUES (1, 2, 3);",
+        )
+        with reader:
+            assert reader.conn is not None
+            assert not reader.conn.in_transaction
+            count = reader.conn.execute("SELECT COUNT(*) FROM Invoice;")
+            assert count.fetchone() == (0,)
+
+
+def test_busy_timeout_overrides_profile(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(
+        tmp_path / "db.sqlite",
+        busy_timeout=BUSY_TIMEOUT,
+    )
+    assert pool.profile.busy_timeout == BUSY_TIMEOUT
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA busy_timeout;").fetchone() == (
+            BUSY_TIMEOUT,
+        )
+
+
+def test_uow_busy_error_and_lock_metrics(tmp_path: Path) -> None:
+    f = tmp_path / "db.sqlite"
+    pool = SqliteConnectionPool(f, busy_timeout=1)
+    uow = SqliteUnitOfWork(pool)
+    with uow:
+        pass
+    assert pool.lock_metrics.stats.waits == 1
+
+    holder = sqlite3.connect(f, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE;")
+
+    def enter() -> None:
+        with uow:
+            pass
+
+    with pytest.raises(StorageBusyError):
+        enter()
+    holder.rollback()
+    holder.close()
+
+    stats = pool.lock_metrics.stats
+    assert (stats.waits, stats.busy) == (1, 1)
+    assert uow.conn is None
+    assert pool.idle == pool.size
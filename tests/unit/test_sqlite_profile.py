@@ -0,0 +1,50 @@
+# tests/unit/test_sqlite_profile.py
+# Unit тесты для профилей настроек соединения sqlite.
+from pathlib import Path
+
+import pytest
+
+from billing_system.infrastructure.protocols import (
+    BALANCED,
+    BULK_LOAD,
+    DURABLE,
+    PROFILES,
+    SqliteConnectionPool,
+    SqliteProfile,
+    SqliteUnitOfWork,
+)
+
+SYNCHRONOUS = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+TEMP_STORE = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+
+
+@pytest.mark.parametrize("profile", [DURABLE, BALANCED, BULK_LOAD])
+def test_profile_applied(tmp_path: Path, profile: SqliteProfile) -> None:
+    pool = SqliteConnectionPool(tmp_path / "db.sqlite", profile=profile)
+    assert pool.profile is profile
+    with pool.connection() as conn:
+
+        def pragma(name: str) -> object:
+            return conn.execute(f"PRAGMA {name};").fetchone()[0]
+
+        assert str(pragma("journal_mode")).upper() == profile.journal_mode
+        assert pragma("synchronous") == SYNCHRONOUS[profile.synchronous]
+        assert pragma("cache_size") == profile.cache_size
+        assert pragma("temp_store") == TEMP_STORE[profile.temp_store]
+        assert pragma("busy_timeout") == profile.busy_timeout
+
+
+def test_profiles_by_name() -> None:
+    assert PROFILES == {
+        "durable": DURABLE,
+        "balanced": BALANCED,
+        "bulk_load": BULK_LOAD,
+    }
+
+
+def test_uow_profile(tmp_path: Path) -> None:
+    uow = SqliteUnitOfWork(tmp_path / "db.sqlite", profile=BALANCED)
+    with uow:
+        assert uow.conn is not None
+        mode = uow.conn.execute("PRAGMA journal_mode;").fetchone()[0]
+    assert mode == "wal"
@@ -0,0 +1,33 @@
+# tests/unit/test_usecase_executor.py
+# Unit тесты для выполнения юзкейсов в пуле потоков.
+import asyncio
+import threading
+
+import pytest
+
+from billing_system.infrastructure.api.executor import UseCaseExecutor
+
+
+@pytest.mark.asyncio
+async def test_runs_outside_event_loop_thread() -> None:
+    def usecase(x: int, *, y: int) -> tuple[int, int]:
+        return x + y, threading.get_ident()
+
+    executor = UseCaseExecutor(max_workers=2)
+    total, thread = await executor.run(usecase, 1, y=1)
+    assert total == 1 + 1
+    assert thread != threading.get_ident()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_does_not_stall_loop() -> None:
+    executor = UseCaseExecutor(max_workers=1)
+    release = threading.Event()
+    blocked = asyncio.ensure_future(executor.run(release.wait, 5))
+    # Пока юзкейс ждет в потоке, event loop продолжает работу.
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    release.set()
+    assert await blocked is True
+    executor.shutdown()